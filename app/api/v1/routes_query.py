@@ -0,0 +1,120 @@
+"""
+RAG query endpoints.
+
+Handlers are async: retrieval runs in a thread pool and LLM calls await
+pooled HTTP connections, so waiting requests do not pin worker threads.
+"""
+
+import json
+from functools import lru_cache
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.core.config import get_settings
+from app.models.query import (
+    BatchQueryRequest,
+    BatchQueryResponse,
+    QueryRequest,
+    QueryResponse,
+)
+from app.rag.services.async_rag_llm_service import AsyncRAGLLMService
+from app.services.rag_pipeline import build_async_rag_service
+
+router = APIRouter(tags=["query"])
+
+
+@lru_cache
+def get_rag_service() -> AsyncRAGLLMService:
+    """
+    Shared RAG service (built on first use).
+
+    Override with app.dependency_overrides in tests.
+    """
+    return build_async_rag_service(get_settings())
+
+
+@router.post("/query", response_model=QueryResponse)
+async def query(
+    request: QueryRequest,
+    service: AsyncRAGLLMService = Depends(get_rag_service),
+):
+    """
+    Answer one question with retrieved context.
+
+    Returns:
+        QueryResponse: The question and the generated answer
+    """
+    try:
+        answer = await service.answer(request.query)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return QueryResponse(query=request.query, answer=answer)
+
+
+@router.post("/query/batch", response_model=BatchQueryResponse)
+async def query_batch(
+    request: BatchQueryRequest,
+    service: AsyncRAGLLMService = Depends(get_rag_service),
+):
+    """
+    Answer several questions; retrieval is batched, generations run concurrently.
+
+    Returns:
+        BatchQueryResponse: One answer per question, in request order
+    """
+    try:
+        answers = await service.answer_many(request.queries)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+    return BatchQueryResponse(
+        answers=[
+            QueryResponse(query=question, answer=answer)
+            for question, answer in zip(request.queries, answers)
+        ]
+    )
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/query/stream")
+async def query_stream(
+    query: str = Query(..., min_length=1),
+    service: AsyncRAGLLMService = Depends(get_rag_service),
+):
+    """
+    Stream an answer as Server-Sent Events.
+
+    Emits one "token" event per LLM fragment ({"token": str}), then a
+    final "done" event, or an "error" event ({"detail": str}) if
+    retrieval or generation fails after the stream has started.
+
+    Returns:
+        StreamingResponse: text/event-stream of answer fragments
+    """
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for fragment in service.answer_stream(query):
+                yield _sse_event("token", {"token": fragment})
+        except (ValueError, RuntimeError) as e:
+            yield _sse_event("error", {"detail": str(e)})
+            return
+        yield _sse_event("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so fragments reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -47,6 +47,25 @@ class Settings(BaseSettings):
     # Server port - the TCP port the application listens on
     port: int = 8000
 
+    # Ollama LLM server used by the /api/v1/query routes
+    ollama_base_url: str = "http://localhost:11434"
+    ollama_model: str = "llama2"
+
+    # Ollama prompt-cache reuse - keep the model (and the KV cache of the
+    # shared prompt prefix) loaded between requests; optional context size
+    # and number of prefix tokens kept on a context shift
+    ollama_keep_alive: str | None = "30m"
+    ollama_num_ctx: int | None = None
+    ollama_num_keep: int | None = None
+
+    # LLM HTTP transport - keep-alive pool size, connect/read timeouts (seconds)
+    # and bounded retries with jittered exponential backoff for transient errors
+    llm_pool_size: int = 100
+    llm_connect_timeout: float = 5.0
+    llm_read_timeout: float = 60.0
+    llm_max_retries: int = 2
+    llm_backoff_base: float = 0.25
+
     # Pydantic configuration for the Settings model
     # env_file: specifies the .env file to load environment variables from
     # env_file_encoding: ensures proper handling of special characters in .env
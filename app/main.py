@@ -5,21 +5,37 @@ Loads config from .env and registers all route handlers.
 Routes are organized by API version for easier maintenance.
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 
 from app.core.config import get_settings
 from app.api.v1.routes_health import router as health_router
+from app.api.v1.routes_query import get_rag_service, router as query_router
 
 # Load settings (cached singleton, safe to call multiple times)
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the shared RAG service's HTTP connection pool on shutdown."""
+    yield
+    # Only close if a request actually built the service
+    if get_rag_service.cache_info().currsize:
+        await get_rag_service().aclose()
+        get_rag_service.cache_clear()
+
+
 # Initialize FastAPI app
 # Auto-generates docs at /docs and /redoc
 app = FastAPI(
     title=settings.app_name,
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # Register routers
 # Prefix adds /api/v1 to all routes (e.g., /health -> /api/v1/health)
 app.include_router(health_router, prefix=settings.api_v1_prefix)
+app.include_router(query_router, prefix=settings.api_v1_prefix)
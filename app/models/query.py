@@ -0,0 +1,30 @@
+"""Request/response schemas for the query endpoints."""
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class QueryRequest(BaseModel):
+    """A single question to answer with RAG."""
+
+    query: str = Field(..., min_length=1)
+
+
+class QueryResponse(BaseModel):
+    """Generated answer for a QueryRequest."""
+
+    query: str
+    answer: str
+
+
+class BatchQueryRequest(BaseModel):
+    """Several questions answered in one call."""
+
+    queries: List[str] = Field(..., min_length=1)
+
+
+class BatchQueryResponse(BaseModel):
+    """Answers for a BatchQueryRequest, in request order."""
+
+    answers: List[QueryResponse]
@@ -0,0 +1,6 @@
+"""
+Caching
+
+Answer-level caches for the RAG services and the index generation counter
+used to invalidate them when the collection changes.
+"""
@@ -0,0 +1,60 @@
+"""Monotonic index generation counter."""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+
+class IndexGeneration:
+    """Counter bumped on every write to the vector store.
+
+    Caches include the current generation in their keys, so any write
+    makes all earlier entries unreachable. In-memory by default; with a
+    path the counter lives in a SQLite file shared by every process
+    (indexer and API workers) that opens it.
+    """
+
+    def __init__(self, path: str | None = None) -> None:
+        """
+        Initialize the counter.
+
+        Args:
+            path: SQLite file for a cross-process counter (None = in-memory)
+        """
+        self._lock = threading.Lock()
+        self._value = 0
+        self._db: sqlite3.Connection | None = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS generation "
+                "(id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)"
+            )
+            self._db.execute("INSERT OR IGNORE INTO generation (id, value) VALUES (1, 0)")
+            self._db.commit()
+
+    def current(self) -> int:
+        """Return the current generation."""
+        with self._lock:
+            if self._db is None:
+                return self._value
+            return self._db.execute("SELECT value FROM generation WHERE id = 1").fetchone()[0]
+
+    def bump(self) -> int:
+        """Advance the generation and return the new value."""
+        with self._lock:
+            if self._db is None:
+                self._value += 1
+                return self._value
+            # Atomic across processes: the increment happens inside SQLite
+            with self._db:
+                self._db.execute("UPDATE generation SET value = value + 1 WHERE id = 1")
+                return self._db.execute("SELECT value FROM generation WHERE id = 1").fetchone()[0]
+
+    def close(self) -> None:
+        """Close the SQLite file, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
@@ -0,0 +1,183 @@
+"""TTL + LRU cache of generated answers."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Tuple
+
+from app.rag.embeddings.cached_provider import normalize_text
+from app.rag.models.cache import ResponseCacheStats
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a question for cache keys (NFC, collapsed whitespace, casefold)."""
+    return normalize_text(query).casefold()
+
+
+def response_cache_key(
+    query: str,
+    *,
+    top_k: int,
+    max_chars: int,
+    model: str,
+    template_version: str,
+    generation: int,
+) -> str:
+    """
+    Cache key of an answer.
+
+    Everything that can change the answer is part of the key: the
+    normalized question, retrieval and context limits, the LLM model, the
+    prompt template version and the index generation.
+    """
+    payload = json.dumps(
+        [normalize_query(query), top_k, max_chars, model, template_version, generation]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier answer cache with per-entry TTL and LRU eviction.
+
+    Lookups go to an in-process LRU first, then to an optional SQLite file
+    that several worker processes can share. Expired entries are treated
+    as misses and dropped. Expiry uses wall-clock time so it means the same
+    thing in every process sharing the file.
+    """
+
+    def __init__(
+        self,
+        max_items: int = 1024,
+        ttl_seconds: float = 3600.0,
+        path: str | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_items: Capacity of the in-process LRU tier (and of the file tier)
+            ttl_seconds: Lifetime of an entry
+            path: SQLite file for the shared tier (None disables it)
+            clock: Time source in seconds (injectable for tests)
+        """
+        if max_items <= 0:
+            raise ValueError("max_items must be greater than 0")
+        if ttl_seconds <= 0:
+            raise ValueError("ttl_seconds must be greater than 0")
+
+        self._max_items = max_items
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._memory: OrderedDict[str, Tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+
+        self._db: sqlite3.Connection | None = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, answer TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: str) -> str | None:
+        """Return the cached answer for key, or None on miss or expiry."""
+        now = self._clock()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                answer, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._memory_hits += 1
+                    return answer
+                del self._memory[key]
+                self._expired += 1
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT answer, expires_at FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    answer, expires_at = row
+                    if expires_at > now:
+                        self._remember(key, answer, expires_at)
+                        self._disk_hits += 1
+                        return answer
+                    self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._db.commit()
+                    self._expired += 1
+
+            self._misses += 1
+            return None
+
+    def put(self, key: str, answer: str) -> None:
+        """Store an answer under key with a fresh TTL."""
+        expires_at = self._clock() + self._ttl
+
+        with self._lock:
+            self._remember(key, answer, expires_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses (key, answer, expires_at) VALUES (?, ?, ?)",
+                    (key, answer, expires_at),
+                )
+                self._prune_disk()
+                self._db.commit()
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM responses")
+                self._db.commit()
+
+    @property
+    def stats(self) -> ResponseCacheStats:
+        """Snapshot of hit/miss counters."""
+        with self._lock:
+            return ResponseCacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+                expired=self._expired,
+                evicted=self._evicted,
+            )
+
+    def close(self) -> None:
+        """Close the shared tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, answer: str, expires_at: float) -> None:
+        """Insert into the LRU tier, evicting the oldest entries (lock held)."""
+        self._memory[key] = (answer, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_items:
+            self._memory.popitem(last=False)
+            self._evicted += 1
+
+    def _prune_disk(self) -> None:
+        """Drop expired rows, then the soonest-expiring beyond capacity (lock held)."""
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (self._clock(),))
+        self._db.execute(
+            "DELETE FROM responses WHERE key NOT IN "
+            "(SELECT key FROM responses ORDER BY expires_at DESC LIMIT ?)",
+            (self._max_items,),
+        )
@@ -0,0 +1,157 @@
+"""Similarity-based cache of retrieval results for paraphrased queries."""
+
+from __future__ import annotations
+
+import threading
+from typing import List
+
+import numpy as np
+
+from app.rag.models.cache import SemanticCacheEntry, SemanticCacheStats
+from app.rag.models.documents import ScoredDocumentChunk
+from app.rag.models.embeddings import EmbeddingLike, as_vector
+from app.rag.vectorstores.flat_search import normalize_rows
+
+
+class SemanticCache:
+    """Reuses results of earlier queries whose embedding is close enough.
+
+    Query embeddings are kept normalized in a small fixed-capacity matrix;
+    a lookup is one matrix-vector product. An entry matches when its
+    cosine similarity reaches `threshold`, it was retrieved with at least
+    the requested top_k and at the current index generation. When full,
+    the least recently used entry is overwritten.
+    """
+
+    def __init__(self, threshold: float = 0.95, max_items: int = 1024) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            threshold: Minimum cosine similarity for a hit (0..1)
+            max_items: Maximum number of cached queries
+        """
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError("threshold must be in (0, 1]")
+        if max_items <= 0:
+            raise ValueError("max_items must be greater than 0")
+
+        self._threshold = threshold
+        self._max_items = max_items
+        self._lock = threading.Lock()
+
+        self._vectors: np.ndarray | None = None
+        self._entries: List[SemanticCacheEntry | None] = [None] * max_items
+        self._top_k = np.zeros(max_items, dtype=np.int64)
+        self._generation = np.zeros(max_items, dtype=np.int64)
+        self._last_used = np.zeros(max_items, dtype=np.int64)
+        self._size = 0
+        self._tick = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._answer_hits = 0
+        self._evicted = 0
+
+    def lookup(
+        self,
+        embedding: EmbeddingLike,
+        *,
+        top_k: int,
+        generation: int = 0,
+    ) -> SemanticCacheEntry | None:
+        """Return the most similar usable entry, or None."""
+        query = normalize_rows(as_vector(embedding))[0]
+
+        with self._lock:
+            if self._size == 0 or self._vectors.shape[1] != query.shape[0]:
+                self._misses += 1
+                return None
+
+            similarities = self._vectors[:self._size] @ query
+            usable = (
+                (self._top_k[:self._size] >= top_k)
+                & (self._generation[:self._size] == generation)
+                & (similarities >= self._threshold)
+            )
+            if not usable.any():
+                self._misses += 1
+                return None
+
+            slot = int(np.argmax(np.where(usable, similarities, -np.inf)))
+            self._touch(slot)
+            self._hits += 1
+            return self._entries[slot]
+
+    def store(
+        self,
+        embedding: EmbeddingLike,
+        *,
+        query: str,
+        top_k: int,
+        results: List[ScoredDocumentChunk],
+        generation: int = 0,
+    ) -> SemanticCacheEntry:
+        """Cache results for a query embedding and return the new entry."""
+        vector = normalize_rows(as_vector(embedding))[0]
+        entry = SemanticCacheEntry(
+            query=query, top_k=top_k, generation=generation, results=list(results)
+        )
+
+        with self._lock:
+            if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+                # First entry (or embedding model changed): start over
+                self._vectors = np.zeros((self._max_items, vector.shape[0]), dtype=np.float32)
+                self._entries = [None] * self._max_items
+                self._size = 0
+
+            if self._size < self._max_items:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = self._victim(generation)
+
+            self._vectors[slot] = vector
+            self._entries[slot] = entry
+            self._top_k[slot] = top_k
+            self._generation[slot] = generation
+            self._touch(slot)
+
+        return entry
+
+    def record_answer_hit(self) -> None:
+        """Count an answer served from a cached entry."""
+        with self._lock:
+            self._answer_hits += 1
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._vectors = None
+            self._entries = [None] * self._max_items
+            self._size = 0
+
+    @property
+    def stats(self) -> SemanticCacheStats:
+        """Snapshot of counters."""
+        with self._lock:
+            return SemanticCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                answer_hits=self._answer_hits,
+                evicted=self._evicted,
+                size=self._size,
+            )
+
+    def _victim(self, generation: int) -> int:
+        """Slot to overwrite: a stale-generation entry, else the LRU one (lock held)."""
+        stale = np.flatnonzero(self._generation[:self._size] != generation)
+        if len(stale):
+            return int(stale[0])
+        self._evicted += 1
+        return int(np.argmin(self._last_used[:self._size]))
+
+    def _touch(self, slot: int) -> None:
+        """Mark a slot as most recently used (lock held)."""
+        self._tick += 1
+        self._last_used[slot] = self._tick
@@ -0,0 +1,5 @@
+"""
+Chunking Strategies
+
+Concrete implementations of the chunker interface (fixed-size, sentence, token).
+"""
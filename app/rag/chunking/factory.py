@@ -0,0 +1,54 @@
+"""Chunker construction from RAG settings."""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from app.rag.chunking.fixed_size import FixedSizeChunker
+from app.rag.chunking.sentence import SentenceChunker
+from app.rag.chunking.token import TokenChunker
+from app.rag.interfaces.chunker import ChunkerInterface
+from app.rag.models.settings import RAGSettings
+
+
+def build_chunker(
+    settings: RAGSettings,
+    count_tokens: Callable[[str], int] | None = None,
+) -> ChunkerInterface:
+    """
+    Build the chunker selected by `settings.chunking_strategy`.
+
+    Args:
+        settings: RAG settings ("fixed", "sentence" or "token" strategy)
+        count_tokens: Token counting function, required for the "token" strategy
+
+    Returns:
+        Configured chunker
+
+    Raises:
+        ValueError: If the strategy is unknown or count_tokens is missing
+    """
+    strategy = settings.chunking_strategy
+
+    if strategy == "fixed":
+        return FixedSizeChunker(
+            chunk_size=settings.chunk_size,
+            chunk_overlap=settings.chunk_overlap,
+        )
+
+    if strategy == "sentence":
+        return SentenceChunker(
+            max_chars=settings.chunk_size,
+            overlap_chars=settings.chunk_overlap,
+        )
+
+    if strategy == "token":
+        if count_tokens is None:
+            raise ValueError("Token chunking requires a count_tokens function")
+        return TokenChunker(
+            count_tokens=count_tokens,
+            max_tokens=settings.chunk_max_tokens,
+            overlap_tokens=settings.chunk_overlap_tokens,
+        )
+
+    raise ValueError(f"Unknown chunking strategy: {strategy}")
@@ -0,0 +1,56 @@
+"""Fixed-size character chunker with overlap."""
+
+from __future__ import annotations
+
+from typing import List
+
+from app.rag.interfaces.chunker import ChunkerInterface
+
+
+class FixedSizeChunker(ChunkerInterface):
+    """Splits text into windows of at most `chunk_size` characters.
+
+    Consecutive windows share `chunk_overlap` characters. When possible a
+    window is cut at the last whitespace in its second half, so words are
+    not split mid-way.
+    """
+
+    def __init__(self, chunk_size: int = 1000, chunk_overlap: int = 200) -> None:
+        """Initialize with window size and overlap (both in characters)."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        if chunk_overlap < 0 or chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be >= 0 and smaller than chunk_size")
+        self._chunk_size = chunk_size
+        self._chunk_overlap = chunk_overlap
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into overlapping fixed-size windows."""
+        text = text.strip()
+        if not text:
+            return []
+
+        chunks: List[str] = []
+        start = 0
+        length = len(text)
+
+        while start < length:
+            end = min(start + self._chunk_size, length)
+
+            # Prefer a whitespace boundary in the second half of the window
+            if end < length:
+                boundary = text.rfind(" ", start + self._chunk_size // 2, end)
+                if boundary != -1:
+                    end = boundary
+
+            piece = text[start:end].strip()
+            if piece:
+                chunks.append(piece)
+
+            if end >= length:
+                break
+
+            # Step forward, keeping the overlap but always making progress
+            start = max(end - self._chunk_overlap, start + 1)
+
+        return chunks
@@ -0,0 +1,132 @@
+"""Sentence/paragraph-aware chunker."""
+
+from __future__ import annotations
+
+import re
+from typing import Callable, List, Sequence, Tuple
+
+from app.rag.chunking.fixed_size import FixedSizeChunker
+from app.rag.interfaces.chunker import ChunkerInterface
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# A unit is (paragraph index, text); units from the same paragraph are
+# joined with a space, units from different paragraphs with a blank line.
+Unit = Tuple[int, str]
+
+
+def split_paragraphs(text: str) -> List[str]:
+    """Split text on blank lines, dropping empty paragraphs."""
+    return [p.strip() for p in _PARAGRAPH_RE.split(text) if p.strip()]
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text on sentence-ending punctuation followed by whitespace."""
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+
+
+def join_units(units: Sequence[Unit]) -> str:
+    """Join units back into text, preserving paragraph breaks."""
+    parts: List[str] = []
+    previous_paragraph = None
+    for paragraph, text in units:
+        if parts:
+            parts.append(" " if paragraph == previous_paragraph else "\n\n")
+        parts.append(text)
+        previous_paragraph = paragraph
+    return "".join(parts)
+
+
+def pack_units(
+    units: Sequence[Unit],
+    size_of: Callable[[str], int],
+    max_size: int,
+    overlap: int = 0,
+) -> List[str]:
+    """
+    Greedily pack units into chunks whose total size stays within max_size.
+
+    Args:
+        units: Ordered units, each expected to fit within max_size on its own
+        size_of: Size function (characters, tokens, ...)
+        max_size: Maximum size of a chunk
+        overlap: Maximum size of trailing units repeated at the start of the next chunk
+
+    Returns:
+        List of chunk strings
+    """
+    chunks: List[str] = []
+    current: List[Unit] = []
+    current_size = 0
+
+    for unit in units:
+        unit_size = size_of(unit[1])
+
+        if current and current_size + unit_size > max_size:
+            chunks.append(join_units(current))
+
+            # Carry trailing units into the next chunk as overlap
+            carried: List[Unit] = []
+            carried_size = 0
+            for previous in reversed(current):
+                previous_size = size_of(previous[1])
+                if carried_size + previous_size > overlap:
+                    break
+                carried.insert(0, previous)
+                carried_size += previous_size
+
+            if carried_size + unit_size > max_size:
+                carried, carried_size = [], 0
+            current, current_size = carried, carried_size
+
+        current.append(unit)
+        current_size += unit_size
+
+    if current:
+        chunks.append(join_units(current))
+
+    return chunks
+
+
+class SentenceChunker(ChunkerInterface):
+    """Packs whole paragraphs, or sentences of long paragraphs, up to `max_chars`.
+
+    Sentences longer than `max_chars` fall back to fixed-size splitting.
+    """
+
+    def __init__(self, max_chars: int = 1000, overlap_chars: int = 0) -> None:
+        """Initialize with maximum chunk size and sentence overlap (characters)."""
+        if max_chars <= 0:
+            raise ValueError("max_chars must be greater than 0")
+        if overlap_chars < 0 or overlap_chars >= max_chars:
+            raise ValueError("overlap_chars must be >= 0 and smaller than max_chars")
+        self._max_chars = max_chars
+        self._overlap_chars = overlap_chars
+        self._fallback = FixedSizeChunker(chunk_size=max_chars, chunk_overlap=0)
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into sentence-aligned chunks."""
+        units: List[Unit] = []
+
+        for paragraph_index, paragraph in enumerate(split_paragraphs(text)):
+            if len(paragraph) <= self._max_chars:
+                units.append((paragraph_index, paragraph))
+                continue
+
+            for sentence in split_sentences(paragraph):
+                if len(sentence) <= self._max_chars:
+                    units.append((paragraph_index, sentence))
+                else:
+                    units.extend(
+                        (paragraph_index, piece)
+                        for piece in self._fallback.split_text(sentence)
+                    )
+
+        # +1 accounts for the separator between units
+        return pack_units(
+            units,
+            size_of=lambda unit: len(unit) + 1,
+            max_size=self._max_chars + 1,
+            overlap=self._overlap_chars,
+        )
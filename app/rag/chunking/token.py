@@ -0,0 +1,62 @@
+"""Token-count-based chunker driven by the embedding model's tokenizer."""
+
+from __future__ import annotations
+
+from typing import Callable, List
+
+from app.rag.chunking.sentence import Unit, pack_units, split_paragraphs, split_sentences
+from app.rag.interfaces.chunker import ChunkerInterface
+
+
+class TokenChunker(ChunkerInterface):
+    """Packs sentences into chunks of at most `max_tokens` tokens.
+
+    Token counts come from `count_tokens`, typically the embedding provider's
+    tokenizer (see `SentenceTransformerEmbeddingProvider.count_tokens`), so
+    chunks are sized to what the model actually sees instead of being
+    silently truncated at its max sequence length. Sentences over budget are
+    split on words.
+    """
+
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int],
+        max_tokens: int = 256,
+        overlap_tokens: int = 0,
+    ) -> None:
+        """Initialize with a token counting function and token budgets."""
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be greater than 0")
+        if overlap_tokens < 0 or overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens must be >= 0 and smaller than max_tokens")
+        self._count_tokens = count_tokens
+        self._max_tokens = max_tokens
+        self._overlap_tokens = overlap_tokens
+
+    def split_text(self, text: str) -> List[str]:
+        """Split text into token-bounded chunks."""
+        units: List[Unit] = []
+
+        for paragraph_index, paragraph in enumerate(split_paragraphs(text)):
+            for sentence in split_sentences(paragraph):
+                if self._count_tokens(sentence) <= self._max_tokens:
+                    units.append((paragraph_index, sentence))
+                    continue
+
+                # Oversized sentence: pack its words instead
+                words = [(paragraph_index, word) for word in sentence.split()]
+                units.extend(
+                    (paragraph_index, piece)
+                    for piece in pack_units(
+                        words,
+                        size_of=self._count_tokens,
+                        max_size=self._max_tokens,
+                    )
+                )
+
+        return pack_units(
+            units,
+            size_of=self._count_tokens,
+            max_size=self._max_tokens,
+            overlap=self._overlap_tokens,
+        )
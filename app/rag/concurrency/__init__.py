@@ -0,0 +1,6 @@
+"""
+Concurrency Helpers
+
+Request coalescing (single-flight) and batching primitives used by the
+RAG services under concurrent load.
+"""
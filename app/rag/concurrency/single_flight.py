@@ -0,0 +1,216 @@
+"""Single-flight deduplication of concurrent identical calls."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from app.rag.models.concurrency import SingleFlightStats
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight computation shared by a leader and its followers."""
+
+    __slots__ = ("done", "result", "error", "started")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.started = time.monotonic()
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key (the leader) runs the function; callers
+    arriving while it runs (followers) wait for and share its result or
+    exception. A follower waits at most `timeout` seconds and then runs
+    the function itself, and a leader running longer than the timeout no
+    longer collects new followers, so a stuck call cannot block a key
+    forever.
+    """
+
+    def __init__(self, timeout: float | None = 30.0) -> None:
+        """
+        Initialize an empty group.
+
+        Args:
+            timeout: Default per-key wait limit in seconds (None = wait forever)
+        """
+        self._timeout = timeout
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._leaders = 0
+        self._followers = 0
+        self._timeouts = 0
+
+    def do(
+        self,
+        key: Hashable,
+        function: Callable[[], T],
+        timeout: float | None = None,
+    ) -> T:
+        """
+        Run function once per key among concurrent callers.
+
+        Args:
+            key: Identity of the computation
+            function: Zero-argument callable producing the result
+            timeout: Wait limit in seconds for this key (None = the group's)
+
+        Returns:
+            The result of the leader's (or, after a timeout, this caller's) call
+        """
+        timeout = self._timeout if timeout is None else timeout
+
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and timeout is not None and time.monotonic() - call.started > timeout:
+                # Leader looks stuck: start a fresh flight for newcomers
+                call = None
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self._leaders += 1
+            else:
+                self._followers += 1
+
+        if leader:
+            return self._lead(key, call, function)
+
+        remaining = None if timeout is None else max(0.0, timeout - (time.monotonic() - call.started))
+        if not call.done.wait(remaining):
+            with self._lock:
+                self._timeouts += 1
+            return function()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Snapshot of counters."""
+        with self._lock:
+            return SingleFlightStats(
+                leaders=self._leaders,
+                followers=self._followers,
+                timeouts=self._timeouts,
+                in_flight=len(self._calls),
+            )
+
+    def _lead(self, key: Hashable, call: _Call, function: Callable[[], T]) -> T:
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+
+
+class _LeaderCancelled(Exception):
+    """The leader was cancelled; followers must compute for themselves."""
+
+
+class AsyncSingleFlight:
+    """asyncio counterpart of SingleFlight (use from one event loop)."""
+
+    def __init__(self, timeout: float | None = 30.0) -> None:
+        """
+        Initialize an empty group.
+
+        Args:
+            timeout: Default per-key wait limit in seconds (None = wait forever)
+        """
+        self._timeout = timeout
+        self._calls: Dict[Hashable, tuple[asyncio.Future, float]] = {}
+        self._leaders = 0
+        self._followers = 0
+        self._timeouts = 0
+
+    async def do(
+        self,
+        key: Hashable,
+        function: Callable[[], Awaitable[T]],
+        timeout: float | None = None,
+    ) -> T:
+        """
+        Await function once per key among concurrent callers.
+
+        Args:
+            key: Identity of the computation
+            function: Zero-argument coroutine function producing the result
+            timeout: Wait limit in seconds for this key (None = the group's)
+
+        Returns:
+            The result of the leader's (or, after a timeout, this caller's) call
+        """
+        timeout = self._timeout if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        existing = self._calls.get(key)
+        if existing is not None and timeout is not None and now - existing[1] > timeout:
+            existing = None
+
+        if existing is None:
+            future = loop.create_future()
+            self._calls[key] = (future, now)
+            self._leaders += 1
+            return await self._lead(key, future, function)
+
+        self._followers += 1
+        future, started = existing
+        remaining = None if timeout is None else max(0.0, timeout - (now - started))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), remaining)
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            return await function()
+        except _LeaderCancelled:
+            return await function()
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """Snapshot of counters."""
+        return SingleFlightStats(
+            leaders=self._leaders,
+            followers=self._followers,
+            timeouts=self._timeouts,
+            in_flight=len(self._calls),
+        )
+
+    async def _lead(
+        self,
+        key: Hashable,
+        future: asyncio.Future,
+        function: Callable[[], Awaitable[T]],
+    ) -> T:
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key, (None,))[0] is future:
+                del self._calls[key]
+            # Mark the exception retrieved: there may be no followers
+            if future.done() and not future.cancelled():
+                future.exception()
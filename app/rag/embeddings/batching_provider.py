@@ -0,0 +1,177 @@
+"""Micro-batching wrapper that coalesces concurrent embedding calls."""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+import numpy as np
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.metrics.histogram import BATCH_SIZE_BUCKETS, LATENCY_MS_BUCKETS, Histogram
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+from app.rag.models.metrics import HistogramSnapshot
+
+
+class _Request:
+    """Texts submitted by one caller and the future receiving their rows."""
+
+    __slots__ = ("texts", "future", "enqueued")
+
+    def __init__(self, texts: List[str]) -> None:
+        self.texts = texts
+        self.future: Future = Future()
+        self.enqueued = time.monotonic()
+
+
+_STOP = object()
+
+
+class BatchingEmbeddingProvider(EmbeddingInterface):
+    """Embedding provider that merges concurrent small requests into batches.
+
+    Calls from many threads are queued; a single worker thread takes the
+    oldest request, keeps collecting until `max_batch_size` texts are
+    queued or `max_wait_ms` has passed since that request arrived, runs one
+    `embed_batch` on the wrapped provider and hands each caller its rows.
+    Requests that alone fill a batch bypass the queue.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingInterface,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        """
+        Initialize the batcher (the worker starts on first use).
+
+        Args:
+            embedder: Wrapped provider doing the actual encoding
+            max_batch_size: Texts per merged batch
+            max_wait_ms: Longest time a request waits for companions
+        """
+        if max_batch_size <= 0:
+            raise ValueError("max_batch_size must be greater than 0")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must be >= 0")
+
+        self._embedder = embedder
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000.0
+        self._queue: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._closed = False
+
+        self._batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self._latencies_ms = Histogram(LATENCY_MS_BUCKETS)
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        """Embed single text (batched with concurrent callers)."""
+        return self.embed_batch([text]).to_vectors()[0]
+
+    def embed_texts(self, texts: List[str]) -> List[EmbeddingVector]:
+        """Embed multiple texts (batched with concurrent callers)."""
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts: List[str]) -> EmbeddingBatch:
+        """Embed texts, sharing one model call with concurrent requests."""
+        if not texts:
+            return EmbeddingBatch(np.empty((0, 0), dtype=np.float32))
+
+        if len(texts) >= self._max_batch_size:
+            started = time.monotonic()
+            batch = self._embedder.embed_batch(texts)
+            self._batch_sizes.observe(len(texts))
+            self._latencies_ms.observe(1000.0 * (time.monotonic() - started))
+            return batch
+
+        if self._closed:
+            raise RuntimeError("BatchingEmbeddingProvider is closed")
+
+        request = _Request(list(texts))
+        self._ensure_worker()
+        self._queue.put(request)
+        return request.future.result()
+
+    @property
+    def batch_sizes(self) -> HistogramSnapshot:
+        """Histogram of texts per model call."""
+        return self._batch_sizes.snapshot()
+
+    @property
+    def latencies_ms(self) -> HistogramSnapshot:
+        """Histogram of per-request latency (queueing + encoding), in ms."""
+        return self._latencies_ms.snapshot()
+
+    def close(self) -> None:
+        """Stop the worker after it drains queued requests."""
+        with self._worker_lock:
+            self._closed = True
+            worker = self._worker
+            self._worker = None
+        if worker is not None:
+            self._queue.put(_STOP)
+            worker.join()
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+    def _run(self) -> None:
+        """Worker loop: collect a batch, encode it, fan results out."""
+        while True:
+            first = self._queue.get()
+            if first is _STOP:
+                return
+
+            batch = [first]
+            size = len(first.texts)
+            deadline = first.enqueued + self._max_wait
+            stop = False
+            while size < self._max_batch_size:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stop = True
+                    break
+                batch.append(item)
+                size += len(item.texts)
+
+            self._encode(batch, size)
+            if stop:
+                return
+
+    def _encode(self, batch: List[_Request], size: int) -> None:
+        """Run one model call for a batch of requests and resolve their futures."""
+        texts = [text for request in batch for text in request.texts]
+        try:
+            embeddings = self._embedder.embed_batch(texts)
+        except BaseException as error:
+            for request in batch:
+                request.future.set_exception(error)
+            return
+
+        self._batch_sizes.observe(size)
+        now = time.monotonic()
+        offset = 0
+        for request in batch:
+            count = len(request.texts)
+            # Row slices are views into the shared batch array
+            request.future.set_result(EmbeddingBatch(embeddings.array[offset:offset + count]))
+            offset += count
+            self._latencies_ms.observe(1000.0 * (now - request.enqueued))
@@ -0,0 +1,189 @@
+"""Content-hash caching wrapper around any embedding provider."""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingCacheStats, EmbeddingVector
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text for cache keys (Unicode NFC, collapsed whitespace)."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class CachedEmbeddingProvider(EmbeddingInterface):
+    """Embedding provider that serves repeated texts from a two-tier cache.
+
+    Entries are keyed by (model name, hash of normalized text). Lookups go
+    to an in-process LRU first, then to an optional SQLite file that
+    survives restarts. Only cache misses reach the wrapped provider, in a
+    single `embed_batch` call per request.
+    """
+
+    def __init__(
+        self,
+        embedder: EmbeddingInterface,
+        model_name: str,
+        max_memory_items: int = 10_000,
+        cache_path: str | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            embedder: Wrapped embedding provider
+            model_name: Model identifier, part of every cache key
+            max_memory_items: Capacity of the in-process LRU tier
+            cache_path: SQLite file for the persistent tier (None disables it)
+        """
+        if max_memory_items <= 0:
+            raise ValueError("max_memory_items must be greater than 0")
+
+        self._embedder = embedder
+        self._model_name = model_name
+        self._max_memory_items = max_memory_items
+        self._memory: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self._memory_hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+
+        self._db: sqlite3.Connection | None = None
+        if cache_path:
+            self._db = sqlite3.connect(cache_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._db.commit()
+
+    def cache_key(self, text: str) -> str:
+        """Return the cache key for a text under this provider's model."""
+        payload = f"{self._model_name}\x00{normalize_text(text)}".encode("utf-8")
+        return hashlib.sha256(payload).hexdigest()
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        """Embed single text, using the cache when possible."""
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> List[EmbeddingVector]:
+        """Embed multiple texts, sending only cache misses to the model."""
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts: List[str]) -> EmbeddingBatch:
+        """Embed multiple texts into one batch, sending only cache misses to the model."""
+        if not texts:
+            return EmbeddingBatch(np.empty((0, 0), dtype=np.float32))
+
+        keys = [self.cache_key(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+
+        missing = [key for key in dict.fromkeys(keys) if key not in found]
+        memory_hit_count = sum(1 for key in keys if key in found)
+
+        from_disk = self._load_from_disk(missing)
+        found.update(from_disk)
+        disk_hit_count = sum(1 for key in keys if key in from_disk)
+
+        # Embed each distinct missing text once, in one batch
+        to_embed: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in to_embed:
+                to_embed[key] = text
+
+        if to_embed:
+            embedded = self._embedder.embed_batch(list(to_embed.values()))
+            # Copy rows so cached entries do not pin the provider's whole batch
+            new_entries = {
+                key: embedded.row(row).copy()
+                for row, key in enumerate(to_embed)
+            }
+            found.update(new_entries)
+            self._store_on_disk(new_entries)
+        else:
+            new_entries = {}
+
+        with self._lock:
+            self._memory_hits += memory_hit_count
+            self._disk_hits += disk_hit_count
+            self._misses += len(keys) - memory_hit_count - disk_hit_count
+            for key, vector in {**from_disk, **new_entries}.items():
+                self._remember(key, vector)
+
+        return EmbeddingBatch(np.stack([found[key] for key in keys]))
+
+    @property
+    def stats(self) -> EmbeddingCacheStats:
+        """Snapshot of hit/miss counters."""
+        with self._lock:
+            return EmbeddingCacheStats(
+                memory_hits=self._memory_hits,
+                disk_hits=self._disk_hits,
+                misses=self._misses,
+            )
+
+    def close(self) -> None:
+        """Close the persistent tier."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the LRU tier, evicting the oldest entries (lock held)."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_items:
+            self._memory.popitem(last=False)
+
+    def _load_from_disk(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Fetch vectors for keys from the SQLite tier."""
+        if self._db is None or not keys:
+            return {}
+
+        loaded: Dict[str, np.ndarray] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            batch = keys[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch,
+                ).fetchall()
+            for key, blob in rows:
+                loaded[key] = np.frombuffer(blob, dtype=np.float32)
+
+        return loaded
+
+    def _store_on_disk(self, entries: Dict[str, np.ndarray]) -> None:
+        """Persist new vectors as float32 blobs."""
+        if self._db is None or not entries:
+            return
+
+        with self._lock:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [(key, vector.astype(np.float32).tobytes()) for key, vector in entries.items()],
+            )
+            self._db.commit()
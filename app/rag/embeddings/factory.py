@@ -0,0 +1,111 @@
+"""Build the configured embedding provider from RAG settings."""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Callable
+
+from app.rag.embeddings.batching_provider import BatchingEmbeddingProvider
+from app.rag.embeddings.cached_provider import CachedEmbeddingProvider
+from app.rag.embeddings.onnx_provider import OnnxEmbeddingProvider, onnx_model_dir
+from app.rag.embeddings.process_pool_provider import (
+    ProcessPoolEmbeddingProvider,
+    default_threads_per_worker,
+)
+from app.rag.embeddings.sentence_transformer_provider import (
+    SentenceTransformerEmbeddingProvider,
+)
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.models.settings import RAGSettings
+
+
+def embedder_factory(
+    settings: RAGSettings,
+    threads: int | None = None,
+) -> Callable[[], EmbeddingInterface]:
+    """
+    Return a picklable callable building the bare provider of embedding_backend.
+
+    Args:
+        settings: RAG settings
+        threads: Intra-op thread cap of the ONNX session (None: runtime default)
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = settings.embedding_backend
+
+    if backend == "sentence-transformers":
+        return partial(
+            SentenceTransformerEmbeddingProvider,
+            settings.embedding_model_name,
+            batch_size=settings.embedding_encode_batch_size,
+            overflow=settings.embedding_overflow,
+            normalize=settings.embedding_normalize,
+        )
+
+    if backend == "onnx":
+        return partial(
+            OnnxEmbeddingProvider,
+            str(onnx_model_dir(settings.onnx_model_dir, settings.embedding_model_name)),
+            quantized=settings.onnx_quantized,
+            batch_size=settings.embedding_encode_batch_size,
+            normalize=settings.embedding_normalize,
+            intra_op_threads=threads,
+        )
+
+    raise ValueError(f"Unknown embedding backend: {backend}")
+
+
+def embedding_cache_namespace(settings: RAGSettings) -> str:
+    """Cache namespace: backends and output options produce different vectors."""
+    if settings.embedding_backend == "onnx":
+        suffix = "onnx-int8" if settings.onnx_quantized else "onnx"
+        namespace = f"{settings.embedding_model_name}:{suffix}"
+    else:
+        namespace = settings.embedding_model_name
+        if settings.embedding_overflow != "truncate":
+            namespace += f":{settings.embedding_overflow}"
+    if settings.embedding_normalize:
+        namespace += ":normalized"
+    return namespace
+
+
+def build_embedder(settings: RAGSettings) -> EmbeddingInterface:
+    """
+    Return the configured embedding provider wrapped in the embedding cache.
+
+    With embedding_batching enabled, cache misses of concurrent callers are
+    merged by a BatchingEmbeddingProvider before reaching the model.
+    """
+    embedder = embedder_factory(settings)()
+    if settings.embedding_batching:
+        embedder = BatchingEmbeddingProvider(
+            embedder,
+            max_batch_size=settings.embedding_batch_size,
+            max_wait_ms=settings.embedding_batch_max_wait_ms,
+        )
+    return CachedEmbeddingProvider(
+        embedder,
+        model_name=embedding_cache_namespace(settings),
+        max_memory_items=settings.embedding_cache_size,
+        cache_path=settings.embedding_cache_path,
+    )
+
+
+def build_indexing_embedder(settings: RAGSettings) -> ProcessPoolEmbeddingProvider | None:
+    """
+    Return a process pool provider for parallel indexing, or None if disabled.
+
+    Every worker builds its own provider for embedding_backend; pass the result to
+    IndexingService.index_documents_parallel and close() it afterwards.
+    """
+    if settings.indexing_workers <= 0:
+        return None
+    threads = default_threads_per_worker(settings.indexing_workers)
+    return ProcessPoolEmbeddingProvider(
+        embedder_factory(settings, threads=threads),
+        workers=settings.indexing_workers,
+        shard_size=settings.indexing_shard_size,
+        threads_per_worker=threads,
+    )
@@ -0,0 +1,197 @@
+"""ONNX Runtime embedding provider for exported sentence-transformers models."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, List, Tuple
+
+import numpy as np
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+
+if TYPE_CHECKING:
+    from onnxruntime import InferenceSession
+    from tokenizers import Tokenizer
+
+MODEL_FILE = "model.onnx"
+QUANTIZED_MODEL_FILE = "model_quantized.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+def onnx_model_dir(root: str, model_name: str) -> Path:
+    """Directory holding the exported files of model_name under root."""
+    return Path(root) / model_name.replace("/", "__")
+
+
+def export_onnx_model(model_name: str, output_dir: str, quantize: bool = False) -> Path:
+    """
+    Export a Hugging Face / sentence-transformers model to ONNX.
+
+    Writes model.onnx and tokenizer.json to output_dir and, with quantize,
+    a dynamically int8-quantized model_quantized.onnx next to them.
+    Requires the optional `optimum[onnxruntime]` package.
+
+    Args:
+        model_name: Model id, e.g. "sentence-transformers/all-MiniLM-L6-v2"
+        output_dir: Destination directory
+        quantize: Also write the int8 model
+
+    Returns:
+        The output directory
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from transformers import AutoTokenizer
+
+    path = Path(output_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(path)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(path)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantize_dynamic(
+            str(path / MODEL_FILE), str(path / QUANTIZED_MODEL_FILE), weight_type=QuantType.QInt8
+        )
+
+    return path
+
+
+class OnnxEmbeddingProvider(EmbeddingInterface):
+    """Embedding provider running an exported ONNX model on ONNX Runtime.
+
+    Avoids the PyTorch import and inference cost on CPU-only hosts. Texts are
+    tokenized with the Rust `tokenizers` fast tokenizer, sorted by token
+    length and run in batches padded only to their own longest sequence;
+    rows are restored to input order afterwards. Token embeddings are
+    mean-pooled over the attention mask (as sentence-transformers does) and
+    optionally L2-normalized.
+
+    Expects `model.onnx` (or `model_quantized.onnx` when quantized) and
+    `tokenizer.json` in model_dir, as written by `export_onnx_model`.
+    """
+
+    def __init__(
+        self,
+        model_dir: str,
+        quantized: bool = False,
+        batch_size: int = 32,
+        max_length: int = 256,
+        normalize: bool = True,
+        intra_op_threads: int | None = None,
+    ) -> None:
+        """
+        Initialize with the export directory (lazy loading).
+
+        Args:
+            model_dir: Directory with the ONNX model and tokenizer.json
+            quantized: Use the int8-quantized model file
+            batch_size: Texts per inference batch
+            max_length: Tokens kept per text (longer texts are truncated)
+            normalize: L2-normalize output vectors
+            intra_op_threads: ONNX Runtime threads per session (runtime default when None)
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+        if max_length <= 0:
+            raise ValueError("max_length must be greater than 0")
+
+        self._model_dir = Path(model_dir)
+        self._quantized = quantized
+        self._batch_size = batch_size
+        self._max_length = max_length
+        self._normalize = normalize
+        self._intra_op_threads = intra_op_threads
+        self._session: InferenceSession | None = None
+        self._tokenizer: Tokenizer | None = None
+
+    def _load(self) -> Tuple[Any, Any]:
+        """Lazy load the tokenizer and inference session on first use."""
+        if self._session is None:
+            import onnxruntime
+            from tokenizers import Tokenizer
+
+            tokenizer = Tokenizer.from_file(str(self._model_dir / TOKENIZER_FILE))
+            tokenizer.enable_truncation(max_length=self._max_length)
+            tokenizer.no_padding()
+
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self._intra_op_threads:
+                options.intra_op_num_threads = self._intra_op_threads
+
+            model_file = QUANTIZED_MODEL_FILE if self._quantized else MODEL_FILE
+            self._tokenizer = tokenizer
+            self._session = onnxruntime.InferenceSession(
+                str(self._model_dir / model_file),
+                sess_options=options,
+                providers=["CPUExecutionProvider"],
+            )
+        return self._tokenizer, self._session
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        """Embed single text into vector."""
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> List[EmbeddingVector]:
+        """Embed multiple texts into vectors (batch operation)."""
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts: List[str]) -> EmbeddingBatch:
+        """Embed texts in length-sorted, dynamically padded batches."""
+        if not texts:
+            return EmbeddingBatch.from_vectors([])
+
+        tokenizer, session = self._load()
+        encodings = tokenizer.encode_batch(list(texts))
+        input_names = {model_input.name for model_input in session.get_inputs()}
+
+        # Similar lengths share a batch, so padding stays small
+        order = np.argsort([len(encoding.ids) for encoding in encodings], kind="stable")
+        output: np.ndarray | None = None
+
+        for start in range(0, len(order), self._batch_size):
+            rows = order[start:start + self._batch_size]
+            pooled = self._run(session, input_names, [encodings[row] for row in rows])
+            if output is None:
+                output = np.empty((len(texts), pooled.shape[1]), dtype=np.float32)
+            output[rows] = pooled
+
+        if self._normalize:
+            norms = np.linalg.norm(output, axis=1, keepdims=True)
+            output /= np.maximum(norms, 1e-12)
+        return EmbeddingBatch(output)
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens as seen by the tokenizer (no special tokens)."""
+        tokenizer, _ = self._load()
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+    @property
+    def max_seq_length(self) -> int:
+        """Maximum number of tokens embedded before truncating."""
+        return self._max_length
+
+    @staticmethod
+    def _run(session: Any, input_names: set, encodings: list) -> np.ndarray:
+        """Pad one batch to its longest sequence, run it and mean-pool."""
+        width = max(len(encoding.ids) for encoding in encodings)
+        ids = np.zeros((len(encodings), width), dtype=np.int64)
+        mask = np.zeros((len(encodings), width), dtype=np.int64)
+        types = np.zeros((len(encodings), width), dtype=np.int64)
+        for i, encoding in enumerate(encodings):
+            length = len(encoding.ids)
+            ids[i, :length] = encoding.ids
+            mask[i, :length] = encoding.attention_mask
+            types[i, :length] = encoding.type_ids
+
+        feeds = {"input_ids": ids, "attention_mask": mask, "token_type_ids": types}
+        hidden = session.run(None, {name: feeds[name] for name in input_names if name in feeds})[0]
+        if hidden.ndim == 2:
+            # Graph already ends in a pooling layer
+            return hidden.astype(np.float32, copy=False)
+
+        weights = mask[:, :, None].astype(np.float32)
+        summed = (hidden * weights).sum(axis=1)
+        return summed / np.maximum(weights.sum(axis=1), 1e-9)
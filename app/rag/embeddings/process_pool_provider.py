@@ -0,0 +1,189 @@
+"""Embedding provider sharding texts across a pool of worker processes."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, List
+
+import numpy as np
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+
+# Embedder built by the pool initializer, one per worker process
+_worker_embedder: EmbeddingInterface | None = None
+
+# Variables sizing the OpenMP / MKL / OpenBLAS thread pools of a process
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS")
+
+
+def default_threads_per_worker(workers: int) -> int:
+    """Share the CPU cores evenly between worker processes."""
+    return max(1, (os.cpu_count() or 1) // workers)
+
+
+def _init_worker(factory: Callable[[], EmbeddingInterface], threads: int) -> None:
+    """Cap the worker's compute threads, then build its embedder once."""
+    global _worker_embedder
+    # Set before the model library is (lazily) imported, which reads them then
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(threads)
+    _worker_embedder = factory()
+    torch = sys.modules.get("torch")
+    if torch is not None:
+        torch.set_num_threads(threads)
+
+
+def _embed_shard(texts: List[str]) -> np.ndarray:
+    """Embed one shard in a worker process (arrays pickle compactly)."""
+    return _worker_embedder.embed_batch(texts).array
+
+
+class ProcessPoolEmbeddingProvider(EmbeddingInterface):
+    """Embedding provider that encodes shards of texts in parallel processes.
+
+    Each worker calls `factory` once at startup, so the model is loaded once
+    per process rather than once per shard. A batch is split into
+    contiguous shards of at most `shard_size` texts which are encoded
+    concurrently and concatenated back in input order. `submit` returns a
+    future instead of blocking, which lets callers overlap other work (such
+    as store writes) with encoding.
+
+    The factory must be picklable: a module-level function or class, or a
+    `functools.partial` of one, e.g.
+    `partial(SentenceTransformerEmbeddingProvider, model_name)`.
+
+    Every worker caps its intra-op threads at `threads_per_worker` (CPU
+    count // workers by default): left alone, each worker would start one
+    thread per core and the pool would oversubscribe the CPU workers-fold.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], EmbeddingInterface],
+        workers: int | None = None,
+        shard_size: int = 64,
+        start_method: str = "spawn",
+        threads_per_worker: int | None = None,
+    ) -> None:
+        """
+        Initialize the provider (worker processes start on first use).
+
+        Args:
+            factory: Picklable callable building the embedder inside a worker
+            workers: Number of worker processes (defaults to the CPU count)
+            shard_size: Maximum texts encoded by one worker per task
+            start_method: multiprocessing start method; "spawn" avoids
+                inheriting threads and model state from the parent
+            threads_per_worker: Compute threads per worker (defaults to
+                CPU count // workers, at least 1)
+        """
+        if workers is not None and workers <= 0:
+            raise ValueError("workers must be greater than 0")
+        if shard_size <= 0:
+            raise ValueError("shard_size must be greater than 0")
+        if threads_per_worker is not None and threads_per_worker <= 0:
+            raise ValueError("threads_per_worker must be greater than 0")
+
+        self._factory = factory
+        self._workers = workers or os.cpu_count() or 1
+        self._threads_per_worker = threads_per_worker or default_threads_per_worker(
+            self._workers
+        )
+        self._shard_size = shard_size
+        self._start_method = start_method
+        self._executor: ProcessPoolExecutor | None = None
+
+    @property
+    def workers(self) -> int:
+        """Number of worker processes."""
+        return self._workers
+
+    @property
+    def threads_per_worker(self) -> int:
+        """Compute threads each worker process may use."""
+        return self._threads_per_worker
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        """Embed single text into vector."""
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> List[EmbeddingVector]:
+        """Embed multiple texts into vectors."""
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts: List[str]) -> EmbeddingBatch:
+        """Embed texts across the workers and return rows in input order."""
+        return self.submit(texts).result()
+
+    def submit(self, texts: List[str]) -> Future:
+        """
+        Start embedding texts without waiting for the result.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Future resolving to an EmbeddingBatch with one row per text, in order
+        """
+        result: Future = Future()
+        if not texts:
+            result.set_result(EmbeddingBatch.from_vectors([]))
+            return result
+
+        executor = self._ensure_executor()
+        shards = [
+            executor.submit(_embed_shard, texts[start:start + self._shard_size])
+            for start in range(0, len(texts), self._shard_size)
+        ]
+        pending = [len(shards)]
+        lock = threading.Lock()
+
+        def _on_result_done(_: Future) -> None:
+            # Cancelling the batch cancels its shards that have not started
+            if result.cancelled():
+                for shard in shards:
+                    shard.cancel()
+
+        def _on_shard_done(_: Future) -> None:
+            # Callbacks run on the executor's management thread (or inline if
+            # the shard already finished); the last one assembles the batch
+            # in submission order
+            with lock:
+                pending[0] -= 1
+                if pending[0]:
+                    return
+            # False once the batch was cancelled; afterwards cancel() fails,
+            # so resolving below cannot race with it
+            if not result.set_running_or_notify_cancel():
+                return
+            try:
+                arrays = [shard.result() for shard in shards]
+                result.set_result(EmbeddingBatch(np.concatenate(arrays, axis=0)))
+            except BaseException as e:
+                result.set_exception(e)
+
+        result.add_done_callback(_on_result_done)
+        for shard in shards:
+            shard.add_done_callback(_on_shard_done)
+        return result
+
+    def close(self) -> None:
+        """Shut the worker processes down (they restart on next use)."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context(self._start_method),
+                initializer=_init_worker,
+                initargs=(self._factory, self._threads_per_worker),
+            )
+        return self._executor
@@ -2,21 +2,60 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
 
 from app.rag.interfaces.embeddings import EmbeddingInterface
-from app.rag.models.embeddings import EmbeddingVector
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
 
 if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer
 
+OVERFLOW_MODES = ("truncate", "split")
+
+# Room left for the [CLS]/[SEP] style tokens the model adds to every input
+_SPECIAL_TOKENS = 2
+
 
 class SentenceTransformerEmbeddingProvider(EmbeddingInterface):
-    """Embedding provider using sentence-transformers library."""
+    """Embedding provider using sentence-transformers library.
+
+    Texts are sorted by length and encoded in buckets of `batch_size`, so
+    short texts are not padded to the length of long ones; rows are
+    returned in input order. Texts longer than the model's max sequence
+    length are either truncated by the model ("truncate") or split into
+    windows whose embeddings are mean-pooled, weighted by token count
+    ("split"). Only "split" tokenizes up front (it needs the token ids to
+    cut windows); "truncate" sorts by character count, a cheap proxy that
+    spares tokenizing every text twice.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        batch_size: int = 32,
+        overflow: str = "truncate",
+        normalize: bool = False,
+    ) -> None:
+        """
+        Initialize with model name (lazy loading).
+
+        Args:
+            model_name: sentence-transformers model id
+            batch_size: Texts per encode call (one length bucket)
+            overflow: "truncate" or "split" for texts over max_seq_length
+            normalize: L2-normalize output vectors, so cosine is a dot product
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+        if overflow not in OVERFLOW_MODES:
+            raise ValueError(f"overflow must be one of {OVERFLOW_MODES}")
 
-    def __init__(self, model_name: str) -> None:
-        """Initialize with model name (lazy loading)."""
         self._model_name = model_name
+        self._batch_size = batch_size
+        self._overflow = overflow
+        self._normalize = normalize
         self._model: SentenceTransformer | None = None
 
     def _load_model(self) -> SentenceTransformer:
@@ -28,12 +67,94 @@ class SentenceTransformerEmbeddingProvider(EmbeddingInterface):
 
     def embed_text(self, text: str) -> EmbeddingVector:
         """Embed single text into vector."""
-        model = self._load_model()
-        embedding = model.encode(text, convert_to_numpy=True)
-        return EmbeddingVector(vector=embedding.tolist())
+        return self.embed_batch([text]).to_vectors()[0]
 
     def embed_texts(self, texts: List[str]) -> List[EmbeddingVector]:
         """Embed multiple texts into vectors (batch operation)."""
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts: List[str]) -> EmbeddingBatch:
+        """Embed multiple texts into one (n, dim) float32 batch."""
+        if not texts:
+            return EmbeddingBatch.from_vectors([])
+
         model = self._load_model()
-        embeddings = model.encode(texts, convert_to_numpy=True)
-        return [EmbeddingVector(vector=emb.tolist()) for emb in embeddings]
+        if self._overflow == "truncate":
+            output = self._encode_sorted(model, list(texts), [len(text) for text in texts])
+        else:
+            output = self._encode_split(model, texts)
+
+        if self._normalize:
+            output = output / np.maximum(np.linalg.norm(output, axis=1, keepdims=True), 1e-12)
+        return EmbeddingBatch(output)
+
+    def count_tokens(self, text: str) -> int:
+        """Count tokens as seen by the model's tokenizer (no special tokens)."""
+        model = self._load_model()
+        return len(model.tokenizer.encode(text, add_special_tokens=False))
+
+    @property
+    def max_seq_length(self) -> int:
+        """Maximum number of tokens the model embeds before truncating."""
+        return self._load_model().max_seq_length
+
+    def _encode_split(self, model: SentenceTransformer, texts: List[str]) -> np.ndarray:
+        """Encode texts, mean-pooling the windows of over-long ones by token count."""
+        token_ids = model.tokenizer(list(texts), add_special_tokens=False)["input_ids"]
+        pieces, owners, piece_ids = self._pieces(model, texts, token_ids)
+        embeddings = self._encode_sorted(model, pieces, [len(ids) for ids in piece_ids])
+        if len(pieces) == len(texts):
+            return embeddings
+
+        token_counts = np.array([max(len(ids), 1) for ids in piece_ids], dtype=np.float32)
+        output = np.zeros((len(texts), embeddings.shape[1]), dtype=np.float32)
+        np.add.at(output, owners, embeddings * token_counts[:, None])
+        output /= np.bincount(owners, weights=token_counts)[:, None].astype(np.float32)
+        return output
+
+    def _pieces(
+        self,
+        model: SentenceTransformer,
+        texts: List[str],
+        token_ids: List[List[int]],
+    ) -> Tuple[List[str], np.ndarray, List[List[int]]]:
+        """Windows to encode, the input row each came from, and their token ids."""
+        window = max(model.max_seq_length - _SPECIAL_TOKENS, 1)
+        pieces: List[str] = []
+        owners: List[int] = []
+        piece_ids: List[List[int]] = []
+        for row, (text, ids) in enumerate(zip(texts, token_ids)):
+            if len(ids) <= window:
+                pieces.append(text)
+                owners.append(row)
+                piece_ids.append(ids)
+                continue
+            for start in range(0, len(ids), window):
+                part = ids[start:start + window]
+                pieces.append(model.tokenizer.decode(part))
+                owners.append(row)
+                piece_ids.append(part)
+        return pieces, np.array(owners), piece_ids
+
+    def _encode_sorted(
+        self,
+        model: SentenceTransformer,
+        texts: List[str],
+        lengths: List[int],
+    ) -> np.ndarray:
+        """Encode texts in length-sorted buckets and restore input order."""
+        order = np.argsort(lengths, kind="stable")
+        output: np.ndarray | None = None
+
+        for start in range(0, len(order), self._batch_size):
+            rows = order[start:start + self._batch_size]
+            encoded = model.encode(
+                [texts[row] for row in rows],
+                batch_size=len(rows),
+                convert_to_numpy=True,
+            )
+            if output is None:
+                output = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+            output[rows] = encoded
+
+        return output
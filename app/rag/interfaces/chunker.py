@@ -0,0 +1,12 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class ChunkerInterface(ABC):
+
+    @abstractmethod
+    def split_text(self, text: str) -> List[str]:
+        """Split text into ordered chunk strings (empty list for blank text)."""
+        raise NotImplementedError
@@ -3,7 +3,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import List
 
-from app.rag.models.embeddings import EmbeddingVector
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
 
 
 class EmbeddingInterface(ABC):
@@ -14,4 +14,8 @@ class EmbeddingInterface(ABC):
 
     @abstractmethod
     def embed_texts(self, texts: List[str]) -> List[EmbeddingVector]:
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def embed_batch(self, texts: List[str]) -> EmbeddingBatch:
+        """Embed texts into one array-backed batch (override to avoid list conversion)."""
+        return EmbeddingBatch.from_vectors(self.embed_texts(texts))
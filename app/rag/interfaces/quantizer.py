@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+
+class QuantizerInterface(ABC):
+
+    @property
+    @abstractmethod
+    def code_size(self) -> int:
+        """Bytes per encoded vector."""
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def is_trained(self) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def train(self, vectors: np.ndarray) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Encode (n, dim) float32 vectors into (n, code_size) uint8 codes."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate (n, dim) float32 vectors from codes."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def similarities(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate (queries x codes) inner products without decoding (ADC)."""
+        raise NotImplementedError
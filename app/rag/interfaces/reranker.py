@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import List, Sequence
+
+from app.rag.models.documents import ScoredDocumentChunk
+
+
+class RerankerInterface(ABC):
+
+    @abstractmethod
+    def rerank(
+        self,
+        query: str,
+        candidates: Sequence[ScoredDocumentChunk],
+        *,
+        top_k: int,
+    ) -> List[ScoredDocumentChunk]:
+        """Reorder candidates by relevance to query; at most top_k, score ascending."""
+        raise NotImplementedError
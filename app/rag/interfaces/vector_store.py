@@ -4,7 +4,8 @@ from abc import ABC, abstractmethod
 from typing import List
 
 from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
-from app.rag.models.embeddings import EmbeddingVector
+from app.rag.models.embeddings import EmbeddingLike, EmbeddingsLike, as_array
+from app.rag.models.filters import MetadataFilter
 
 
 class VectorStoreInterface(ABC):
@@ -13,21 +14,49 @@ class VectorStoreInterface(ABC):
     def add_chunks(
         self,
         chunks: List[DocumentChunk],
-        embeddings: List[EmbeddingVector],
+        embeddings: EmbeddingsLike,
     ) -> None:
-        
+
         raise NotImplementedError
 
     @abstractmethod
     def query(
         self,
-        embedding: EmbeddingVector,
+        embedding: EmbeddingLike,
         top_k: int = 5,
+        filters: MetadataFilter | None = None,
     ) -> List[ScoredDocumentChunk]:
 
         raise NotImplementedError
 
+    def query_many(
+        self,
+        embeddings: EmbeddingsLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> List[List[ScoredDocumentChunk]]:
+        """Query several embeddings; backends override this with a batched search."""
+        return [
+            self.query(embedding, top_k=top_k, filters=filters)
+            for embedding in as_array(embeddings)
+        ]
+
     @abstractmethod
     def delete_by_document_ids(self, document_ids: List[str]) -> None:
 
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete_chunks(self, chunk_ids: List[str]) -> None:
+        """Delete individual chunks by ID (incremental indexing removes stale chunks)."""
+        raise NotImplementedError
+
+    def replace_documents(
+        self,
+        document_ids: List[str],
+        chunks: List[DocumentChunk],
+        embeddings: EmbeddingsLike,
+    ) -> None:
+        """Replace all chunks of the given documents with the new chunks."""
+        self.delete_by_document_ids(document_ids)
+        self.add_chunks(chunks, embeddings)
@@ -0,0 +1,5 @@
+"""
+Lexical Retrieval
+
+In-process BM25 inverted index and rank fusion with vector search results.
+"""
@@ -0,0 +1,376 @@
+"""In-process BM25 inverted index over document chunks."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Set
+
+import numpy as np
+
+from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+from app.rag.models.filters import MetadataFilter
+from app.rag.vectorstores.metadata_index import MetadataIndex
+from app.rag.vectorstores.versions import POINTER_FILE, create_version, publish_version
+
+# Words, keeping identifiers such as "E-1042", "SKU_77.b" or "v2.1" whole
+_TOKEN_RE = re.compile(r"\w+(?:[-./:]\w+)*")
+_PART_RE = re.compile(r"[-./:_]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Casefolded terms of text.
+
+    Compound identifiers are emitted whole and as their parts, so
+    "SKU-123" matches queries for "sku-123", "SKU" and "123".
+    """
+    terms: List[str] = []
+    for token in _TOKEN_RE.findall(text.casefold()):
+        terms.append(token)
+        if _PART_RE.search(token):
+            terms.extend(part for part in _PART_RE.split(token) if part)
+    return terms
+
+
+class BM25Index:
+    """Okapi BM25 inverted index, updated incrementally and persisted on flush.
+
+    Postings are compact typed arrays (chunk row, term frequency) per term.
+    Upserting a chunk id or deleting chunks/documents tombstones rows, and
+    postings are rebuilt once tombstones exceed `compaction_ratio` of the
+    rows. Scores are negated BM25 (lower is better, like vector distances).
+
+    With `path`, an index previously written there by `flush()` is loaded.
+    Each flush writes a new version directory and then atomically switches
+    the CURRENT pointer file to it, so readers only ever see complete
+    versions. An index without local changes reloads on search once
+    another process has flushed a newer version.
+    """
+
+    CONFIG_FILE = "bm25.json"
+    ARRAYS_FILE = "bm25.npz"
+    CHUNKS_FILE = "chunks.jsonl"
+    POINTER_FILE = POINTER_FILE
+
+    def __init__(
+        self,
+        k1: float = 1.2,
+        b: float = 0.75,
+        path: str | None = None,
+        compaction_ratio: float = 0.25,
+    ) -> None:
+        """
+        Initialize an empty index, or load the one stored in path.
+
+        Args:
+            k1: Term frequency saturation
+            b: Document length normalization (0 disables it)
+            path: Directory the index is loaded from and flushed to
+            compaction_ratio: Tombstone ratio triggering a postings rebuild
+        """
+        if k1 < 0:
+            raise ValueError("k1 must be >= 0")
+        if not 0.0 <= b <= 1.0:
+            raise ValueError("b must be in [0, 1]")
+        if not 0.0 < compaction_ratio <= 1.0:
+            raise ValueError("compaction_ratio must be in (0, 1]")
+
+        self._k1 = k1
+        self._b = b
+        self._path = Path(path) if path else None
+        self._compaction_ratio = compaction_ratio
+        self._lock = threading.RLock()
+
+        self._postings_rows: Dict[str, array] = {}
+        self._postings_tfs: Dict[str, array] = {}
+        self._lengths = array("I")
+        self._alive = array("b")
+        self._chunks: List[DocumentChunk | None] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._rows_by_document: Dict[str, Set[int]] = {}
+        self._metadata = MetadataIndex()
+        self._live_length = 0
+        self._tombstones = 0
+        # Loaded/flushed version, pointer file identity (() = never checked),
+        # unflushed local changes
+        self._version: str | None = None
+        self._pointer_stamp: tuple | None = ()
+        self._dirty = False
+
+        if self._path is not None:
+            self.refresh()
+
+    def count(self) -> int:
+        """Number of live chunks."""
+        with self._lock:
+            return len(self._row_by_id)
+
+    def add_chunks(self, chunks: Iterable[DocumentChunk]) -> None:
+        """Index chunks, replacing any chunk with the same id."""
+        with self._lock:
+            for chunk in chunks:
+                if chunk.id in self._row_by_id:
+                    self._remove_row(self._row_by_id[chunk.id])
+                self._append(chunk)
+                self._dirty = True
+            self._maybe_compact()
+
+    def delete_chunks(self, chunk_ids: Iterable[str]) -> None:
+        """Remove chunks by id (unknown ids are ignored)."""
+        with self._lock:
+            for chunk_id in chunk_ids:
+                row = self._row_by_id.get(chunk_id)
+                if row is not None:
+                    self._remove_row(row)
+                    self._dirty = True
+            self._maybe_compact()
+
+    def delete_by_document_ids(self, document_ids: Iterable[str]) -> None:
+        """Remove every chunk of the given documents."""
+        with self._lock:
+            for document_id in document_ids:
+                for row in list(self._rows_by_document.get(document_id, ())):
+                    self._remove_row(row)
+                    self._dirty = True
+            self._maybe_compact()
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> List[ScoredDocumentChunk]:
+        """
+        Return the top_k chunks by BM25 score for query.
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of results
+            filters: Optional metadata conditions results must satisfy
+
+        Returns:
+            Matching chunks, best first, scored by negated BM25
+        """
+        if top_k <= 0:
+            raise ValueError("top_k must be greater than 0")
+
+        self.refresh()
+        with self._lock:
+            live = len(self._row_by_id)
+            if live == 0:
+                return []
+
+            alive = np.frombuffer(self._alive, dtype=np.int8).astype(bool)
+            lengths = np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float32)
+            average_length = self._live_length / live
+            norms = self._k1 * (1.0 - self._b + self._b * lengths / average_length)
+            scores = np.zeros(len(self._chunks), dtype=np.float32)
+
+            for term in set(tokenize(query)):
+                rows_buffer = self._postings_rows.get(term)
+                if rows_buffer is None:
+                    continue
+                rows = np.frombuffer(rows_buffer, dtype=np.uint32)
+                tfs = np.frombuffer(self._postings_tfs[term], dtype=np.uint32).astype(np.float32)
+                live_postings = alive[rows]
+                df = int(live_postings.sum())
+                if df == 0:
+                    continue
+                rows, tfs = rows[live_postings], tfs[live_postings]
+                idf = np.log1p((live - df + 0.5) / (df + 0.5))
+                scores[rows] += idf * tfs * (self._k1 + 1.0) / (tfs + norms[rows])
+
+            matches = scores > 0
+            if filters is not None and not filters.is_empty:
+                matches &= self._metadata.mask(filters, len(self._chunks))
+            candidates = np.flatnonzero(matches)
+            if len(candidates) == 0:
+                return []
+            order = candidates[np.argsort(-scores[candidates], kind="stable")][:top_k]
+            return [
+                ScoredDocumentChunk(chunk=self._chunks[row], score=-float(scores[row]))
+                for row in order
+            ]
+
+    def refresh(self) -> bool:
+        """
+        Load the newest flushed version if it differs from the one in memory.
+
+        Indexes with unflushed changes are left alone (their own flush will
+        publish them). Cheap when nothing changed: one stat of the pointer.
+
+        Returns:
+            Whether a different version was loaded
+        """
+        if self._path is None:
+            return False
+        pointer = self._path / self.POINTER_FILE
+        try:
+            info = pointer.stat()
+        except FileNotFoundError:
+            info = None
+        stamp = (info.st_ino, info.st_mtime_ns, info.st_size) if info else None
+
+        with self._lock:
+            if stamp == self._pointer_stamp or self._dirty:
+                return False
+            self._pointer_stamp = stamp
+            if info is None:
+                # Layout written before versioning: files directly in path
+                version = "" if (self._path / self.CONFIG_FILE).exists() else None
+            else:
+                version = pointer.read_text(encoding="utf-8").strip()
+            if version is None or version == self._version:
+                return False
+            self._reset()
+            self._load(self._path / version)
+            self._version = version
+            return True
+
+    def flush(self) -> None:
+        """
+        Write the index to path as a new version.
+
+        No-op for an in-memory index, and when nothing changed since the
+        version this index loaded or last wrote (readers then keep theirs).
+        """
+        if self._path is None:
+            return
+        with self._lock:
+            if not self._dirty and self._version is not None:
+                return
+            self.compact()
+            directory = create_version(self._path)
+            version = directory.name
+
+            terms = sorted(self._postings_rows)
+            offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+            offsets[1:] = np.cumsum([len(self._postings_rows[term]) for term in terms])
+            arrays = {
+                "offsets": offsets,
+                "rows": np.concatenate(
+                    [np.frombuffer(self._postings_rows[t], dtype=np.uint32) for t in terms]
+                ) if terms else np.zeros(0, dtype=np.uint32),
+                "tfs": np.concatenate(
+                    [np.frombuffer(self._postings_tfs[t], dtype=np.uint32) for t in terms]
+                ) if terms else np.zeros(0, dtype=np.uint32),
+                "lengths": np.frombuffer(self._lengths, dtype=np.uint32),
+            }
+            with open(directory / self.ARRAYS_FILE, "wb") as handle:
+                np.savez(handle, **arrays)
+                handle.flush()
+                os.fsync(handle.fileno())
+
+            with open(directory / self.CHUNKS_FILE, "w", encoding="utf-8") as handle:
+                for chunk in self._chunks:
+                    handle.write(json.dumps({
+                        "id": chunk.id,
+                        "document_id": chunk.document_id,
+                        "content": chunk.content,
+                        "index": chunk.index,
+                        "metadata": dict(chunk.metadata),
+                    }) + "\n")
+                handle.flush()
+                os.fsync(handle.fileno())
+
+            config = {"k1": self._k1, "b": self._b, "terms": terms}
+            with open(directory / self.CONFIG_FILE, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(config))
+                handle.flush()
+                os.fsync(handle.fileno())
+
+            # Publish: readers switch to the complete new version at once
+            publish_version(self._path, version)
+
+            info = (self._path / self.POINTER_FILE).stat()
+            self._pointer_stamp = (info.st_ino, info.st_mtime_ns, info.st_size)
+            self._version = version
+            self._dirty = False
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and rebuild postings."""
+        with self._lock:
+            if self._tombstones == 0:
+                return
+            chunks = [chunk for chunk in self._chunks if chunk is not None]
+            self._reset()
+            for chunk in chunks:
+                self._append(chunk)
+
+    def _append(self, chunk: DocumentChunk) -> None:
+        """Add one chunk as a new row (lock held)."""
+        row = len(self._chunks)
+        terms = tokenize(chunk.content)
+        frequencies: Dict[str, int] = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        for term, tf in frequencies.items():
+            if term not in self._postings_rows:
+                self._postings_rows[term] = array("I")
+                self._postings_tfs[term] = array("I")
+            self._postings_rows[term].append(row)
+            self._postings_tfs[term].append(tf)
+
+        self._chunks.append(chunk)
+        self._lengths.append(len(terms))
+        self._alive.append(1)
+        self._row_by_id[chunk.id] = row
+        self._rows_by_document.setdefault(chunk.document_id, set()).add(row)
+        self._metadata.add(row, chunk)
+        self._live_length += len(terms)
+
+    def _remove_row(self, row: int) -> None:
+        """Tombstone one row (lock held)."""
+        chunk = self._chunks[row]
+        del self._row_by_id[chunk.id]
+        rows = self._rows_by_document[chunk.document_id]
+        rows.discard(row)
+        if not rows:
+            del self._rows_by_document[chunk.document_id]
+        self._chunks[row] = None
+        self._alive[row] = 0
+        self._live_length -= self._lengths[row]
+        self._tombstones += 1
+
+    def _maybe_compact(self) -> None:
+        if self._chunks and self._tombstones > self._compaction_ratio * len(self._chunks):
+            self.compact()
+
+    def _reset(self) -> None:
+        self._postings_rows, self._postings_tfs = {}, {}
+        self._lengths, self._alive = array("I"), array("b")
+        self._chunks, self._row_by_id, self._rows_by_document = [], {}, {}
+        self._metadata = MetadataIndex()
+        self._live_length = self._tombstones = 0
+
+    def _load(self, directory: Path) -> None:
+        """Load a version written by flush() into the empty index (lock held)."""
+        config = json.loads((directory / self.CONFIG_FILE).read_text(encoding="utf-8"))
+        self._k1, self._b = config["k1"], config["b"]
+
+        with np.load(directory / self.ARRAYS_FILE) as arrays:
+            offsets, rows, tfs = arrays["offsets"], arrays["rows"], arrays["tfs"]
+            lengths = arrays["lengths"]
+
+        with open(directory / self.CHUNKS_FILE, encoding="utf-8") as handle:
+            chunks = [DocumentChunk(**json.loads(line)) for line in handle if line.strip()]
+
+        for i, term in enumerate(config["terms"]):
+            start, end = offsets[i], offsets[i + 1]
+            self._postings_rows[term] = array("I", rows[start:end].astype(np.uint32).tobytes())
+            self._postings_tfs[term] = array("I", tfs[start:end].astype(np.uint32).tobytes())
+
+        self._lengths = array("I", lengths.astype(np.uint32).tobytes())
+        self._alive = array("b", [1] * len(chunks))
+        self._chunks = list(chunks)
+        for row, chunk in enumerate(chunks):
+            self._row_by_id[chunk.id] = row
+            self._rows_by_document.setdefault(chunk.document_id, set()).add(row)
+            self._metadata.add(row, chunk)
+        self._live_length = int(lengths.sum())
@@ -0,0 +1,44 @@
+"""Reciprocal rank fusion of several ranked result lists."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[ScoredDocumentChunk]],
+    *,
+    k: int = 60,
+    top_k: int | None = None,
+) -> List[ScoredDocumentChunk]:
+    """
+    Fuse ranked lists with RRF: a chunk scores sum(1 / (k + rank)) over lists.
+
+    Only ranks are used, so lists with incomparable scores (distances, BM25)
+    can be combined. Ties keep the order of first appearance.
+
+    Args:
+        rankings: Result lists, each best first
+        k: Rank smoothing constant (larger flattens the top ranks' advantage)
+        top_k: Maximum number of results (all when None)
+
+    Returns:
+        Fused chunks, best first, scored by negated RRF score (lower is better)
+    """
+    if k <= 0:
+        raise ValueError("k must be greater than 0")
+
+    fused: Dict[str, float] = {}
+    chunks: Dict[str, DocumentChunk] = {}
+    for ranking in rankings:
+        for rank, scored_chunk in enumerate(ranking, start=1):
+            chunk_id = scored_chunk.chunk.id
+            fused[chunk_id] = fused.get(chunk_id, 0.0) + 1.0 / (k + rank)
+            chunks.setdefault(chunk_id, scored_chunk.chunk)
+
+    order = sorted(fused, key=lambda chunk_id: -fused[chunk_id])
+    if top_k is not None:
+        order = order[:top_k]
+    return [ScoredDocumentChunk(chunk=chunks[chunk_id], score=-fused[chunk_id]) for chunk_id in order]
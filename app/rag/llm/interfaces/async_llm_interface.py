@@ -0,0 +1,42 @@
+"""Abstract base class for asynchronous LLM providers."""
+
+from abc import ABC, abstractmethod
+from typing import AsyncIterator
+
+
+class AsyncLLMInterface(ABC):
+    """Interface contract for non-blocking LLM providers.
+
+    Async counterpart of LLMInterface: a pending generation awaits network
+    I/O instead of holding a worker thread, so one event loop can serve
+    many concurrent requests.
+    """
+
+    @abstractmethod
+    async def generate(self, prompt: str) -> str:
+        """Generate text completion from a prompt.
+
+        Args:
+            prompt: Input text prompt to send to the LLM.
+
+        Returns:
+            Generated text response from the LLM.
+        """
+        pass
+
+    async def generate_stream(self, prompt: str) -> AsyncIterator[str]:
+        """Generate a completion as a stream of text fragments.
+
+        The default yields the full generate() result as a single fragment.
+
+        Args:
+            prompt: Input text prompt to send to the LLM.
+
+        Yields:
+            Text fragments in generation order.
+        """
+        yield await self.generate(prompt)
+
+    async def aclose(self) -> None:
+        """Release network resources (connection pools). No-op by default."""
+        return None
@@ -1,6 +1,7 @@
 """Abstract base class for LLM providers."""
 
 from abc import ABC, abstractmethod
+from typing import Iterator
 
 
 class LLMInterface(ABC):
@@ -22,3 +23,17 @@ class LLMInterface(ABC):
             Generated text response from the LLM.
         """
         pass
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Generate a completion as a stream of text fragments.
+
+        Providers that support incremental output override this; the
+        default yields the full generate() result as a single fragment.
+
+        Args:
+            prompt: Input text prompt to send to the LLM.
+
+        Yields:
+            Text fragments in generation order.
+        """
+        yield self.generate(prompt)
@@ -1,64 +1,131 @@
 """Ollama LLM provider implementation."""
 
+from __future__ import annotations
+
 import json
-from urllib.request import Request, urlopen
-from urllib.error import URLError, HTTPError
+from typing import Iterator
+
+import httpx
 
 from ..interfaces.llm_interface import LLMInterface
+from ..transport import HTTPTransport
 
 
 class OllamaProvider(LLMInterface):
     """Ollama local LLM provider."""
-    
-    def __init__(self, base_url: str, model: str) -> None:
+
+    def __init__(
+        self,
+        base_url: str,
+        model: str,
+        transport: HTTPTransport | None = None,
+        *,
+        keep_alive: str | None = None,
+        options: dict | None = None,
+    ) -> None:
         """Initialize Ollama provider.
-        
+
         Args:
             base_url: Base URL of the Ollama server (e.g., "http://localhost:11434").
             model: Name of the model to use (e.g., "llama2", "mistral").
+            transport: Pooled HTTP transport, shareable between providers
+                (a private one with default settings when None).
+            keep_alive: How long Ollama keeps the model (and its prompt
+                cache) loaded after a request, e.g. "30m" (server default
+                when None). Reusing the cached prompt prefix needs the model
+                to stay loaded between calls.
+            options: Ollama model options sent with every request, e.g.
+                {"num_ctx": 4096, "num_keep": 64} (num_keep tokens of the
+                prompt prefix survive a context shift).
         """
         self.base_url = base_url
         self.model = model
-    
+        self.keep_alive = keep_alive
+        self.options = options
+        self.transport = transport or HTTPTransport()
+
     def generate(self, prompt: str) -> str:
         """Generate text completion from a prompt.
-        
+
         Args:
             prompt: Input text prompt to send to the LLM.
-            
+
         Returns:
             Generated text response from the LLM.
-            
+
         Raises:
             RuntimeError: If Ollama request fails or returns unexpected response.
         """
-        url = f"{self.base_url.rstrip('/')}/api/generate"
-        payload = {
-            "model": self.model,
-            "prompt": prompt,
-            "stream": False
-        }
-        
         try:
-            req = Request(
-                url,
-                data=json.dumps(payload).encode('utf-8'),
-                headers={'Content-Type': 'application/json'}
+            response = self.transport.post_json(self._url(), self._payload(prompt, stream=False))
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError(
+                f"Ollama HTTP error: {e.response.status_code} {e.response.reason_phrase}"
+            )
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Ollama connection error: {e}")
+
+        try:
+            data = response.json()
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Invalid JSON from Ollama: {e}")
+
+        if "response" not in data:
+            raise RuntimeError("Unexpected Ollama response: missing 'response' field")
+
+        return data["response"]
+
+    def generate_stream(self, prompt: str) -> Iterator[str]:
+        """Stream a completion from Ollama's NDJSON endpoint.
+
+        Args:
+            prompt: Input text prompt to send to the LLM.
+
+        Yields:
+            Response fragments as Ollama produces them.
+
+        Raises:
+            RuntimeError: If Ollama request fails, returns unexpected response,
+                or the stream ends without a final "done" line.
+        """
+        lines = self.transport.stream_lines(self._url(), self._payload(prompt, stream=True))
+        try:
+            # One JSON object per line; the last one has "done": true
+            for line in lines:
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if "error" in data:
+                    raise RuntimeError(f"Ollama error: {data['error']}")
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    return
+            # EOF without "done": the connection dropped mid-answer
+            raise RuntimeError("Ollama stream ended before done")
+        except httpx.HTTPStatusError as e:
+            raise RuntimeError(
+                f"Ollama HTTP error: {e.response.status_code} {e.response.reason_phrase}"
             )
-            with urlopen(req, timeout=30) as response:
-                if response.status != 200:
-                    raise RuntimeError(f"Ollama returned status {response.status}")
-                
-                data = json.loads(response.read().decode('utf-8'))
-                
-                if "response" not in data:
-                    raise RuntimeError("Unexpected Ollama response: missing 'response' field")
-                
-                return data["response"]
-                
-        except HTTPError as e:
-            raise RuntimeError(f"Ollama HTTP error: {e.code} {e.reason}")
-        except URLError as e:
-            raise RuntimeError(f"Ollama connection error: {e.reason}")
+        except httpx.HTTPError as e:
+            raise RuntimeError(f"Ollama connection error: {e}")
         except json.JSONDecodeError as e:
             raise RuntimeError(f"Invalid JSON from Ollama: {e}")
+        finally:
+            # Release the pooled connection even if the caller stops early
+            lines.close()
+
+    def _url(self) -> str:
+        return f"{self.base_url.rstrip('/')}/api/generate"
+
+    def _payload(self, prompt: str, stream: bool) -> dict:
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": stream
+        }
+        if self.keep_alive is not None:
+            payload["keep_alive"] = self.keep_alive
+        if self.options:
+            payload["options"] = self.options
+        return payload
@@ -0,0 +1,356 @@
+"""Pooled keep-alive HTTP transports shared by LLM providers.
+
+One transport owns one httpx client (and its keep-alive connection pool)
+and can be passed to any number of providers. Requests are bounded by a
+slot semaphore sized like the pool, which is what the saturation metrics
+observe. Only failures where the request was not processed are retried,
+a bounded number of times with full-jitter exponential backoff: connect
+errors/timeouts, pool timeouts, and 429/503 rejections. Read timeouts,
+dropped connections and gateway errors (502/504) are not, since a
+generation may already be running upstream. A stream is only retried
+before its first line is delivered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import AsyncIterator, Iterator
+
+import httpx
+
+from app.rag.models.transport import PoolMetrics
+
+# Status codes worth retrying: the server rejected the request unprocessed
+# (overloaded or restarting). 502/504 are excluded: a gateway reports them
+# after forwarding, while the upstream may still be generating.
+TRANSIENT_STATUS_CODES = frozenset({429, 503})
+
+# Errors raised before the request reached the server: safe to resend a
+# non-idempotent POST
+TRANSIENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def backoff_delay(
+    attempt: int,
+    base: float,
+    maximum: float,
+    rng: random.Random,
+) -> float:
+    """Full-jitter exponential backoff: uniform in [0, min(maximum, base * 2**attempt)]."""
+    return rng.uniform(0.0, min(maximum, base * (2 ** attempt)))
+
+
+class _TransportBase:
+    """Configuration, retry policy and counters shared by both transports."""
+
+    def __init__(
+        self,
+        pool_size: int,
+        connect_timeout: float,
+        read_timeout: float,
+        max_retries: int,
+        backoff_base: float,
+        backoff_max: float,
+        seed: int | None,
+    ) -> None:
+        if pool_size <= 0:
+            raise ValueError("pool_size must be greater than 0")
+        if max_retries < 0:
+            raise ValueError("max_retries must be >= 0")
+
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._rng = random.Random(seed)
+        self._timeout = httpx.Timeout(
+            connect=connect_timeout, read=read_timeout, write=read_timeout, pool=None
+        )
+        self._limits = httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        )
+
+        self._stats_lock = threading.Lock()
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._requests = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._retries = 0
+        self._failures = 0
+
+    @property
+    def metrics(self) -> PoolMetrics:
+        """Snapshot of pool usage counters."""
+        with self._stats_lock:
+            return PoolMetrics(
+                pool_size=self.pool_size,
+                in_use=self._in_use,
+                peak_in_use=self._peak_in_use,
+                requests=self._requests,
+                waits=self._waits,
+                wait_time_ms=1000.0 * self._wait_seconds,
+                retries=self._retries,
+                failures=self._failures,
+            )
+
+    def _is_transient(self, error: Exception | None, response: httpx.Response | None) -> bool:
+        if response is not None:
+            return response.status_code in TRANSIENT_STATUS_CODES
+        return isinstance(error, TRANSIENT_ERRORS)
+
+    def _next_delay(self, attempt: int) -> float:
+        with self._stats_lock:
+            self._retries += 1
+            return backoff_delay(attempt, self._backoff_base, self._backoff_max, self._rng)
+
+    def _acquired(self, waited: bool, wait_seconds: float) -> None:
+        with self._stats_lock:
+            self._requests += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            if waited:
+                self._waits += 1
+                self._wait_seconds += wait_seconds
+
+    def _released(self) -> None:
+        with self._stats_lock:
+            self._in_use -= 1
+
+    def _failed(self) -> None:
+        with self._stats_lock:
+            self._failures += 1
+
+
+class HTTPTransport(_TransportBase):
+    """Thread-safe pooled transport for synchronous providers."""
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        seed: int | None = None,
+        client: httpx.Client | None = None,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Maximum concurrent (and kept-alive) connections
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for each chunk of the response
+            max_retries: Retries after the first attempt for transient errors
+            backoff_base: First backoff ceiling in seconds (doubles per retry)
+            backoff_max: Upper bound of any backoff ceiling
+            seed: Seed for backoff jitter (None = random)
+            client: Pre-configured client (e.g. for tests); owned by the caller
+        """
+        super().__init__(
+            pool_size, connect_timeout, read_timeout, max_retries,
+            backoff_base, backoff_max, seed,
+        )
+        self._slots = threading.BoundedSemaphore(pool_size)
+        self._owns_client = client is None
+        self._client = client or httpx.Client(timeout=self._timeout, limits=self._limits)
+
+    def post_json(self, url: str, payload: dict) -> httpx.Response:
+        """
+        POST a JSON payload and return the (read) successful response.
+
+        Raises:
+            httpx.HTTPStatusError: Non-2xx status (after retries if transient)
+            httpx.TransportError: Connection/timeout error (retried only if nothing was sent)
+        """
+        for attempt in range(self.max_retries + 1):
+            error: Exception | None = None
+            response: httpx.Response | None = None
+            with self._slot():
+                try:
+                    response = self._client.post(url, json=payload)
+                except httpx.TransportError as e:
+                    error = e
+
+            if error is None and response.is_success:
+                return response
+            if attempt < self.max_retries and self._is_transient(error, response):
+                time.sleep(self._next_delay(attempt))
+                continue
+
+            self._failed()
+            if error is not None:
+                raise error
+            response.raise_for_status()
+        raise AssertionError("unreachable")
+
+    def stream_lines(self, url: str, payload: dict) -> Iterator[str]:
+        """
+        POST a JSON payload and yield response lines as they arrive.
+
+        The pool slot is held until the stream is exhausted or closed.
+
+        Raises:
+            httpx.HTTPStatusError: Non-2xx status (after retries if transient)
+            httpx.TransportError: Connection/timeout error (retried only if nothing was sent)
+        """
+        for attempt in range(self.max_retries + 1):
+            delivered = False
+            retry = False
+            with self._slot():
+                try:
+                    with self._client.stream("POST", url, json=payload) as response:
+                        if not response.is_success:
+                            if attempt < self.max_retries and self._is_transient(None, response):
+                                retry = True
+                            else:
+                                self._failed()
+                                response.raise_for_status()
+                        else:
+                            for line in response.iter_lines():
+                                delivered = True
+                                yield line
+                            return
+                except httpx.TransportError as e:
+                    if delivered or attempt >= self.max_retries or not self._is_transient(e, None):
+                        self._failed()
+                        raise
+                    retry = True
+
+            if retry:
+                time.sleep(self._next_delay(attempt))
+
+    def close(self) -> None:
+        """Close the connection pool (only if this transport created it)."""
+        if self._owns_client:
+            self._client.close()
+
+    @contextmanager
+    def _slot(self) -> Iterator[None]:
+        """Hold one pool slot, recording whether the caller had to wait."""
+        waited = not self._slots.acquire(blocking=False)
+        wait_seconds = 0.0
+        if waited:
+            started = time.perf_counter()
+            self._slots.acquire()
+            wait_seconds = time.perf_counter() - started
+        self._acquired(waited, wait_seconds)
+        try:
+            yield
+        finally:
+            self._released()
+            self._slots.release()
+
+
+class AsyncHTTPTransport(_TransportBase):
+    """Pooled transport for asyncio providers (one event loop)."""
+
+    def __init__(
+        self,
+        pool_size: int = 100,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 60.0,
+        max_retries: int = 2,
+        backoff_base: float = 0.25,
+        backoff_max: float = 4.0,
+        seed: int | None = None,
+        client: httpx.AsyncClient | None = None,
+    ) -> None:
+        """
+        Initialize the transport.
+
+        Args:
+            pool_size: Maximum concurrent (and kept-alive) connections
+            connect_timeout: Seconds to establish a connection
+            read_timeout: Seconds to wait for each chunk of the response
+            max_retries: Retries after the first attempt for transient errors
+            backoff_base: First backoff ceiling in seconds (doubles per retry)
+            backoff_max: Upper bound of any backoff ceiling
+            seed: Seed for backoff jitter (None = random)
+            client: Pre-configured client (e.g. for tests); owned by the caller
+        """
+        super().__init__(
+            pool_size, connect_timeout, read_timeout, max_retries,
+            backoff_base, backoff_max, seed,
+        )
+        self._slots: asyncio.Semaphore | None = None
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=self._timeout, limits=self._limits)
+
+    async def post_json(self, url: str, payload: dict) -> httpx.Response:
+        """Async HTTPTransport.post_json()."""
+        for attempt in range(self.max_retries + 1):
+            error: Exception | None = None
+            response: httpx.Response | None = None
+            async with self._slot():
+                try:
+                    response = await self._client.post(url, json=payload)
+                except httpx.TransportError as e:
+                    error = e
+
+            if error is None and response.is_success:
+                return response
+            if attempt < self.max_retries and self._is_transient(error, response):
+                await asyncio.sleep(self._next_delay(attempt))
+                continue
+
+            self._failed()
+            if error is not None:
+                raise error
+            response.raise_for_status()
+        raise AssertionError("unreachable")
+
+    async def stream_lines(self, url: str, payload: dict) -> AsyncIterator[str]:
+        """Async HTTPTransport.stream_lines()."""
+        for attempt in range(self.max_retries + 1):
+            delivered = False
+            retry = False
+            async with self._slot():
+                try:
+                    async with self._client.stream("POST", url, json=payload) as response:
+                        if not response.is_success:
+                            if attempt < self.max_retries and self._is_transient(None, response):
+                                retry = True
+                            else:
+                                self._failed()
+                                response.raise_for_status()
+                        else:
+                            async for line in response.aiter_lines():
+                                delivered = True
+                                yield line
+                            return
+                except httpx.TransportError as e:
+                    if delivered or attempt >= self.max_retries or not self._is_transient(e, None):
+                        self._failed()
+                        raise
+                    retry = True
+
+            if retry:
+                await asyncio.sleep(self._next_delay(attempt))
+
+    async def aclose(self) -> None:
+        """Close the connection pool (only if this transport created it)."""
+        if self._owns_client:
+            await self._client.aclose()
+
+    @asynccontextmanager
+    async def _slot(self) -> AsyncIterator[None]:
+        """Hold one pool slot, recording whether the caller had to wait."""
+        if self._slots is None:
+            # Created lazily so it binds to the running loop
+            self._slots = asyncio.Semaphore(self.pool_size)
+        waited = self._slots.locked()
+        started = time.perf_counter()
+        await self._slots.acquire()
+        self._acquired(waited, time.perf_counter() - started if waited else 0.0)
+        try:
+            yield
+        finally:
+            self._released()
+            self._slots.release()
@@ -0,0 +1,6 @@
+"""
+Metrics
+
+Lightweight in-process instruments (histograms) for latency and batch
+size reporting.
+"""
@@ -0,0 +1,55 @@
+"""Thread-safe fixed-bucket histogram."""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Sequence
+
+from app.rag.models.metrics import HistogramSnapshot
+
+# Milliseconds, roughly exponential: sub-ms queueing up to multi-second stalls
+LATENCY_MS_BUCKETS = (0.5, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+# Items per batch, powers of two
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class Histogram:
+    """Counts observations into fixed upper-bound buckets."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        """
+        Initialize an empty histogram.
+
+        Args:
+            buckets: Increasing bucket upper bounds (an overflow bucket is added)
+        """
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("buckets must be a non-empty increasing sequence")
+        self._buckets = [float(bound) for bound in buckets]
+        self._counts = [0] * (len(self._buckets) + 1)
+        self._count = 0
+        self._total = 0.0
+        self._max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total += value
+            self._max = max(self._max, value)
+
+    def snapshot(self) -> HistogramSnapshot:
+        """Copy of the current counts."""
+        with self._lock:
+            return HistogramSnapshot(
+                buckets=list(self._buckets),
+                counts=list(self._counts),
+                count=self._count,
+                total=self._total,
+                max=self._max,
+            )
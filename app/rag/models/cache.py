@@ -0,0 +1,57 @@
+"""Cache statistics models."""
+
+from __future__ import annotations
+
+from typing import Dict, List
+
+from pydantic import BaseModel, Field
+
+from app.rag.models.documents import ScoredDocumentChunk
+
+
+class ResponseCacheStats(BaseModel):
+    """Hit/miss counters of a response cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    evicted: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total cache hits across both tiers."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache (0.0 when nothing looked up)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class SemanticCacheEntry(BaseModel):
+    """Retrieval results (and answers) cached for one query embedding."""
+
+    query: str
+    top_k: int
+    generation: int = 0
+    results: List[ScoredDocumentChunk]
+    # Generated answers keyed by the answer settings that produced them
+    answers: Dict[str, str] = Field(default_factory=dict)
+
+
+class SemanticCacheStats(BaseModel):
+    """Counters of a semantic cache."""
+
+    hits: int = 0
+    misses: int = 0
+    answer_hits: int = 0
+    evicted: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that matched a similar prior query."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
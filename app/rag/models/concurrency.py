@@ -0,0 +1,20 @@
+"""Concurrency helper metrics models."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class SingleFlightStats(BaseModel):
+    """Counters of a single-flight group."""
+
+    leaders: int = 0
+    followers: int = 0
+    timeouts: int = 0
+    in_flight: int = 0
+
+    @property
+    def shared_rate(self) -> float:
+        """Fraction of calls served by another caller's computation."""
+        total = self.leaders + self.followers
+        return self.followers / total if total else 0.0
@@ -1,14 +1,116 @@
 from __future__ import annotations
 
-from typing import List
+from typing import Iterator, List, Sequence, Union
+
+import numpy as np
 from pydantic import BaseModel
 
 
 class EmbeddingVector(BaseModel):
     """
     Embedding vector representation.
-    
+
     The dimension (dim) is derived from len(vector), so it's not stored separately.
     """
 
-    vector: List[float]
\ No newline at end of file
+    vector: List[float]
+
+
+class EmbeddingBatch:
+    """
+    Batch of embeddings backed by a single (n, dim) float32 NumPy array.
+
+    This is the bulk format used between providers, services and vector
+    stores: no per-float Python objects, no pydantic validation, and rows
+    are zero-copy views. Use `to_vectors()` / `from_vectors()` to convert
+    to and from the per-vector EmbeddingVector API.
+    """
+
+    __slots__ = ("_array",)
+
+    def __init__(self, array: np.ndarray) -> None:
+        """Wrap a 2-D array (converted to float32 only if needed)."""
+        array = np.asarray(array, dtype=np.float32)
+        if array.ndim == 1 and array.size == 0:
+            array = array.reshape(0, 0)
+        if array.ndim != 2:
+            raise ValueError(f"EmbeddingBatch requires a 2-D array, got {array.ndim}-D")
+        self._array = array
+
+    @classmethod
+    def from_vectors(cls, vectors: Sequence[EmbeddingVector]) -> EmbeddingBatch:
+        """Build a batch from per-vector models (copies the data once)."""
+        if not vectors:
+            return cls(np.empty((0, 0), dtype=np.float32))
+        return cls(np.asarray([vector.vector for vector in vectors], dtype=np.float32))
+
+    @property
+    def array(self) -> np.ndarray:
+        """The underlying (n, dim) float32 array (not a copy)."""
+        return self._array
+
+    @property
+    def dim(self) -> int:
+        """Embedding dimension."""
+        return self._array.shape[1]
+
+    def row(self, index: int) -> np.ndarray:
+        """Zero-copy view of one embedding."""
+        return self._array[index]
+
+    def to_vectors(self) -> List[EmbeddingVector]:
+        """Convert to per-vector models (compatibility shim)."""
+        return [EmbeddingVector(vector=row) for row in self._array.tolist()]
+
+    def __len__(self) -> int:
+        return self._array.shape[0]
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self._array[index]
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        return iter(self._array)
+
+
+# Anything accepted where a single embedding is expected
+EmbeddingLike = Union[EmbeddingVector, np.ndarray, Sequence[float]]
+
+# Anything accepted where a batch of embeddings is expected
+EmbeddingsLike = Union[EmbeddingBatch, np.ndarray, Sequence[EmbeddingLike]]
+
+
+def as_array(embeddings: EmbeddingsLike) -> np.ndarray:
+    """Return embeddings as a 2-D float32 array, without copying when possible."""
+    if isinstance(embeddings, EmbeddingBatch):
+        return embeddings.array
+    if isinstance(embeddings, np.ndarray):
+        return EmbeddingBatch(embeddings).array
+    if len(embeddings) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.stack([as_vector(embedding) for embedding in embeddings])
+
+
+def as_vector(embedding: EmbeddingLike) -> np.ndarray:
+    """Return a single embedding as a 1-D float32 array."""
+    if isinstance(embedding, EmbeddingVector):
+        embedding = embedding.vector
+    return np.asarray(embedding, dtype=np.float32).reshape(-1)
+
+
+class EmbeddingCacheStats(BaseModel):
+    """Hit/miss counters of an embedding cache."""
+
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total cache hits across both tiers."""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from cache (0.0 when nothing looked up)."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
@@ -0,0 +1,33 @@
+"""Evaluation result models."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class RecallReport(BaseModel):
+    """Recall@k and latency of a candidate vector store versus exact search."""
+
+    label: str = ""
+    top_k: int
+    queries: int
+    recall: float
+    exact_latency_ms: float
+    candidate_latency_ms: float
+
+    @property
+    def speedup(self) -> float:
+        """Exact latency divided by candidate latency."""
+        if self.candidate_latency_ms == 0:
+            return 0.0
+        return self.exact_latency_ms / self.candidate_latency_ms
+
+
+class TTFTReport(BaseModel):
+    """Time-to-first-token of an LLM over a sequence of prompts."""
+
+    label: str = ""
+    runs: int
+    mean_ms: float
+    p50_ms: float
+    max_ms: float
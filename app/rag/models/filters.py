@@ -0,0 +1,128 @@
+"""Structured metadata filters for vector search."""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, List, Tuple, Union
+
+from pydantic import BaseModel, Field, StrictBool, StrictFloat, StrictInt, StrictStr, model_validator
+
+from app.rag.models.documents import DocumentChunk
+
+# Filterable metadata values (the types Chroma accepts as metadata)
+MetadataValue = Union[StrictBool, StrictInt, StrictFloat, StrictStr]
+
+
+def value_key(value: Any) -> Tuple[bool, Any]:
+    """
+    Hashable key under which a metadata value is indexed and compared.
+
+    Keeps True and 1 apart (they are equal in Python) while 1 and 1.0
+    still match, as in Chroma.
+    """
+    return (isinstance(value, bool), value)
+
+
+def is_number(value: Any) -> bool:
+    """Whether value takes part in range comparisons (bools do not)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def chunk_fields(chunk: DocumentChunk) -> Dict[str, Any]:
+    """
+    Fields a filter can test on a chunk.
+
+    Chroma stores document_id and index next to the chunk metadata, so
+    every backend exposes them the same way.
+    """
+    return {"document_id": chunk.document_id, "index": chunk.index, **dict(chunk.metadata)}
+
+
+class Range(BaseModel):
+    """Numeric bounds; set bounds are ANDed."""
+
+    gt: float | None = None
+    gte: float | None = None
+    lt: float | None = None
+    lte: float | None = None
+
+    @model_validator(mode="after")
+    def _require_bound(self) -> Range:
+        if self.gt is None and self.gte is None and self.lt is None and self.lte is None:
+            raise ValueError("Range requires at least one bound")
+        return self
+
+    def bounds(self) -> List[Tuple[str, float]]:
+        """Set bounds as (operator, value) pairs, e.g. [("gte", 2.0)]."""
+        bounds = (("gt", self.gt), ("gte", self.gte), ("lt", self.lt), ("lte", self.lte))
+        return [(operator, value) for operator, value in bounds if value is not None]
+
+    def contains(self, value: Any) -> bool:
+        """Whether value is a number within the bounds."""
+        if not is_number(value):
+            return False
+        return (
+            (self.gt is None or value > self.gt)
+            and (self.gte is None or value >= self.gte)
+            and (self.lt is None or value < self.lt)
+            and (self.lte is None or value <= self.lte)
+        )
+
+
+class MetadataFilter(BaseModel):
+    """
+    Conditions on chunk metadata; a chunk must satisfy all of them.
+
+    Example:
+        MetadataFilter(
+            equals={"lang": "en"},
+            any_of={"product": ["printer", "scanner"]},
+            ranges={"year": Range(gte=2020)},
+        )
+
+    `document_id` and `index` can be filtered like metadata fields.
+    A chunk lacking a filtered field never matches. Field names starting
+    with "$" are rejected (Chroma would read them as operators), and so
+    are empty `any_of` lists, which Chroma cannot express.
+    """
+
+    equals: Dict[str, MetadataValue] = Field(default_factory=dict)
+    any_of: Dict[str, List[MetadataValue]] = Field(default_factory=dict)
+    ranges: Dict[str, Range] = Field(default_factory=dict)
+
+    @model_validator(mode="after")
+    def _check_fields(self) -> MetadataFilter:
+        for field in (*self.equals, *self.any_of, *self.ranges):
+            if not field or field.startswith("$"):
+                raise ValueError(f"Invalid metadata filter field: {field!r}")
+        for field, values in self.any_of.items():
+            if not values:
+                raise ValueError(f"any_of[{field!r}] must list at least one value")
+        return self
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the filter has no conditions (matches every chunk)."""
+        return not (self.equals or self.any_of or self.ranges)
+
+    def matches(self, chunk: DocumentChunk) -> bool:
+        """Evaluate the filter on one chunk (reference semantics for all backends)."""
+        fields = chunk_fields(chunk)
+        missing = object()
+        for field, expected in self.equals.items():
+            value = fields.get(field, missing)
+            if value is missing or value_key(value) != value_key(expected):
+                return False
+        for field, allowed in self.any_of.items():
+            value = fields.get(field, missing)
+            if value is missing or all(value_key(value) != value_key(v) for v in allowed):
+                return False
+        for field, bounds in self.ranges.items():
+            if not bounds.contains(fields.get(field)):
+                return False
+        return True
+
+    def cache_key(self) -> str:
+        """Canonical string identifying the filter (for cache/single-flight keys)."""
+        return json.dumps(self.model_dump(exclude_none=True), sort_keys=True)
+
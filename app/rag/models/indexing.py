@@ -0,0 +1,16 @@
+"""Indexing result models."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class IndexingReport(BaseModel):
+    """Outcome of an incremental indexing run (counts are per document unless noted)."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    chunks_embedded: int = 0
+    chunks_deleted: int = 0
@@ -0,0 +1,38 @@
+"""Metric snapshot models."""
+
+from __future__ import annotations
+
+from typing import List
+
+from pydantic import BaseModel
+
+
+class HistogramSnapshot(BaseModel):
+    """Non-cumulative bucket counts of a histogram at one point in time.
+
+    counts[i] is the number of observations <= buckets[i] and greater than
+    buckets[i - 1]; the last count is the overflow bucket (> buckets[-1]).
+    """
+
+    buckets: List[float]
+    counts: List[int]
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    @property
+    def mean(self) -> float:
+        """Average observed value (0.0 when empty)."""
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing quantile q (max for overflow)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.max
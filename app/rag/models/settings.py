@@ -13,5 +13,123 @@ class RAGSettings(BaseModel):
     collection_name: str = "default"
     default_top_k: int = 5
     embedding_model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # Embedding backend: "sentence-transformers" (PyTorch) or "onnx" (ONNX
+    # Runtime on the export of embedding_model_name found under
+    # onnx_model_dir, see export_onnx_model; int8 model when onnx_quantized)
+    embedding_backend: str = "sentence-transformers"
+    onnx_model_dir: str = "onnx_models"
+    onnx_quantized: bool = False
+
+    # Encoding: texts are embedded in batches of embedding_encode_batch_size
+    # and optionally L2-normalized (both backends). With sentence-transformers
+    # batches are length-sorted buckets, and texts over the model's max
+    # sequence length are truncated or split into mean-pooled windows
+    # ("truncate" / "split")
+    embedding_encode_batch_size: int = 32
+    embedding_overflow: str = "truncate"
+    embedding_normalize: bool = False
+
     chroma_persist_dir: str | None = "chroma_data"
     chroma_collection_name: str = "documents"
+
+    # Vector store backend: "chroma", "numpy" (in-memory, exact search)
+    # or "mmap" (persistent memory-mapped flat index in mmap_index_dir)
+    vector_store_backend: str = "chroma"
+    mmap_index_dir: str = "vector_index"
+
+    # IVF approximate search ("ivf" backend): more lists = faster queries,
+    # higher nprobe = better recall. Untrained below ivf_min_train_size
+    # vectors (default 39 * nlist), where search stays exact.
+    ivf_nlist: int = 1024
+    ivf_nprobe: int = 16
+    ivf_min_train_size: int | None = None
+    ivf_index_dir: str | None = None
+
+    # Compressed storage ("quantized" backend): "int8" (4x smaller) or "pq"
+    # (dim * 4 / pq_subvectors times smaller). Exact re-ranking of the top
+    # candidates needs a full-precision file.
+    quantization: str = "int8"
+    pq_subvectors: int = 48
+    quantization_train_size: int = 10_000
+    quantization_full_precision_path: str | None = None
+    quantization_rerank_factor: int = 4
+
+    # Chunking (applied by IndexingService.from_settings): "fixed" and
+    # "sentence" sizes are in characters, "token" in tokens
+    chunking_strategy: str = "fixed"
+    chunk_size: int = 1000
+    chunk_overlap: int = 200
+    chunk_max_tokens: int = 256
+    chunk_overlap_tokens: int = 32
+
+    # Number of chunks embedded and upserted per indexing micro-batch
+    indexing_batch_size: int = 64
+
+    # Embedding cache: in-process LRU capacity and optional SQLite file
+    embedding_cache_size: int = 10_000
+    embedding_cache_path: str | None = None
+
+    # Response cache: answers keyed by normalized question, retrieval limits,
+    # model, prompt template version and index generation. Size 0 disables
+    # it. Set both paths to share cache and generation counter across
+    # worker and indexer processes (SQLite files).
+    response_cache_size: int = 1024
+    response_cache_ttl_seconds: float = 3600.0
+    response_cache_path: str | None = None
+    index_generation_path: str | None = None
+
+    # Semantic cache: reuse retrieval results of earlier queries whose
+    # embedding has cosine similarity >= threshold (size 0 disables it);
+    # optionally reuse their generated answers as well
+    semantic_cache_size: int = 0
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_answers: bool = False
+
+    # Single-flight: concurrent identical questions share one computation;
+    # followers wait at most single_flight_timeout seconds, then run their own
+    single_flight_enabled: bool = True
+    single_flight_timeout: float = 30.0
+
+    # Micro-batching of concurrent query embeddings: requests wait up to
+    # embedding_batch_max_wait_ms for companions, up to embedding_batch_size texts
+    embedding_batching: bool = False
+    embedding_batch_size: int = 32
+    embedding_batch_max_wait_ms: float = 5.0
+
+    # Parallel indexing: shard chunk texts across indexing_workers processes,
+    # each loading the embedding model once (0 embeds in the calling process)
+    indexing_workers: int = 0
+    indexing_shard_size: int = 64
+
+    # Context budget: with context_max_tokens set, context is packed by tokens
+    # of the LLM tokenizer context_tokenizer (Hugging Face id; approximated
+    # when None), skipping chunks that do not fit. Chunks can be trimmed to
+    # their context_sentences_per_chunk sentences closest to the question and
+    # near-duplicates (word trigram Jaccard >= context_dedupe_threshold) dropped
+    context_max_tokens: int | None = None
+    context_tokenizer: str | None = None
+    context_sentences_per_chunk: int | None = None
+    context_dedupe_threshold: float | None = None
+
+    # Emit selected chunks in document order so consecutive prompts over the
+    # same chunks share a prefix the LLM server can serve from its cache
+    context_stable_order: bool = False
+
+    # Re-ranking: with reranker_model_name set, rerank_candidates vector search
+    # results are re-scored by a local cross-encoder (rerank_batch_size pairs
+    # per call, stopping early past rerank_latency_budget_ms) and cut to top_k
+    reranker_model_name: str | None = None
+    rerank_candidates: int = 20
+    rerank_batch_size: int = 16
+    rerank_latency_budget_ms: float | None = None
+
+    # Hybrid retrieval: "hybrid" fuses vector results with a BM25 index
+    # (persisted in lexical_index_dir, maintained by IndexingService) using
+    # reciprocal rank fusion over fusion_candidates results of each
+    retrieval_mode: str = "vector"
+    lexical_index_dir: str | None = "lexical_index"
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    fusion_candidates: int = 20
+    rrf_k: int = 60
@@ -0,0 +1,28 @@
+"""HTTP transport metrics models."""
+
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class PoolMetrics(BaseModel):
+    """Snapshot of an HTTP transport's connection pool usage."""
+
+    pool_size: int
+    in_use: int = 0
+    peak_in_use: int = 0
+    requests: int = 0
+    waits: int = 0
+    wait_time_ms: float = 0.0
+    retries: int = 0
+    failures: int = 0
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of pool slots currently in use."""
+        return self.in_use / self.pool_size if self.pool_size else 0.0
+
+    @property
+    def wait_rate(self) -> float:
+        """Fraction of requests that had to wait for a free connection."""
+        return self.waits / self.requests if self.requests else 0.0
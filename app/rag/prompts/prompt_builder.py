@@ -2,25 +2,41 @@
 
 
 class PromptBuilder:
-    """Builds prompts for LLM generation with retrieved context."""
-    
+    """Builds prompts for LLM generation with retrieved context.
+
+    The layout is cache-friendly: a fixed instruction prefix comes first,
+    then the context, then the question. Servers that reuse the KV cache of
+    a matching prompt prefix (Ollama / llama.cpp) therefore skip the
+    instruction on every call, and the context as well when consecutive
+    questions retrieve the same chunks in the same order (see
+    `ContextBuilder(stable_order=True)`).
+    """
+
+    # Bump whenever the template text changes (part of response cache keys)
+    TEMPLATE_VERSION = "1"
+
+    # Stable prefix shared by every prompt; never put per-request data here
+    SYSTEM_PREFIX = (
+        "Answer the question using only the information from the context below. "
+        "If the answer is not in the context, say \"I don't have enough information "
+        "to answer that.\"\n\n"
+    )
+
     @staticmethod
     def build(context: str, query: str) -> str:
         """Build a prompt combining retrieved context and user query.
-        
+
         Creates a simple, deterministic prompt that instructs the LLM to answer
         based solely on the provided context without using external knowledge.
-        
+
         Args:
             context: Retrieved document chunks joined as context.
             query: User's question or query.
-            
+
         Returns:
             Formatted prompt string ready for LLM generation.
         """
-        return f"""Answer the question using only the information from the context below. If the answer is not in the context, say "I don't have enough information to answer that."
-
-Context:
+        return f"""{PromptBuilder.SYSTEM_PREFIX}Context:
 {context}
 
 Question: {query}
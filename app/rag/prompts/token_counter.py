@@ -0,0 +1,40 @@
+"""Token counting functions for prompt budgeting."""
+
+from __future__ import annotations
+
+import math
+from typing import Callable
+
+# Rough characters-per-token ratio of BPE tokenizers on English text
+_CHARS_PER_TOKEN = 4
+
+
+def approximate_token_count(text: str) -> int:
+    """Estimate tokens without a tokenizer (about four characters per token)."""
+    return math.ceil(len(text) / _CHARS_PER_TOKEN)
+
+
+def load_token_counter(tokenizer_name: str | None) -> Callable[[str], int]:
+    """
+    Return a count_tokens function for the target LLM's tokenizer.
+
+    Uses the Hugging Face fast tokenizer `tokenizer_name` (e.g. the repo of
+    the model served by Ollama) via the optional `tokenizers` package.
+
+    Args:
+        tokenizer_name: Tokenizer id, or None for approximate_token_count
+
+    Returns:
+        Function mapping text to its token count (no special tokens)
+    """
+    if tokenizer_name is None:
+        return approximate_token_count
+
+    from tokenizers import Tokenizer
+
+    tokenizer = Tokenizer.from_pretrained(tokenizer_name)
+
+    def count_tokens(text: str) -> int:
+        return len(tokenizer.encode(text, add_special_tokens=False).ids)
+
+    return count_tokens
@@ -0,0 +1,6 @@
+"""
+Vector Quantization
+
+Compressed embedding codecs (int8 scalar, product quantization) with
+asymmetric distance computation.
+"""
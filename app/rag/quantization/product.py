@@ -0,0 +1,143 @@
+"""Product quantization (one byte per sub-vector)."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.rag.interfaces.quantizer import QuantizerInterface
+
+# Code rows processed per step of the ADC loop (bounds temp memory)
+_BLOCK = 65536
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 20, seed: int = 0) -> np.ndarray:
+    """Euclidean k-means; returns (min(k, n), dim) float32 centroids."""
+    rng = np.random.default_rng(seed)
+    k = min(k, vectors.shape[0])
+    centroids = vectors[rng.choice(vectors.shape[0], size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = nearest_centroids(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=k)
+
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, np.newaxis]
+        empty = np.flatnonzero(~filled)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(vectors.shape[0], size=len(empty))]
+
+    return centroids.astype(np.float32)
+
+
+def nearest_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the nearest (Euclidean) centroid for each vector."""
+    # |x - c|^2 = |x|^2 - 2 x.c + |c|^2; |x|^2 does not change the argmin
+    scores = vectors @ centroids.T * 2.0 - np.sum(centroids ** 2, axis=1)
+    return np.argmax(scores, axis=1)
+
+
+class ProductQuantizer(QuantizerInterface):
+    """Splits vectors into `m` sub-vectors, each encoded by a 256-entry codebook.
+
+    A 384-dim float32 vector (1536 bytes) becomes `m` bytes, e.g. 48 bytes
+    for m=48 (32x smaller). Similarities are computed asymmetrically: the
+    float query is scored against each codebook once per query (lookup
+    tables), then every code is a sum of m table lookups.
+    """
+
+    def __init__(
+        self,
+        m: int = 48,
+        ksub: int = 256,
+        iterations: int = 20,
+        seed: int = 0,
+    ) -> None:
+        """
+        Initialize an untrained quantizer.
+
+        Args:
+            m: Number of sub-vectors (must divide the embedding dimension)
+            ksub: Codebook entries per sub-vector (at most 256)
+            iterations: k-means iterations per codebook
+            seed: Random seed for training
+        """
+        if m <= 0:
+            raise ValueError("m must be greater than 0")
+        if not 0 < ksub <= 256:
+            raise ValueError("ksub must be in 1..256")
+        self._m = m
+        self._ksub = ksub
+        self._iterations = iterations
+        self._seed = seed
+        self._codebooks: np.ndarray | None = None  # (m, ksub, dsub)
+
+    @property
+    def code_size(self) -> int:
+        """Bytes per encoded vector (one per sub-vector)."""
+        return self._m
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether codebooks have been learned."""
+        return self._codebooks is not None
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Learn one codebook per sub-space."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        if dim % self._m:
+            raise ValueError(f"Dimension {dim} is not divisible by m={self._m}")
+
+        dsub = dim // self._m
+        codebooks = np.zeros((self._m, self._ksub, dsub), dtype=np.float32)
+        for sub in range(self._m):
+            centroids = kmeans(
+                vectors[:, sub * dsub:(sub + 1) * dsub],
+                self._ksub,
+                iterations=self._iterations,
+                seed=self._seed + sub,
+            )
+            codebooks[sub, :len(centroids)] = centroids
+            # Pad with copies when fewer training points than ksub
+            codebooks[sub, len(centroids):] = centroids[0]
+        self._codebooks = codebooks
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Encode vectors into (n, m) uint8 codes."""
+        subvectors = self._split(vectors)
+        codes = np.empty((subvectors.shape[0], self._m), dtype=np.uint8)
+        for sub in range(self._m):
+            codes[:, sub] = nearest_centroids(subvectors[:, sub], self._codebooks[sub])
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate vectors by concatenating codebook entries."""
+        self._require_trained()
+        parts = self._codebooks[np.arange(self._m), codes]  # (n, m, dsub)
+        return parts.reshape(codes.shape[0], -1)
+
+    def similarities(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Inner products via per-query lookup tables (ADC)."""
+        subqueries = self._split(queries)
+        # tables[q, sub, k] = query sub-vector . codebook entry
+        tables = np.einsum("qmd,mkd->qmk", subqueries, self._codebooks)
+
+        result = np.empty((subqueries.shape[0], codes.shape[0]), dtype=np.float32)
+        sub_index = np.arange(self._m)
+        for start in range(0, codes.shape[0], _BLOCK):
+            block = codes[start:start + _BLOCK]
+            for q, table in enumerate(tables):
+                result[q, start:start + len(block)] = table[sub_index, block].sum(axis=1)
+        return result
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        """Reshape (n, dim) vectors into (n, m, dsub)."""
+        self._require_trained()
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return vectors.reshape(vectors.shape[0], self._m, -1)
+
+    def _require_trained(self) -> None:
+        if not self.is_trained:
+            raise RuntimeError("ProductQuantizer must be trained before use")
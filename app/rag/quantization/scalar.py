@@ -0,0 +1,70 @@
+"""Int8 scalar quantization (4x smaller than float32)."""
+
+from __future__ import annotations
+
+import numpy as np
+
+from app.rag.interfaces.quantizer import QuantizerInterface
+
+# Code rows converted to float per step of the ADC loop (bounds temp memory)
+_BLOCK = 65536
+
+
+class ScalarQuantizer(QuantizerInterface):
+    """Per-dimension affine quantization to 256 levels.
+
+    Each dimension is mapped linearly from its trained [min, max] range to
+    a uint8 code. Queries stay in float32 (asymmetric distance), so only
+    the stored side loses precision.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an untrained quantizer."""
+        self._minimum: np.ndarray | None = None
+        self._step: np.ndarray | None = None
+
+    @property
+    def code_size(self) -> int:
+        """Bytes per encoded vector (one per dimension)."""
+        return 0 if self._minimum is None else int(self._minimum.shape[0])
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether value ranges have been learned."""
+        return self._minimum is not None
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Learn per-dimension value ranges."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        minimum = vectors.min(axis=0)
+        step = (vectors.max(axis=0) - minimum) / 255.0
+        step[step == 0] = 1.0
+        self._minimum, self._step = minimum, step
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Encode vectors into uint8 codes (values outside the range are clipped)."""
+        self._require_trained()
+        levels = np.rint((np.asarray(vectors, dtype=np.float32) - self._minimum) / self._step)
+        return np.clip(levels, 0, 255).astype(np.uint8)
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate vectors."""
+        self._require_trained()
+        return self._minimum + codes.astype(np.float32) * self._step
+
+    def similarities(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Inner products q . decode(c) computed as q.min + (q * step) . c."""
+        self._require_trained()
+        queries = np.asarray(queries, dtype=np.float32)
+        offsets = queries @ self._minimum
+        scaled = queries * self._step
+
+        result = np.empty((queries.shape[0], codes.shape[0]), dtype=np.float32)
+        for start in range(0, codes.shape[0], _BLOCK):
+            block = codes[start:start + _BLOCK].astype(np.float32)
+            result[:, start:start + len(block)] = scaled @ block.T
+        return result + offsets[:, np.newaxis]
+
+    def _require_trained(self) -> None:
+        if not self.is_trained:
+            raise RuntimeError("ScalarQuantizer must be trained before use")
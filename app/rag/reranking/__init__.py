@@ -0,0 +1,5 @@
+"""
+Re-ranking
+
+Second-stage rankers applied to vector search candidates (cross-encoder).
+"""
@@ -0,0 +1,118 @@
+"""Cross-encoder re-ranker for vector search candidates."""
+
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING, Callable, List, Sequence
+
+import numpy as np
+
+from app.rag.interfaces.reranker import RerankerInterface
+from app.rag.models.documents import ScoredDocumentChunk
+
+if TYPE_CHECKING:
+    from sentence_transformers import CrossEncoder
+
+
+class CrossEncoderReranker(RerankerInterface):
+    """Re-ranker scoring (query, chunk) pairs with a local cross-encoder.
+
+    Candidates are scored in batches in their vector search order. With a
+    latency budget, scoring stops once the next batch is expected to exceed
+    it; unscored candidates then follow the scored ones in their original
+    order. Result scores are the negated relevance (lower is better, like
+    distances); candidates left unscored share the worst scored value, so
+    sorting by score keeps them last.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        batch_size: int = 16,
+        latency_budget_ms: float | None = None,
+        max_length: int = 256,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """
+        Initialize with model name (lazy loading).
+
+        Args:
+            model_name: sentence-transformers CrossEncoder model id
+            batch_size: Pairs scored per model call
+            latency_budget_ms: Soft limit on scoring time per query (None: no limit)
+            max_length: Tokens per (query, chunk) pair; longer pairs are truncated
+            clock: Time source in seconds (injectable for tests)
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+        if latency_budget_ms is not None and latency_budget_ms <= 0:
+            raise ValueError("latency_budget_ms must be greater than 0")
+
+        self._model_name = model_name
+        self._batch_size = batch_size
+        self._latency_budget_ms = latency_budget_ms
+        self._max_length = max_length
+        self._clock = clock
+        self._model: CrossEncoder | None = None
+
+    def _load_model(self) -> CrossEncoder:
+        """Lazy load the model on first use (on CPU unless a GPU is available)."""
+        if self._model is None:
+            from sentence_transformers import CrossEncoder
+            self._model = CrossEncoder(self._model_name, max_length=self._max_length)
+        return self._model
+
+    def rerank(
+        self,
+        query: str,
+        candidates: Sequence[ScoredDocumentChunk],
+        *,
+        top_k: int,
+    ) -> List[ScoredDocumentChunk]:
+        """
+        Reorder candidates by cross-encoder relevance.
+
+        Args:
+            query: The question
+            candidates: Vector search results, best first
+            top_k: Maximum number of results to return
+
+        Returns:
+            Up to top_k chunks, most relevant first (score ascending)
+        """
+        if not candidates:
+            return []
+
+        model = self._load_model()
+        started = self._clock()
+        scores: List[float] = []
+
+        for start in range(0, len(candidates), self._batch_size):
+            if start and self._over_budget(started, start):
+                break
+            batch = candidates[start:start + self._batch_size]
+            relevance = model.predict(
+                [(query, scored_chunk.chunk.content) for scored_chunk in batch],
+                batch_size=len(batch),
+                convert_to_numpy=True,
+            )
+            scores.extend(np.asarray(relevance, dtype=np.float32).reshape(-1).tolist())
+
+        order = sorted(range(len(scores)), key=lambda i: -scores[i])
+        reranked = [
+            ScoredDocumentChunk(chunk=candidates[i].chunk, score=-scores[i]) for i in order
+        ]
+        worst = -min(scores)
+        reranked.extend(
+            ScoredDocumentChunk(chunk=scored_chunk.chunk, score=worst)
+            for scored_chunk in candidates[len(scores):]
+        )
+        return reranked[:top_k]
+
+    def _over_budget(self, started: float, scored: int) -> bool:
+        """Whether scoring one more batch would likely exceed the latency budget."""
+        if self._latency_budget_ms is None:
+            return False
+        elapsed_ms = 1000.0 * (self._clock() - started)
+        per_pair_ms = elapsed_ms / scored
+        return elapsed_ms + per_pair_ms * self._batch_size > self._latency_budget_ms
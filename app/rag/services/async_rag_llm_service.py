@@ -0,0 +1,244 @@
+"""Async RAG orchestration service combining retrieval and LLM generation."""
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, AsyncIterator, Callable, TypeVar
+
+from app.rag.cache.generation import IndexGeneration
+from app.rag.cache.response_cache import ResponseCache, response_cache_key
+from app.rag.concurrency.single_flight import AsyncSingleFlight
+from app.rag.llm.interfaces.async_llm_interface import AsyncLLMInterface
+from app.rag.prompts.prompt_builder import PromptBuilder
+from app.rag.services.async_retrieval_service import AsyncRetrievalService
+
+T = TypeVar("T")
+
+
+class AsyncRAGLLMService:
+    """Async RAG pipeline: retrieval (in executor) → prompt building → async LLM call.
+
+    While a request waits for the LLM no thread is held, so a single
+    worker can keep many generations in flight. Response cache and index
+    generation lookups hit SQLite, so they run in `executor` as well.
+    """
+
+    def __init__(
+        self,
+        retrieval_service: AsyncRetrievalService,
+        llm: AsyncLLMInterface,
+        max_concurrent_generations: int | None = None,
+        *,
+        top_k: int = 5,
+        max_chars: int = 8000,
+        cache: ResponseCache | None = None,
+        generation: IndexGeneration | None = None,
+        model_name: str | None = None,
+        reuse_semantic_answers: bool = False,
+        single_flight: AsyncSingleFlight | None = None,
+        executor: Executor | None = None,
+    ) -> None:
+        """Initialize async RAG LLM service.
+
+        Args:
+            retrieval_service: Async retrieval facade.
+            llm: Async LLM provider.
+            max_concurrent_generations: Cap on LLM calls in flight from
+                answer_many() (None = unbounded).
+            top_k: Chunks retrieved per question.
+            max_chars: Maximum characters of context per prompt.
+            cache: Optional answer cache (see RAGLLMService).
+            generation: Index generation counter invalidating cached answers.
+            model_name: Model identifier for cache keys (defaults to the
+                provider's `model` attribute).
+            reuse_semantic_answers: Reuse answers stored on the retrieval
+                service's semantic cache entries, so paraphrased questions
+                skip generation too.
+            single_flight: Optional single-flight group; concurrent
+                identical questions then share one answer computation.
+            executor: Executor for cache and generation lookups (None =
+                loop default).
+        """
+        self.retrieval_service = retrieval_service
+        self.llm = llm
+        self._max_concurrent_generations = max_concurrent_generations
+        self.top_k = top_k
+        self.max_chars = max_chars
+        self.cache = cache
+        self.generation = generation
+        self.model_name = model_name or getattr(llm, "model", type(llm).__name__)
+        self.reuse_semantic_answers = reuse_semantic_answers
+        self.single_flight = single_flight
+        self._executor = executor
+
+    async def answer(self, query: str) -> str:
+        """Generate answer for a query using the RAG pipeline.
+
+        Args:
+            query: User's question or query.
+
+        Returns:
+            Generated answer from the LLM.
+        """
+        key, cached = await self._cached(query)
+        if cached is not None:
+            return cached
+
+        if self.single_flight is None:
+            return await self._generate_answer(query, key)
+        # Concurrent identical questions share one retrieval + generation. The
+        # flight is keyed like the response cache (model, template, index
+        # generation), so a question asked after an index write never joins
+        # a flight that started before it
+        flight_key = key if key is not None else await self._run(self._answer_key, query)
+        return await self.single_flight.do(
+            ("answer", flight_key),
+            lambda: self._generate_answer(query, key),
+        )
+
+    async def _generate_answer(self, query: str, key: str | None) -> str:
+        """Retrieve, generate and cache an answer (no cache lookup)."""
+        if self.reuse_semantic_answers:
+            answer = await self._answer_semantic(query)
+        else:
+            results, context = await self.retrieval_service.retrieve_with_context(
+                query, top_k=self.top_k, max_chars=self.max_chars
+            )
+            prompt = PromptBuilder.build(context=context, query=query)
+            answer = await self.llm.generate(prompt)
+
+        if key is not None:
+            await self._run(self.cache.put, key, answer)
+        return answer
+
+    async def answer_stream(self, query: str) -> AsyncIterator[str]:
+        """Generate an answer as a stream of text fragments.
+
+        A cached answer is yielded as a single fragment; a completed
+        stream is cached.
+
+        Args:
+            query: User's question or query.
+
+        Yields:
+            Answer fragments in generation order.
+        """
+        key, cached = await self._cached(query)
+        if cached is not None:
+            yield cached
+            return
+
+        results, context = await self.retrieval_service.retrieve_with_context(
+            query, top_k=self.top_k, max_chars=self.max_chars
+        )
+        prompt = PromptBuilder.build(context=context, query=query)
+        fragments = []
+        async for fragment in self.llm.generate_stream(prompt):
+            fragments.append(fragment)
+            yield fragment
+
+        # Only reached by a completed stream: an interrupted one raises (or the
+        # consumer stopped early), so truncated answers are never cached
+        if key is not None:
+            await self._run(self.cache.put, key, "".join(fragments))
+
+    async def answer_many(self, queries: list[str]) -> list[str]:
+        """Generate answers for several queries.
+
+        Cached answers are reused; retrieval for the rest is batched and
+        LLM calls then run concurrently.
+
+        Args:
+            queries: User questions.
+
+        Returns:
+            Generated answers, in the same order as queries.
+        """
+        if self.cache is None:
+            lookups = [(None, None)] * len(queries)
+        else:
+            lookups = await self._run(lambda: [self._lookup(query) for query in queries])
+        keys = [key for key, _ in lookups]
+        answers = [cached for _, cached in lookups]
+        missing = [i for i, answer in enumerate(answers) if answer is None]
+        if not missing:
+            return answers
+
+        retrieved = await self.retrieval_service.retrieve_many_with_context(
+            [queries[i] for i in missing], top_k=self.top_k, max_chars=self.max_chars
+        )
+        limit = self._max_concurrent_generations
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def generate(i: int, context: str) -> None:
+            prompt = PromptBuilder.build(context=context, query=queries[i])
+            if semaphore is None:
+                answers[i] = await self.llm.generate(prompt)
+            else:
+                async with semaphore:
+                    answers[i] = await self.llm.generate(prompt)
+            if keys[i] is not None:
+                await self._run(self.cache.put, keys[i], answers[i])
+
+        await asyncio.gather(
+            *(generate(i, context) for i, (_, context) in zip(missing, retrieved))
+        )
+        return answers
+
+    async def aclose(self) -> None:
+        """Release the LLM provider's connection pool."""
+        await self.llm.aclose()
+
+    async def _answer_semantic(self, query: str) -> str:
+        """Answer via a semantic cache entry, reusing an answer stored on it."""
+        entry = await self.retrieval_service.retrieve_entry(query, top_k=self.top_k)
+        answer_key = f"{self.model_name}|{PromptBuilder.TEMPLATE_VERSION}|{self.top_k}|{self.max_chars}"
+        cached = entry.answers.get(answer_key)
+        if cached is not None:
+            semantic_cache = self.retrieval_service.semantic_cache
+            if semantic_cache is not None:
+                semantic_cache.record_answer_hit()
+            return cached
+
+        context = await self.retrieval_service.build_context(
+            entry.results[:self.top_k], max_chars=self.max_chars, query=query
+        )
+        prompt = PromptBuilder.build(context=context, query=query)
+        answer = await self.llm.generate(prompt)
+        entry.answers[answer_key] = answer
+        return answer
+
+    async def _cached(self, query: str) -> tuple[str | None, str | None]:
+        """Response cache key and cached answer of query, looked up in the executor."""
+        if self.cache is None:
+            return None, None
+        return await self._run(self._lookup, query)
+
+    def _lookup(self, query: str) -> tuple[str | None, str | None]:
+        """Response cache key and cached answer of query (blocking; run in executor)."""
+        key = self._cache_key(query)
+        return key, self.cache.get(key) if key is not None else None
+
+    async def _run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call in the executor and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs)
+        )
+
+    def _cache_key(self, query: str) -> str | None:
+        """Response cache key for query, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        return self._answer_key(query)
+
+    def _answer_key(self, query: str) -> str:
+        """Key identifying the answer to query at the current index generation."""
+        return response_cache_key(
+            query,
+            top_k=self.top_k,
+            max_chars=self.max_chars,
+            model=self.model_name,
+            template_version=PromptBuilder.TEMPLATE_VERSION,
+            generation=self.generation.current() if self.generation else 0,
+        )
@@ -0,0 +1,137 @@
+"""Async facade over RetrievalService for event-loop callers."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, TypeVar
+
+from app.rag.cache.semantic_cache import SemanticCache
+from app.rag.models.cache import SemanticCacheEntry
+from app.rag.models.documents import ScoredDocumentChunk
+from app.rag.models.filters import MetadataFilter
+from app.rag.services.retrieval_service import RetrievalService
+
+T = TypeVar("T")
+
+
+class AsyncRetrievalService:
+    """Runs retrieval off the event loop.
+
+    Query embedding is CPU-bound and vector store queries block, so each
+    call is executed in `executor` (the loop's default thread pool when
+    None) and awaited; the event loop stays free for other requests.
+    """
+
+    def __init__(
+        self,
+        retrieval_service: RetrievalService,
+        executor: Executor | None = None,
+    ) -> None:
+        """
+        Initialize the async facade.
+
+        Args:
+            retrieval_service: Synchronous retrieval service doing the work
+            executor: Executor for embedding + search (None = loop default)
+        """
+        self._retrieval_service = retrieval_service
+        self._executor = executor
+
+    async def retrieve(
+        self,
+        query_text: str,
+        *,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[ScoredDocumentChunk]:
+        """Async RetrievalService.retrieve()."""
+        return await self._run(
+            self._retrieval_service.retrieve, query_text, top_k=top_k, filters=filters
+        )
+
+    async def retrieve_entry(
+        self,
+        query_text: str,
+        *,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> SemanticCacheEntry:
+        """Async RetrievalService.retrieve_entry()."""
+        return await self._run(
+            self._retrieval_service.retrieve_entry, query_text, top_k=top_k, filters=filters
+        )
+
+    async def retrieve_many(
+        self,
+        queries: list[str],
+        *,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[list[ScoredDocumentChunk]]:
+        """Async RetrievalService.retrieve_many()."""
+        return await self._run(
+            self._retrieval_service.retrieve_many, queries, top_k=top_k, filters=filters
+        )
+
+    async def retrieve_with_context(
+        self,
+        query_text: str,
+        *,
+        top_k: int = 5,
+        max_chars: int = 8000,
+        filters: MetadataFilter | None = None,
+    ) -> tuple[list[ScoredDocumentChunk], str]:
+        """Async RetrievalService.retrieve_with_context()."""
+        return await self._run(
+            self._retrieval_service.retrieve_with_context,
+            query_text,
+            top_k=top_k,
+            max_chars=max_chars,
+            filters=filters,
+        )
+
+    async def retrieve_many_with_context(
+        self,
+        queries: list[str],
+        *,
+        top_k: int = 5,
+        max_chars: int = 8000,
+        filters: MetadataFilter | None = None,
+    ) -> list[tuple[list[ScoredDocumentChunk], str]]:
+        """Async RetrievalService.retrieve_many_with_context()."""
+        return await self._run(
+            self._retrieval_service.retrieve_many_with_context,
+            queries,
+            top_k=top_k,
+            max_chars=max_chars,
+            filters=filters,
+        )
+
+    async def build_context(
+        self,
+        results: list[ScoredDocumentChunk],
+        *,
+        max_chars: int = 8000,
+        query: str | None = None,
+    ) -> str:
+        """Build context with the wrapped service's ContextBuilder in the executor."""
+        return await self._run(
+            self._retrieval_service.context_builder.build,
+            results,
+            max_chars=max_chars,
+            query=query,
+        )
+
+    @property
+    def semantic_cache(self) -> SemanticCache | None:
+        """The wrapped service's semantic cache."""
+        return self._retrieval_service.semantic_cache
+
+    async def _run(self, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking call in the executor and await its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs)
+        )
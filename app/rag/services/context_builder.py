@@ -3,21 +3,105 @@
 
 from __future__ import annotations
 
-from typing import Sequence
+from typing import Callable, List, Sequence, Set, Tuple
 
+import numpy as np
+
+from app.rag.chunking.sentence import split_sentences
+from app.rag.interfaces.embeddings import EmbeddingInterface
 from app.rag.models.documents import ScoredDocumentChunk
 
+# Word n-gram size used to compare chunks for near-duplicate detection
+_SHINGLE_SIZE = 3
+
+
+def shingles(text: str) -> Set[Tuple[str, ...]]:
+    """Set of casefolded word n-grams of text (the words themselves if shorter)."""
+    words = text.casefold().split()
+    if len(words) < _SHINGLE_SIZE:
+        return {tuple(words)}
+    return {tuple(words[i:i + _SHINGLE_SIZE]) for i in range(len(words) - _SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: Set, b: Set) -> float:
+    """Jaccard similarity of two sets (1.0 for two empty sets)."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
 
 class ContextBuilder:
-    """Builds context string from retrieved document chunks."""
+    """Builds context string from retrieved document chunks.
+
+    By default the context is capped by characters and building stops at
+    the first chunk that does not fit. With `max_tokens` (and a
+    `count_tokens` function for the target LLM's tokenizer) the budget is
+    counted in tokens instead and chunks that do not fit are skipped, so
+    a long high-ranked chunk no longer starves the rest.
+
+    Optionally, near-identical chunks are dropped (`dedupe_threshold`, word
+    trigram Jaccard similarity; the better-ranked copy is kept) and each
+    chunk is trimmed to its `sentences_per_chunk` sentences most similar
+    to the query (needs an `embedder`), keeping their original order.
+
+    With `stable_order`, chunks are still selected by rank but emitted in
+    (document_id, chunk index) order, so consecutive questions retrieving
+    the same chunks produce the same context text and the LLM server can
+    reuse its cached prompt prefix.
+    """
 
     SEPARATOR = "\n\n---\n\n"
 
+    def __init__(
+        self,
+        count_tokens: Callable[[str], int] | None = None,
+        max_tokens: int | None = None,
+        embedder: EmbeddingInterface | None = None,
+        sentences_per_chunk: int | None = None,
+        dedupe_threshold: float | None = None,
+        stable_order: bool = False,
+    ) -> None:
+        """
+        Initialize the builder (character mode when max_tokens is None).
+
+        Args:
+            count_tokens: Token counting function of the target LLM
+            max_tokens: Token budget of the context
+            embedder: Embedding provider used for sentence trimming
+            sentences_per_chunk: Sentences kept per chunk (None keeps all)
+            dedupe_threshold: Similarity above which a chunk counts as a
+                duplicate of a better-ranked one (None disables)
+            stable_order: Emit selected chunks in document order
+
+        Raises:
+            ValueError: If an option is out of range or lacks its dependency
+        """
+        if max_tokens is not None:
+            if max_tokens <= 0:
+                raise ValueError("max_tokens must be greater than 0")
+            if count_tokens is None:
+                raise ValueError("A token budget requires a count_tokens function")
+        if sentences_per_chunk is not None:
+            if sentences_per_chunk <= 0:
+                raise ValueError("sentences_per_chunk must be greater than 0")
+            if embedder is None:
+                raise ValueError("Sentence trimming requires an embedder")
+        if dedupe_threshold is not None and not 0.0 < dedupe_threshold <= 1.0:
+            raise ValueError("dedupe_threshold must be in (0, 1]")
+
+        self._count_tokens = count_tokens
+        self._max_tokens = max_tokens
+        self._embedder = embedder
+        self._sentences_per_chunk = sentences_per_chunk
+        self._dedupe_threshold = dedupe_threshold
+        self._stable_order = stable_order
+
     def build(
         self,
         chunks: Sequence[ScoredDocumentChunk],
         *,
         max_chars: int = 8000,
+        query: str | None = None,
     ) -> str:
         """
         Build context string from scored chunks.
@@ -25,6 +109,7 @@ class ContextBuilder:
         Args:
             chunks: Retrieved chunks in retrieval order
             max_chars: Maximum total characters allowed (hard cap)
+            query: The question, used for sentence trimming
 
         Returns:
             Concatenated chunk contents, or empty string if no chunks
@@ -32,13 +117,29 @@ class ContextBuilder:
         if not chunks:
             return ""
 
+        selected = list(chunks)
+        if self._dedupe_threshold is not None:
+            selected = self._dedupe(selected)
+        contents = [scored_chunk.chunk.content for scored_chunk in selected]
+        if self._sentences_per_chunk is not None and query:
+            contents = self._trim_to_query(contents, query)
+
+        if self._max_tokens is not None:
+            kept = self._pack_tokens(contents, max_chars)
+        else:
+            kept = self._pack_chars(contents, max_chars)
+
+        if self._stable_order:
+            kept.sort(key=lambda i: (selected[i].chunk.document_id, selected[i].chunk.index))
+        return self.SEPARATOR.join(contents[i] for i in kept)
+
+    def _pack_chars(self, contents: List[str], max_chars: int) -> List[int]:
+        """Positions of the leading chunks that fit in max_chars."""
         # Build incrementally, stop before exceeding limit
-        parts = []
+        kept: List[int] = []
         total_length = 0
 
-        for i, scored_chunk in enumerate(chunks):
-            content = scored_chunk.chunk.content
-
+        for i, content in enumerate(contents):
             # Calculate what the length would be with this chunk
             # Include separator length for all chunks except the first
             separator_length = len(self.SEPARATOR) if i > 0 else 0
@@ -48,7 +149,68 @@ class ContextBuilder:
             if total_length + chunk_contribution > max_chars:
                 break
 
-            parts.append(content)
+            kept.append(i)
             total_length += chunk_contribution
 
-        return self.SEPARATOR.join(parts)
+        return kept
+
+    def _pack_tokens(self, contents: List[str], max_chars: int) -> List[int]:
+        """Positions of chunks added in rank order, skipping those over budget."""
+        separator_tokens = self._count_tokens(self.SEPARATOR)
+        kept: List[int] = []
+        tokens = 0
+        chars = 0
+
+        for i, content in enumerate(contents):
+            separator = 1 if kept else 0
+            token_cost = separator * separator_tokens + self._count_tokens(content)
+            char_cost = separator * len(self.SEPARATOR) + len(content)
+            if tokens + token_cost > self._max_tokens or chars + char_cost > max_chars:
+                continue
+
+            kept.append(i)
+            tokens += token_cost
+            chars += char_cost
+
+        return kept
+
+    def _dedupe(self, chunks: List[ScoredDocumentChunk]) -> List[ScoredDocumentChunk]:
+        """Drop chunks too similar to a better-ranked kept chunk."""
+        kept: List[ScoredDocumentChunk] = []
+        kept_shingles: List[Set[Tuple[str, ...]]] = []
+        for scored_chunk in chunks:
+            current = shingles(scored_chunk.chunk.content)
+            if any(jaccard(current, other) >= self._dedupe_threshold for other in kept_shingles):
+                continue
+            kept.append(scored_chunk)
+            kept_shingles.append(current)
+        return kept
+
+    def _trim_to_query(self, contents: List[str], query: str) -> List[str]:
+        """Keep each chunk's sentences most similar to the query, in order."""
+        sentences = [split_sentences(content) for content in contents]
+        to_embed = [
+            sentence
+            for chunk_sentences in sentences
+            if len(chunk_sentences) > self._sentences_per_chunk
+            for sentence in chunk_sentences
+        ]
+        if not to_embed:
+            return contents
+
+        # One embedding call for the query and all sentences to be ranked
+        vectors = self._embedder.embed_batch([query] + to_embed).array
+        vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        similarities = vectors[1:] @ vectors[0]
+
+        trimmed: List[str] = []
+        offset = 0
+        for content, chunk_sentences in zip(contents, sentences):
+            if len(chunk_sentences) <= self._sentences_per_chunk:
+                trimmed.append(content)
+                continue
+            scores = similarities[offset:offset + len(chunk_sentences)]
+            offset += len(chunk_sentences)
+            best = np.sort(np.argsort(-scores, kind="stable")[:self._sentences_per_chunk])
+            trimmed.append(" ".join(chunk_sentences[i] for i in best))
+        return trimmed
@@ -0,0 +1,113 @@
+"""Per-document fingerprint manifest for incremental indexing."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+from typing import Any, Dict, Mapping, Set
+
+from app.rag.models.documents import DocumentBase, DocumentChunk
+
+
+def _fingerprint(content: str, metadata: Mapping[str, Any], *extra: str) -> str:
+    """Hash content, metadata (key-order independent) and extra fields."""
+    payload = json.dumps(
+        [content, dict(metadata), *extra],
+        sort_keys=True,
+        default=str,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def document_fingerprint(document: DocumentBase) -> str:
+    """Fingerprint of a document's content and metadata."""
+    return _fingerprint(document.content, document.metadata)
+
+
+def chunk_fingerprint(chunk: DocumentChunk) -> str:
+    """Fingerprint of a chunk's content, metadata and position."""
+    return _fingerprint(chunk.content, chunk.metadata, chunk.document_id, str(chunk.index))
+
+
+class IndexManifest:
+    """SQLite-backed record of what has been indexed.
+
+    Stores one fingerprint per document and one per chunk, so re-indexing
+    can skip unchanged documents, re-embed only changed chunks and delete
+    chunks that disappeared. Changing the chunking strategy changes chunk
+    boundaries but not document fingerprints: reset the manifest (use a new
+    file) when doing so.
+    """
+
+    def __init__(self, path: str = ":memory:") -> None:
+        """Open (or create) the manifest database at path."""
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS documents (
+                document_id TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS chunks (
+                chunk_id TEXT PRIMARY KEY,
+                document_id TEXT NOT NULL,
+                fingerprint TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS chunks_by_document ON chunks (document_id);
+            """
+        )
+        self._db.commit()
+
+    def get_document_fingerprint(self, document_id: str) -> str | None:
+        """Return the stored fingerprint for a document, if indexed."""
+        row = self._db.execute(
+            "SELECT fingerprint FROM documents WHERE document_id = ?",
+            (document_id,),
+        ).fetchone()
+        return row[0] if row else None
+
+    def get_chunk_fingerprints(self, document_id: str) -> Dict[str, str]:
+        """Return {chunk_id: fingerprint} for a document's indexed chunks."""
+        rows = self._db.execute(
+            "SELECT chunk_id, fingerprint FROM chunks WHERE document_id = ?",
+            (document_id,),
+        ).fetchall()
+        return dict(rows)
+
+    def set_document(
+        self,
+        document_id: str,
+        fingerprint: str,
+        chunk_fingerprints: Mapping[str, str],
+    ) -> None:
+        """Replace a document's fingerprint and its chunk fingerprints."""
+        with self._db:
+            self._db.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+            self._db.execute(
+                "INSERT OR REPLACE INTO documents (document_id, fingerprint) VALUES (?, ?)",
+                (document_id, fingerprint),
+            )
+            self._db.executemany(
+                "INSERT OR REPLACE INTO chunks (chunk_id, document_id, fingerprint) "
+                "VALUES (?, ?, ?)",
+                [
+                    (chunk_id, document_id, chunk_fp)
+                    for chunk_id, chunk_fp in chunk_fingerprints.items()
+                ],
+            )
+
+    def remove_document(self, document_id: str) -> None:
+        """Forget a document and its chunks."""
+        with self._db:
+            self._db.execute("DELETE FROM chunks WHERE document_id = ?", (document_id,))
+            self._db.execute("DELETE FROM documents WHERE document_id = ?", (document_id,))
+
+    def document_ids(self) -> Set[str]:
+        """Return the IDs of all indexed documents."""
+        return {row[0] for row in self._db.execute("SELECT document_id FROM documents")}
+
+    def close(self) -> None:
+        """Close the manifest database."""
+        self._db.close()
@@ -2,11 +2,26 @@
 
 from __future__ import annotations
 
-from typing import List
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, Tuple
 
+from app.rag.cache.generation import IndexGeneration
+from app.rag.chunking.factory import build_chunker
+from app.rag.chunking.fixed_size import FixedSizeChunker
+from app.rag.embeddings.process_pool_provider import ProcessPoolEmbeddingProvider
+from app.rag.interfaces.chunker import ChunkerInterface
 from app.rag.interfaces.embeddings import EmbeddingInterface
 from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.lexical.bm25 import BM25Index
 from app.rag.models.documents import DocumentBase, DocumentChunk
+from app.rag.models.indexing import IndexingReport
+from app.rag.models.settings import RAGSettings
+from app.rag.services.index_manifest import (
+    IndexManifest,
+    chunk_fingerprint,
+    document_fingerprint,
+)
 
 
 class IndexingService:
@@ -16,42 +31,386 @@ class IndexingService:
         self,
         embedder: EmbeddingInterface,
         vector_store: VectorStoreInterface,
+        chunker: ChunkerInterface | None = None,
+        batch_size: int = 64,
+        manifest: IndexManifest | None = None,
+        generation: IndexGeneration | None = None,
+        lexical_index: BM25Index | None = None,
     ) -> None:
-        """Initialize with embedding provider and vector store."""
+        """
+        Initialize with embedding provider and vector store.
+
+        Args:
+            embedder: Embedding provider used for chunk texts
+            vector_store: Destination vector store
+            chunker: Chunking strategy (defaults to FixedSizeChunker)
+            batch_size: Number of chunks embedded and upserted per micro-batch
+            manifest: Fingerprint manifest, required for incremental indexing
+            generation: Index generation counter, bumped after every write so
+                response caches keyed on it are invalidated
+            lexical_index: BM25 index kept in sync with the vector store
+                (flushed to disk at the end of every indexing call)
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+
         self._embedder = embedder
         self._vector_store = vector_store
+        self._chunker = chunker or FixedSizeChunker()
+        self._batch_size = batch_size
+        self._manifest = manifest
+        self._generation = generation
+        self._lexical_index = lexical_index
+
+    @classmethod
+    def from_settings(
+        cls,
+        settings: RAGSettings,
+        embedder: EmbeddingInterface,
+        vector_store: VectorStoreInterface,
+        *,
+        count_tokens: Callable[[str], int] | None = None,
+        manifest: IndexManifest | None = None,
+        generation: IndexGeneration | None = None,
+        lexical_index: BM25Index | None = None,
+    ) -> IndexingService:
+        """
+        Build a service configured by RAG settings.
+
+        The chunker follows the chunking settings and batches hold
+        indexing_batch_size chunks. Unless given, the index generation is
+        opened from index_generation_path and, in hybrid retrieval mode,
+        the BM25 index from lexical_index_dir, so the indexer writes what
+        the API reads.
+
+        Args:
+            settings: RAG settings
+            embedder: Embedding provider used for chunk texts
+            vector_store: Destination vector store
+            count_tokens: Token counter for the "token" chunking strategy
+                (defaults to the embedder's count_tokens, if it has one)
+            manifest: Fingerprint manifest, required for incremental indexing
+            generation: Index generation counter
+            lexical_index: BM25 index kept in sync with the vector store
+
+        Raises:
+            ValueError: If the chunking settings are invalid
+        """
+        if generation is None and settings.index_generation_path:
+            generation = IndexGeneration(settings.index_generation_path)
+        if lexical_index is None and settings.retrieval_mode == "hybrid":
+            lexical_index = BM25Index(
+                k1=settings.bm25_k1,
+                b=settings.bm25_b,
+                path=settings.lexical_index_dir,
+            )
+        chunker = build_chunker(
+            settings, count_tokens=count_tokens or getattr(embedder, "count_tokens", None)
+        )
+        return cls(
+            embedder,
+            vector_store,
+            chunker=chunker,
+            batch_size=settings.indexing_batch_size,
+            manifest=manifest,
+            generation=generation,
+            lexical_index=lexical_index,
+        )
 
     def index_documents(self, documents: List[DocumentBase]) -> None:
         """Index multiple documents by chunking, embedding, and storing."""
         if not documents:
             return
 
-        # Chunk all documents
-        all_chunks: List[DocumentChunk] = []
+        self.index_documents_stream(documents)
+
+    def index_documents_stream(
+        self,
+        documents: Iterable[DocumentBase],
+        *,
+        batch_size: int | None = None,
+    ) -> int:
+        """
+        Index documents from any iterable in fixed-size micro-batches.
+
+        Documents are chunked lazily and each batch of chunks is embedded and
+        upserted before the next one is built, so memory stays bounded by the
+        batch size regardless of corpus size.
+
+        Args:
+            documents: Iterable (e.g. generator) of documents
+            batch_size: Chunks per micro-batch (defaults to the service batch size)
+
+        Returns:
+            Total number of chunks indexed
+        """
+        size = batch_size or self._batch_size
+        total = 0
+
+        for batch in self._iter_chunk_batches(documents, size):
+            self._embed_and_store(batch)
+            total += len(batch)
+
+        self._flush_lexical()
+        return total
+
+    def index_documents_parallel(
+        self,
+        documents: Iterable[DocumentBase],
+        embedder: ProcessPoolEmbeddingProvider,
+        *,
+        batch_size: int | None = None,
+        max_in_flight: int | None = None,
+    ) -> int:
+        """
+        Index documents with embedding spread over a pool of worker processes.
+
+        Chunking, embedding and upserting run as a pipeline: while the
+        workers encode later batches, this thread keeps chunking and writes
+        finished batches to the store. Batches are upserted in document
+        order and chunk IDs are the same as with index_documents_stream, so
+        the resulting index does not depend on worker scheduling.
+
+        Args:
+            documents: Iterable (e.g. generator) of documents
+            embedder: Process pool provider used instead of the service embedder
+            batch_size: Chunks per batch (defaults to the service batch size)
+            max_in_flight: Batches submitted but not yet stored, bounding
+                memory (defaults to twice the number of workers)
+
+        Returns:
+            Total number of chunks indexed
+        """
+        size = batch_size or self._batch_size
+        limit = max_in_flight or 2 * embedder.workers
+        if limit <= 0:
+            raise ValueError("max_in_flight must be greater than 0")
+
+        in_flight: Deque[Tuple[List[DocumentChunk], Future]] = deque()
+        total = 0
+
+        def _store_oldest() -> int:
+            chunks, future = in_flight.popleft()
+            self._vector_store.add_chunks(chunks, future.result())
+            if self._lexical_index is not None:
+                self._lexical_index.add_chunks(chunks)
+            self._bump_generation()
+            return len(chunks)
+
+        try:
+            for batch in self._iter_chunk_batches(documents, size):
+                in_flight.append((batch, embedder.submit([chunk.content for chunk in batch])))
+                if len(in_flight) >= limit:
+                    total += _store_oldest()
+
+            while in_flight:
+                total += _store_oldest()
+        finally:
+            # On failure, drop the shards of abandoned batches that have not
+            # started yet (running shards finish and are discarded)
+            for _, future in in_flight:
+                future.cancel()
+
+        self._flush_lexical()
+        return total
+
+    def index_documents_incremental(
+        self,
+        documents: Iterable[DocumentBase],
+        *,
+        remove_missing: bool = False,
+    ) -> IndexingReport:
+        """
+        Index only what changed since the last run, using the manifest.
+
+        Documents whose content+metadata fingerprint is unchanged are skipped.
+        For changed documents only chunks with a new fingerprint are
+        re-embedded, and chunks that no longer exist are deleted. A document
+        is recorded in the manifest only after all of its chunks are stored.
+
+        Args:
+            documents: Iterable of documents (the full corpus if remove_missing)
+            remove_missing: Delete indexed documents absent from `documents`
+
+        Returns:
+            IndexingReport with added/updated/unchanged/removed counts
+
+        Raises:
+            RuntimeError: If the service has no manifest
+        """
+        manifest = self._manifest
+        if manifest is None:
+            raise RuntimeError("Incremental indexing requires an IndexManifest")
+
+        report = IndexingReport()
+        seen = set()
+
+        # Chunks waiting to be embedded, and manifest entries waiting for them:
+        # (document_id, fingerprint, chunk fingerprints, queued position)
+        buffer: List[DocumentChunk] = []
+        pending: Deque[Tuple[str, str, Dict[str, str], int]] = deque()
+        queued = 0
+        flushed = 0
+
+        def flush(force: bool) -> None:
+            nonlocal buffer, flushed
+            while buffer and (force or len(buffer) >= self._batch_size):
+                batch, buffer = buffer[:self._batch_size], buffer[self._batch_size:]
+                self._embed_and_store(batch)
+                flushed += len(batch)
+                report.chunks_embedded += len(batch)
+            while pending and pending[0][3] <= flushed:
+                document_id, fingerprint, chunk_fps, _ = pending.popleft()
+                manifest.set_document(document_id, fingerprint, chunk_fps)
+
         for document in documents:
+            seen.add(document.id)
+            fingerprint = document_fingerprint(document)
+            previous = manifest.get_document_fingerprint(document.id)
+
+            if previous == fingerprint:
+                report.unchanged += 1
+                continue
+
             chunks = self._chunk_document(document)
-            all_chunks.extend(chunks)
+            chunk_fps = {chunk.id: chunk_fingerprint(chunk) for chunk in chunks}
+            old_fps = manifest.get_chunk_fingerprints(document.id)
 
-        if not all_chunks:
-            return
+            stale = [chunk_id for chunk_id in old_fps if chunk_id not in chunk_fps]
+            if stale:
+                self._vector_store.delete_chunks(stale)
+                if self._lexical_index is not None:
+                    self._lexical_index.delete_chunks(stale)
+                self._bump_generation()
+                report.chunks_deleted += len(stale)
+
+            changed = [chunk for chunk in chunks if old_fps.get(chunk.id) != chunk_fps[chunk.id]]
+            buffer.extend(changed)
+            queued += len(changed)
+            pending.append((document.id, fingerprint, chunk_fps, queued))
+
+            if previous is None:
+                report.added += 1
+            else:
+                report.updated += 1
+
+            flush(force=False)
+
+        flush(force=True)
+
+        if remove_missing:
+            missing = sorted(manifest.document_ids() - seen)
+            if missing:
+                # One batched delete for all removed documents
+                self._vector_store.delete_by_document_ids(missing)
+                if self._lexical_index is not None:
+                    self._lexical_index.delete_by_document_ids(missing)
+                self._bump_generation()
+            for document_id in missing:
+                report.chunks_deleted += len(manifest.get_chunk_fingerprints(document_id))
+                manifest.remove_document(document_id)
+                report.removed += 1
+
+        self._flush_lexical()
+        return report
+
+    def replace_documents(
+        self,
+        documents: Iterable[DocumentBase],
+        *,
+        batch_size: int | None = None,
+    ) -> int:
+        """
+        Re-index documents, dropping any of their chunks that no longer exist.
+
+        Unlike index_documents (pure upsert), a document that shrank loses its
+        trailing chunks. Micro-batches always hold whole documents so each
+        store call sees a document's complete chunk set.
+
+        Args:
+            documents: Iterable of documents to replace
+            batch_size: Approximate chunks per micro-batch
+
+        Returns:
+            Total number of chunks indexed
+        """
+        size = batch_size or self._batch_size
+        total = 0
+        document_ids: List[str] = []
+        batch: List[DocumentChunk] = []
+
+        for document in documents:
+            document_ids.append(document.id)
+            batch.extend(self._chunk_document(document))
+
+            if len(batch) >= size:
+                self._replace_batch(document_ids, batch)
+                total += len(batch)
+                document_ids, batch = [], []
+
+        if document_ids:
+            self._replace_batch(document_ids, batch)
+            total += len(batch)
+
+        self._flush_lexical()
+        return total
+
+    def _replace_batch(self, document_ids: List[str], chunks: List[DocumentChunk]) -> None:
+        """Embed chunks and replace the documents' contents in the store."""
+        embeddings = self._embedder.embed_batch([chunk.content for chunk in chunks]) if chunks else []
+        self._vector_store.replace_documents(document_ids, chunks, embeddings)
+        if self._lexical_index is not None:
+            self._lexical_index.delete_by_document_ids(document_ids)
+            self._lexical_index.add_chunks(chunks)
+        self._bump_generation()
+
+    def _iter_chunk_batches(
+        self,
+        documents: Iterable[DocumentBase],
+        batch_size: int,
+    ) -> Iterator[List[DocumentChunk]]:
+        """Yield lists of at most batch_size chunks, in document order."""
+        batch: List[DocumentChunk] = []
+
+        for document in documents:
+            for chunk in self._chunk_document(document):
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+    def _embed_and_store(self, chunks: List[DocumentChunk]) -> None:
+        """Embed one batch of chunks and upsert it into the vector store."""
+        chunk_texts = [chunk.content for chunk in chunks]
+        embeddings = self._embedder.embed_batch(chunk_texts)
+        self._vector_store.add_chunks(chunks, embeddings)
+        if self._lexical_index is not None:
+            self._lexical_index.add_chunks(chunks)
+        self._bump_generation()
 
-        # Batch embed all chunks
-        chunk_texts = [chunk.content for chunk in all_chunks]
-        embeddings = self._embedder.embed_texts(chunk_texts)
+    def _flush_lexical(self) -> None:
+        """Persist the lexical index after an indexing call, if one is configured."""
+        if self._lexical_index is not None:
+            self._lexical_index.flush()
 
-        # Store in vector store
-        self._vector_store.add_chunks(all_chunks, embeddings)
+    def _bump_generation(self) -> None:
+        """Advance the index generation after a store write, if one is configured."""
+        if self._generation is not None:
+            self._generation.bump()
 
     def _chunk_document(self, document: DocumentBase) -> List[DocumentChunk]:
-        """Chunk a single document (minimal: 1 document = 1 chunk for F3)."""
-        # Minimal chunking for F3: entire document as single chunk
+        """Chunk a single document using the configured chunker."""
         # Deterministic ID format: {document_id}::chunk:{index}
         return [
             DocumentChunk(
-                id=f"{document.id}::chunk:0",
+                id=f"{document.id}::chunk:{index}",
                 document_id=document.id,
-                content=document.content,
-                index=0,
+                content=content,
+                index=index,
                 metadata=dict(document.metadata),
             )
-        ]
\ No newline at end of file
+            for index, content in enumerate(self._chunker.split_text(document.content))
+        ]
@@ -1,5 +1,10 @@
 """RAG orchestration service combining retrieval and LLM generation."""
 
+from typing import Iterator
+
+from app.rag.cache.generation import IndexGeneration
+from app.rag.cache.response_cache import ResponseCache, response_cache_key
+from app.rag.concurrency.single_flight import SingleFlight
 from app.rag.services.retrieval_service import RetrievalService
 from app.rag.prompts.prompt_builder import PromptBuilder
 from app.rag.llm.interfaces.llm_interface import LLMInterface
@@ -11,16 +16,44 @@ class RAGLLMService:
     def __init__(
         self,
         retrieval_service: RetrievalService,
-        llm: LLMInterface
+        llm: LLMInterface,
+        *,
+        top_k: int = 5,
+        max_chars: int = 8000,
+        cache: ResponseCache | None = None,
+        generation: IndexGeneration | None = None,
+        model_name: str | None = None,
+        reuse_semantic_answers: bool = False,
+        single_flight: SingleFlight | None = None,
     ) -> None:
         """Initialize RAG LLM service.
         
         Args:
             retrieval_service: Service for retrieving relevant context (F4).
             llm: LLM provider interface for generating responses.
+            top_k: Chunks retrieved per question.
+            max_chars: Maximum characters of context per prompt.
+            cache: Optional answer cache; repeated questions skip retrieval
+                and generation.
+            generation: Index generation counter shared with IndexingService;
+                cached answers are invalidated when it advances.
+            model_name: Model identifier for cache keys (defaults to the
+                provider's `model` attribute).
+            reuse_semantic_answers: Reuse answers stored on the retrieval
+                service's semantic cache entries, so paraphrased questions
+                skip generation too.
+            single_flight: Optional single-flight group; concurrent
+                identical questions then share one answer computation.
         """
         self.retrieval_service = retrieval_service
         self.llm = llm
+        self.top_k = top_k
+        self.max_chars = max_chars
+        self.cache = cache
+        self.generation = generation
+        self.model_name = model_name or getattr(llm, "model", type(llm).__name__)
+        self.reuse_semantic_answers = reuse_semantic_answers
+        self.single_flight = single_flight
     
     def answer(self, query: str) -> str:
         """Generate answer for a query using RAG pipeline.
@@ -34,7 +67,137 @@ class RAGLLMService:
         Returns:
             Generated answer from the LLM.
         """
-        results, context = self.retrieval_service.retrieve_with_context(query)
+        key = self._cache_key(query)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        if self.single_flight is None:
+            return self._generate_answer(query, key)
+        # Concurrent identical questions share one retrieval + generation. The
+        # flight is keyed like the response cache (model, template, index
+        # generation), so a question asked after an index write never joins
+        # a flight that started before it
+        flight_key = key if key is not None else self._answer_key(query)
+        return self.single_flight.do(
+            ("answer", flight_key),
+            lambda: self._generate_answer(query, key),
+        )
+
+    def _generate_answer(self, query: str, key: str | None) -> str:
+        """Retrieve, generate and cache an answer (no cache lookup)."""
+        if self.reuse_semantic_answers:
+            answer = self._answer_semantic(query)
+        else:
+            results, context = self.retrieval_service.retrieve_with_context(
+                query, top_k=self.top_k, max_chars=self.max_chars
+            )
+            prompt = PromptBuilder.build(context=context, query=query)
+            answer = self.llm.generate(prompt)
+
+        if key is not None:
+            self.cache.put(key, answer)
+        return answer
+
+    def answer_stream(self, query: str) -> Iterator[str]:
+        """Generate an answer as a stream of text fragments.
+
+        Retrieval completes before the first fragment; fragments are then
+        yielded as the LLM produces them. A cached answer is yielded as a
+        single fragment; a completed stream is cached.
+
+        Args:
+            query: User's question or query.
+
+        Yields:
+            Answer fragments in generation order.
+        """
+        key = self._cache_key(query)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        results, context = self.retrieval_service.retrieve_with_context(
+            query, top_k=self.top_k, max_chars=self.max_chars
+        )
+        prompt = PromptBuilder.build(context=context, query=query)
+        fragments = []
+        for fragment in self.llm.generate_stream(prompt):
+            fragments.append(fragment)
+            yield fragment
+
+        # Only reached by a completed stream: an interrupted one raises (or the
+        # consumer stopped early), so truncated answers are never cached
+        if key is not None:
+            self.cache.put(key, "".join(fragments))
+
+    def answer_many(self, queries: list[str]) -> list[str]:
+        """Generate answers for several queries.
+
+        Cached answers are reused; retrieval for the remaining queries is
+        batched (one embedding call, one vector store query) and the LLM is
+        then called once per query.
+
+        Args:
+            queries: User questions.
+
+        Returns:
+            Generated answers, in the same order as queries.
+        """
+        keys = [self._cache_key(query) for query in queries]
+        answers = [
+            self.cache.get(key) if key is not None else None
+            for key in keys
+        ]
+        missing = [i for i, answer in enumerate(answers) if answer is None]
+        if not missing:
+            return answers
+
+        retrieved = self.retrieval_service.retrieve_many_with_context(
+            [queries[i] for i in missing], top_k=self.top_k, max_chars=self.max_chars
+        )
+        for i, (results, context) in zip(missing, retrieved):
+            prompt = PromptBuilder.build(context=context, query=queries[i])
+            answers[i] = self.llm.generate(prompt)
+            if keys[i] is not None:
+                self.cache.put(keys[i], answers[i])
+        return answers
+
+    def _answer_semantic(self, query: str) -> str:
+        """Answer via a semantic cache entry, reusing an answer stored on it."""
+        entry = self.retrieval_service.retrieve_entry(query, top_k=self.top_k)
+        answer_key = f"{self.model_name}|{PromptBuilder.TEMPLATE_VERSION}|{self.top_k}|{self.max_chars}"
+        cached = entry.answers.get(answer_key)
+        if cached is not None:
+            semantic_cache = self.retrieval_service.semantic_cache
+            if semantic_cache is not None:
+                semantic_cache.record_answer_hit()
+            return cached
+
+        context = self.retrieval_service.context_builder.build(
+            entry.results[:self.top_k], max_chars=self.max_chars, query=query
+        )
         prompt = PromptBuilder.build(context=context, query=query)
         answer = self.llm.generate(prompt)
+        entry.answers[answer_key] = answer
         return answer
+
+    def _cache_key(self, query: str) -> str | None:
+        """Response cache key for query, or None when caching is disabled."""
+        if self.cache is None:
+            return None
+        return self._answer_key(query)
+
+    def _answer_key(self, query: str) -> str:
+        """Key identifying the answer to query at the current index generation."""
+        return response_cache_key(
+            query,
+            top_k=self.top_k,
+            max_chars=self.max_chars,
+            model=self.model_name,
+            template_version=PromptBuilder.TEMPLATE_VERSION,
+            generation=self.generation.current() if self.generation else 0,
+        )
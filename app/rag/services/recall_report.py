@@ -0,0 +1,98 @@
+"""Recall@k measurement of an approximate vector store against an exact one."""
+
+from __future__ import annotations
+
+import time
+from typing import List, Sequence
+
+from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.models.embeddings import EmbeddingsLike
+from app.rag.models.evaluation import RecallReport
+
+
+def measure_recall(
+    exact_store: VectorStoreInterface,
+    candidate_store: VectorStoreInterface,
+    queries: EmbeddingsLike,
+    *,
+    top_k: int = 10,
+    label: str = "",
+) -> RecallReport:
+    """
+    Compare a candidate (e.g. ANN) store with an exact store holding the same data.
+
+    Recall@k is the fraction of the exact top_k chunk IDs that the candidate
+    store also returns in its top_k, averaged over queries.
+
+    Args:
+        exact_store: Store with exact search (ground truth)
+        candidate_store: Store under evaluation
+        queries: Query embeddings
+        top_k: Number of results compared per query
+        label: Free-form description of the candidate configuration
+
+    Returns:
+        RecallReport with recall and mean per-query latencies
+
+    Raises:
+        ValueError: If queries is empty or top_k <= 0
+    """
+    if len(queries) == 0:
+        raise ValueError("At least one query is required")
+    if top_k <= 0:
+        raise ValueError("top_k must be greater than 0")
+
+    recalls: List[float] = []
+    exact_seconds = 0.0
+    candidate_seconds = 0.0
+
+    for query in queries:
+        started = time.perf_counter()
+        expected = exact_store.query(query, top_k=top_k)
+        exact_seconds += time.perf_counter() - started
+
+        started = time.perf_counter()
+        found = candidate_store.query(query, top_k=top_k)
+        candidate_seconds += time.perf_counter() - started
+
+        expected_ids = {result.chunk.id for result in expected}
+        if expected_ids:
+            found_ids = {result.chunk.id for result in found}
+            recalls.append(len(expected_ids & found_ids) / len(expected_ids))
+
+    return RecallReport(
+        label=label,
+        top_k=top_k,
+        queries=len(queries),
+        recall=sum(recalls) / len(recalls) if recalls else 1.0,
+        exact_latency_ms=1000.0 * exact_seconds / len(queries),
+        candidate_latency_ms=1000.0 * candidate_seconds / len(queries),
+    )
+
+
+def sweep_nprobe(
+    exact_store: VectorStoreInterface,
+    ivf_store,
+    queries: EmbeddingsLike,
+    nprobe_values: Sequence[int],
+    *,
+    top_k: int = 10,
+) -> List[RecallReport]:
+    """
+    Measure recall/latency of an IVF store for several nprobe values.
+
+    The store's original nprobe is restored afterwards.
+    """
+    original = ivf_store.nprobe
+    reports = []
+    try:
+        for nprobe in nprobe_values:
+            ivf_store.nprobe = nprobe
+            reports.append(
+                measure_recall(
+                    exact_store, ivf_store, queries, top_k=top_k, label=f"nprobe={nprobe}"
+                )
+            )
+    finally:
+        ivf_store.nprobe = original
+    return reports
@@ -3,11 +3,22 @@
 
 from __future__ import annotations
 
+from app.rag.cache.generation import IndexGeneration
+from app.rag.cache.response_cache import normalize_query
+from app.rag.cache.semantic_cache import SemanticCache
+from app.rag.concurrency.single_flight import SingleFlight
 from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.interfaces.reranker import RerankerInterface
+from app.rag.lexical.bm25 import BM25Index
+from app.rag.lexical.fusion import reciprocal_rank_fusion
 from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.models.cache import SemanticCacheEntry
 from app.rag.models.documents import ScoredDocumentChunk
+from app.rag.models.filters import MetadataFilter
 from app.rag.services.context_builder import ContextBuilder
 
+RETRIEVAL_MODES = ("vector", "hybrid")
+
 
 class RetrievalService:
     """Service for retrieving relevant document chunks based on queries."""
@@ -16,16 +27,71 @@ class RetrievalService:
         self,
         embedder: EmbeddingInterface,
         vector_store: VectorStoreInterface,
+        semantic_cache: SemanticCache | None = None,
+        generation: IndexGeneration | None = None,
+        single_flight: SingleFlight | None = None,
+        context_builder: ContextBuilder | None = None,
+        reranker: RerankerInterface | None = None,
+        rerank_candidates: int = 20,
+        lexical_index: BM25Index | None = None,
+        retrieval_mode: str = "vector",
+        fusion_candidates: int = 20,
+        rrf_k: int = 60,
     ) -> None:
-        """Initialize with embedding provider and vector store."""
+        """
+        Initialize with embedding provider and vector store.
+
+        Args:
+            embedder: Embedding provider used for queries
+            vector_store: Store searched for similar chunks
+            semantic_cache: Optional cache reusing results of similar queries
+            generation: Index generation; cached results from older
+                generations are never reused
+            single_flight: Optional single-flight group; concurrent identical
+                queries then share one embedding + search
+            context_builder: Builder turning results into context (a
+                default character-budget builder when None)
+            reranker: Optional second stage reordering vector search
+                candidates before they are cut to top_k
+            rerank_candidates: Candidates fetched from the store per query
+                and scored by the reranker when one is set (at least top_k)
+            lexical_index: BM25 index over the same chunks (see IndexingService)
+            retrieval_mode: "vector", or "hybrid" to fuse vector and BM25
+                results with reciprocal rank fusion
+            fusion_candidates: Results taken from each retriever before fusion
+            rrf_k: Reciprocal rank fusion constant
+
+        Raises:
+            ValueError: If an option is invalid or hybrid mode lacks an index
+        """
+        if rerank_candidates <= 0:
+            raise ValueError("rerank_candidates must be greater than 0")
+        if retrieval_mode not in RETRIEVAL_MODES:
+            raise ValueError(f"retrieval_mode must be one of {RETRIEVAL_MODES}")
+        if retrieval_mode == "hybrid" and lexical_index is None:
+            raise ValueError("Hybrid retrieval requires a lexical_index")
+        if fusion_candidates <= 0:
+            raise ValueError("fusion_candidates must be greater than 0")
+
         self._embedder = embedder
         self._vector_store = vector_store
+        self.semantic_cache = semantic_cache
+        self._generation = generation
+        self._single_flight = single_flight
+        self.context_builder = context_builder or ContextBuilder()
+        self._reranker = reranker
+        self._rerank_candidates = rerank_candidates
+        self._lexical_index = lexical_index
+        self._retrieval_mode = retrieval_mode
+        self._fusion_candidates = fusion_candidates
+        self._rrf_k = rrf_k
 
     def retrieve(
         self,
         query_text: str,
         *,
         top_k: int = 5,
+        filters: MetadataFilter | None = None,
     ) -> list[ScoredDocumentChunk]:
         """
         Retrieve relevant document chunks for a query.
@@ -33,6 +99,7 @@ class RetrievalService:
         Args:
             query_text: Query string to search for
             top_k: Maximum number of results to return
+            filters: Optional metadata conditions every result must satisfy
 
         Returns:
             List of scored chunks, sorted by score ascending (lower=better)
@@ -47,17 +114,165 @@ class RetrievalService:
         if top_k <= 0:
             raise ValueError("top_k must be greater than 0")
 
-        # Embed query
-        query_embedding = self._embedder.embed_text(query_text)
+        return self.retrieve_entry(query_text, top_k=top_k, filters=filters).results[:top_k]
 
-        # Query vector store
-        results = self._vector_store.query(query_embedding, top_k=top_k)
+    def retrieve_entry(
+        self,
+        query_text: str,
+        *,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> SemanticCacheEntry:
+        """
+        Retrieve chunks for a query as a semantic cache entry.
 
-        # Sort by score ascending (distance: lower is better)
-        # Defensive sorting even if store returns sorted results
-        sorted_results = sorted(results, key=lambda x: x.score)
+        On a cache hit the entry of the similar earlier query is returned
+        (its results may be longer than top_k and it may carry answers);
+        on a miss the store is searched and the new entry is cached. Without
+        a semantic cache a fresh, uncached entry is returned. Filtered
+        queries bypass the semantic cache: its entries hold unfiltered
+        results.
+
+        Args:
+            query_text: Query string to search for
+            top_k: Maximum number of results to return
+            filters: Optional metadata conditions every result must satisfy
+
+        Returns:
+            Entry whose results are sorted by score ascending (lower=better)
+
+        Raises:
+            ValueError: If query_text is empty or top_k <= 0
+        """
+        if not query_text.strip():
+            raise ValueError("Query text cannot be empty")
+
+        if top_k <= 0:
+            raise ValueError("top_k must be greater than 0")
+
+        filters = _active(filters)
+        if self._single_flight is None:
+            return self._search_entry(query_text, top_k, filters)
+        # The generation keeps a query arriving after an index write from
+        # joining a search that started before it
+        return self._single_flight.do(
+            (
+                "retrieve",
+                normalize_query(query_text),
+                top_k,
+                filters.cache_key() if filters is not None else None,
+                self._current_generation(),
+            ),
+            lambda: self._search_entry(query_text, top_k, filters),
+        )
+
+    def _search_entry(
+        self,
+        query_text: str,
+        top_k: int,
+        filters: MetadataFilter | None,
+    ) -> SemanticCacheEntry:
+        """Embed and search one query, going through the semantic cache if any."""
+        # Embed query (row view of a 1-row batch, no per-float objects)
+        query_embedding = self._embedder.embed_batch([query_text]).row(0)
+        generation = self._current_generation()
+        semantic_cache = self.semantic_cache if filters is None else None
+
+        if semantic_cache is not None:
+            entry = semantic_cache.lookup(
+                query_embedding, top_k=top_k, generation=generation
+            )
+            if entry is not None:
+                return entry
+
+        # Query vector store (filters are pushed down to the store)
+        results = self._vector_store.query(
+            query_embedding, top_k=self._candidate_count(top_k), filters=filters
+        )
+        sorted_results = self._rank(query_text, results, top_k, filters)
+
+        if semantic_cache is None:
+            return SemanticCacheEntry(
+                query=query_text, top_k=top_k, generation=generation, results=sorted_results
+            )
+        return semantic_cache.store(
+            query_embedding,
+            query=query_text,
+            top_k=top_k,
+            results=sorted_results,
+            generation=generation,
+        )
+
+    def retrieve_many(
+        self,
+        queries: list[str],
+        *,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[list[ScoredDocumentChunk]]:
+        """
+        Retrieve relevant document chunks for several queries at once.
+
+        All queries are embedded in one batch and searched with one batched
+        vector store query, so per-query model and round-trip overhead is
+        paid once.
+
+        Args:
+            queries: Query strings to search for
+            top_k: Maximum number of results per query
+            filters: Optional metadata conditions every result must satisfy
 
-        return sorted_results
+        Returns:
+            One list of scored chunks per query, in input order, each
+            sorted by score ascending (lower=better)
+
+        Raises:
+            ValueError: If any query is empty or top_k <= 0
+        """
+        # Validate inputs
+        if any(not query_text.strip() for query_text in queries):
+            raise ValueError("Query text cannot be empty")
+
+        if top_k <= 0:
+            raise ValueError("top_k must be greater than 0")
+
+        if not queries:
+            return []
+
+        # Embed all queries in one call, then search in one call
+        filters = _active(filters)
+        query_embeddings = self._embedder.embed_batch(list(queries))
+        if self.semantic_cache is None or filters is not None:
+            results = self._vector_store.query_many(
+                query_embeddings, top_k=self._candidate_count(top_k), filters=filters
+            )
+            return [
+                self._rank(query_text, query_results, top_k, filters)
+                for query_text, query_results in zip(queries, results)
+            ]
+
+        # Serve similar earlier queries from the cache; search only the rest
+        generation = self._current_generation()
+        cached = [
+            self.semantic_cache.lookup(embedding, top_k=top_k, generation=generation)
+            for embedding in query_embeddings
+        ]
+        answers = [entry.results[:top_k] if entry else None for entry in cached]
+        missing = [i for i, entry in enumerate(cached) if entry is None]
+        if missing:
+            searched = self._vector_store.query_many(
+                query_embeddings.array[missing], top_k=self._candidate_count(top_k)
+            )
+            for i, query_results in zip(missing, searched):
+                answers[i] = self._rank(queries[i], query_results, top_k)
+                self.semantic_cache.store(
+                    query_embeddings.row(i),
+                    query=queries[i],
+                    top_k=top_k,
+                    results=answers[i],
+                    generation=generation,
+                )
+        return answers
 
     def retrieve_with_context(
         self,
@@ -65,6 +280,7 @@ class RetrievalService:
         *,
         top_k: int = 5,
         max_chars: int = 8000,
+        filters: MetadataFilter | None = None,
     ) -> tuple[list[ScoredDocumentChunk], str]:
         """
         Retrieve relevant chunks and build context string.
@@ -73,6 +289,7 @@ class RetrievalService:
             query_text: Query string to search for
             top_k: Maximum number of results to return
             max_chars: Maximum characters in context string
+            filters: Optional metadata conditions every result must satisfy
 
         Returns:
             Tuple of (scored chunks, context string)
@@ -81,10 +298,81 @@ class RetrievalService:
             ValueError: If query_text is empty or top_k <= 0
         """
         # Retrieve chunks
-        results = self.retrieve(query_text, top_k=top_k)
+        results = self.retrieve(query_text, top_k=top_k, filters=filters)
 
         # Build context string
-        context_builder = ContextBuilder()
-        context = context_builder.build(results, max_chars=max_chars)
+        context = self.context_builder.build(results, max_chars=max_chars, query=query_text)
 
         return (results, context)
+
+    def retrieve_many_with_context(
+        self,
+        queries: list[str],
+        *,
+        top_k: int = 5,
+        max_chars: int = 8000,
+        filters: MetadataFilter | None = None,
+    ) -> list[tuple[list[ScoredDocumentChunk], str]]:
+        """
+        Batched retrieve_with_context().
+
+        Args:
+            queries: Query strings to search for
+            top_k: Maximum number of results per query
+            max_chars: Maximum characters in each context string
+            filters: Optional metadata conditions every result must satisfy
+
+        Returns:
+            One (scored chunks, context string) tuple per query, in input order
+
+        Raises:
+            ValueError: If any query is empty or top_k <= 0
+        """
+        return [
+            (results, self.context_builder.build(results, max_chars=max_chars, query=query))
+            for query, results in zip(
+                queries, self.retrieve_many(queries, top_k=top_k, filters=filters)
+            )
+        ]
+
+    def _candidate_count(self, top_k: int) -> int:
+        """Results to fetch per retriever: extra candidates for fusion and reranking."""
+        count = top_k
+        if self._reranker is not None:
+            count = max(count, self._rerank_candidates)
+        if self._retrieval_mode == "hybrid":
+            count = max(count, self._fusion_candidates)
+        return count
+
+    def _rank(
+        self,
+        query_text: str,
+        results: list[ScoredDocumentChunk],
+        top_k: int,
+        filters: MetadataFilter | None = None,
+    ) -> list[ScoredDocumentChunk]:
+        """Sort store results, fuse with BM25 and rerank as configured; cut to top_k."""
+        # Sort by score ascending (distance: lower is better)
+        # Defensive sorting even if store returns sorted results
+        ranked = sorted(results, key=lambda x: x.score)
+
+        if self._retrieval_mode == "hybrid":
+            lexical = self._lexical_index.search(
+                query_text, top_k=self._candidate_count(top_k), filters=filters
+            )
+            ranked = reciprocal_rank_fusion([ranked, lexical], k=self._rrf_k)
+
+        if self._reranker is not None:
+            # Fusion can return up to twice the per-retriever candidates;
+            # the reranker scores no more than rerank_candidates of them
+            candidates = ranked[:max(top_k, self._rerank_candidates)]
+            return self._reranker.rerank(query_text, candidates, top_k=top_k)
+        return ranked[:top_k]
+
+    def _current_generation(self) -> int:
+        return self._generation.current() if self._generation is not None else 0
+
+
+def _active(filters: MetadataFilter | None) -> MetadataFilter | None:
+    """filters, or None when it has no conditions."""
+    return filters if filters is not None and not filters.is_empty else None
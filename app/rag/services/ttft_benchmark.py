@@ -0,0 +1,137 @@
+"""Time-to-first-token benchmark for prompt-prefix reuse.
+
+Run against a local Ollama server to compare the default prompt layout
+with the cache-friendly one (stable chunk order, model kept loaded):
+
+    python -m app.rag.services.ttft_benchmark --model llama2 --runs 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+from typing import List, Sequence
+
+from app.rag.llm.interfaces.llm_interface import LLMInterface
+from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+from app.rag.models.evaluation import TTFTReport
+from app.rag.prompts.prompt_builder import PromptBuilder
+from app.rag.services.context_builder import ContextBuilder
+
+
+def measure_ttft(
+    llm: LLMInterface,
+    prompts: Sequence[str],
+    *,
+    label: str = "",
+) -> TTFTReport:
+    """
+    Measure time until the first streamed fragment for each prompt, in order.
+
+    Prompts run sequentially so every call can reuse the server state left
+    by the previous one; the stream is closed after the first fragment.
+
+    Args:
+        llm: Provider under test
+        prompts: Prompts sent one after another
+        label: Free-form description of the configuration
+
+    Returns:
+        TTFTReport with mean, median and maximum latency
+
+    Raises:
+        ValueError: If prompts is empty
+    """
+    if not prompts:
+        raise ValueError("At least one prompt is required")
+
+    latencies: List[float] = []
+    for prompt in prompts:
+        started = time.perf_counter()
+        stream = llm.generate_stream(prompt)
+        try:
+            next(stream, None)
+        finally:
+            stream.close()
+        latencies.append(1000.0 * (time.perf_counter() - started))
+
+    return TTFTReport(
+        label=label,
+        runs=len(latencies),
+        mean_ms=statistics.fmean(latencies),
+        p50_ms=statistics.median(latencies),
+        max_ms=max(latencies),
+    )
+
+
+def benchmark_prompts(
+    builder: ContextBuilder,
+    runs: int,
+    *,
+    chunks: int = 6,
+    seed: int = 0,
+) -> List[str]:
+    """
+    Prompts for consecutive questions retrieving the same chunks in varying rank order.
+
+    Args:
+        builder: Context builder under test
+        runs: Number of prompts
+        chunks: Chunks retrieved per question
+        seed: Seed of the rank shuffling
+
+    Returns:
+        One prompt per question
+    """
+    rng = random.Random(seed)
+    retrieved = [
+        ScoredDocumentChunk(
+            chunk=DocumentChunk(
+                id=f"manual::chunk:{i}",
+                document_id="manual",
+                content=f"Section {i}. " + " ".join(f"fact-{i}-{j}" for j in range(60)),
+                index=i,
+            ),
+            score=0.0,
+        )
+        for i in range(chunks)
+    ]
+
+    prompts = []
+    for run in range(runs):
+        rng.shuffle(retrieved)
+        context = builder.build(retrieved, max_chars=100_000)
+        prompts.append(PromptBuilder.build(context=context, query=f"What is fact-{run % chunks}-1?"))
+    return prompts
+
+
+def main() -> None:
+    from app.rag.llm.providers.ollama_provider import OllamaProvider
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:11434")
+    parser.add_argument("--model", default="llama2")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--keep-alive", default="30m")
+    args = parser.parse_args()
+
+    configurations = [
+        ("rank order", ContextBuilder(), OllamaProvider(args.base_url, args.model)),
+        (
+            "stable order + keep_alive",
+            ContextBuilder(stable_order=True),
+            OllamaProvider(args.base_url, args.model, keep_alive=args.keep_alive),
+        ),
+    ]
+    for label, builder, llm in configurations:
+        report = measure_ttft(llm, benchmark_prompts(builder, args.runs), label=label)
+        print(
+            f"{report.label:28} runs={report.runs} mean={report.mean_ms:.0f}ms "
+            f"p50={report.p50_ms:.0f}ms max={report.max_ms:.0f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,13 @@ from typing import TYPE_CHECKING
 
 from app.rag.interfaces.vector_store import VectorStoreInterface
 from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
-from app.rag.models.embeddings import EmbeddingVector
+from app.rag.models.embeddings import (
+    EmbeddingLike,
+    EmbeddingsLike,
+    as_array,
+    as_vector,
+)
+from app.rag.models.filters import MetadataFilter
 
 if TYPE_CHECKING:
     import chromadb
@@ -16,6 +22,9 @@ if TYPE_CHECKING:
 class ChromaVectorStore(VectorStoreInterface):
     """Vector store implementation using ChromaDB."""
 
+    # Max IDs per metadata-filtered delete/get call
+    DELETE_BATCH_SIZE = 500
+
     def __init__(
         self,
         collection_name: str,
@@ -50,7 +59,7 @@ class ChromaVectorStore(VectorStoreInterface):
     def add_chunks(
         self,
         chunks: list[DocumentChunk],
-        embeddings: list[EmbeddingVector],
+        embeddings: EmbeddingsLike,
     ) -> None:
         """Add document chunks with embeddings to vector store."""
         if not chunks:
@@ -68,7 +77,7 @@ class ChromaVectorStore(VectorStoreInterface):
             )
 
         ids = [chunk.id for chunk in chunks]
-        embedding_vectors = [emb.vector for emb in embeddings]
+        embedding_vectors = as_array(embeddings).tolist()
         documents = [chunk.content for chunk in chunks]
         # TODO: Metadata must be JSON-serializable (str, int, float, bool, None)
         # Non-primitive types will cause ChromaDB serialization errors
@@ -90,20 +99,36 @@ class ChromaVectorStore(VectorStoreInterface):
 
     def query(
         self,
-        embedding: EmbeddingVector,
+        embedding: EmbeddingLike,
         top_k: int = 5,
+        filters: MetadataFilter | None = None,
     ) -> list[ScoredDocumentChunk]:
-        """Query vector store for similar chunks."""
+        """Query vector store for similar chunks matching filters."""
+        return self.query_many([as_vector(embedding)], top_k=top_k, filters=filters)[0]
+
+    def query_many(
+        self,
+        embeddings: EmbeddingsLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[list[ScoredDocumentChunk]]:
+        """Query vector store for several embeddings in one Chroma call."""
         # Guard: fail-fast if collection not initialized
         if self._collection is None:
             raise RuntimeError(
                 "ChromaDB collection not initialized. Call _initialize_client() first."
             )
 
-        # Query ChromaDB
+        if len(embeddings) == 0:
+            return []
+
+        # Query ChromaDB (one round-trip for all query embeddings); filters
+        # are evaluated by Chroma itself through the `where` clause
+        where = self._metadata_filter(filters)
         results = self._collection.query(
-            query_embeddings=[embedding.vector],
+            query_embeddings=as_array(embeddings).tolist(),
             n_results=top_k,
+            **({"where": where} if where else {}),
         )
 
         # Guard: ensure expected fields are present
@@ -114,24 +139,35 @@ class ChromaVectorStore(VectorStoreInterface):
                     f"Chroma query did not return expected fields. Missing: {field}"
                 )
 
-        # Convert ChromaDB results to ScoredDocumentChunk
-        scored_chunks = []
-
-        # ChromaDB returns results in this structure:
+        # ChromaDB returns one inner list per query embedding:
         # results = {
-        #     'ids': [['id1', 'id2', ...]],
-        #     'distances': [[0.1, 0.2, ...]],
-        #     'documents': [['doc1', 'doc2', ...]],
-        #     'metadatas': [[{...}, {...}, ...]],
+        #     'ids': [['id1', 'id2', ...], ...],
+        #     'distances': [[0.1, 0.2, ...], ...],
+        #     'documents': [['doc1', 'doc2', ...], ...],
+        #     'metadatas': [[{...}, {...}, ...], ...],
         # }
+        if not results["ids"]:
+            return [[] for _ in range(len(embeddings))]
 
-        if not results["ids"] or not results["ids"][0]:
-            return []
+        return [
+            self._to_scored_chunks(
+                results["ids"][i],
+                results["distances"][i],
+                results["documents"][i],
+                results["metadatas"][i],
+            )
+            for i in range(len(results["ids"]))
+        ]
 
-        ids = results["ids"][0]
-        distances = results["distances"][0]
-        documents = results["documents"][0]
-        metadatas = results["metadatas"][0]
+    @staticmethod
+    def _to_scored_chunks(
+        ids: list[str],
+        distances: list[float],
+        documents: list[str],
+        metadatas: list[dict],
+    ) -> list[ScoredDocumentChunk]:
+        """Convert one query's ChromaDB results to ScoredDocumentChunk."""
+        scored_chunks = []
 
         for i in range(len(ids)):
             # Extract metadata and pop reserved keys
@@ -156,5 +192,99 @@ class ChromaVectorStore(VectorStoreInterface):
 
     def delete_by_document_ids(self, document_ids: list[str]) -> None:
         """Delete all chunks belonging to specified documents."""
-        # TODO (F3): Implement deletion (optional for initial F3)
-        raise NotImplementedError
\ No newline at end of file
+        if not document_ids:
+            return
+
+        # Guard: fail-fast if collection not initialized
+        if self._collection is None:
+            raise RuntimeError(
+                "ChromaDB collection not initialized. Call _initialize_client() first."
+            )
+
+        # One metadata-filtered delete per batch instead of one call per ID
+        for batch in self._batches(list(dict.fromkeys(document_ids))):
+            self._collection.delete(where=self._document_filter(batch))
+
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Delete chunks by their IDs."""
+        if not chunk_ids:
+            return
+
+        # Guard: fail-fast if collection not initialized
+        if self._collection is None:
+            raise RuntimeError(
+                "ChromaDB collection not initialized. Call _initialize_client() first."
+            )
+
+        for batch in self._batches(list(chunk_ids)):
+            self._collection.delete(ids=batch)
+
+    def replace_documents(
+        self,
+        document_ids: list[str],
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+    ) -> None:
+        """
+        Replace all chunks of the given documents in one pass.
+
+        Only chunks that are not part of the new set are deleted; the new
+        chunks are upserted, so surviving chunk IDs are never missing from
+        the collection in between.
+        """
+        # Guard: fail-fast if collection not initialized
+        if self._collection is None:
+            raise RuntimeError(
+                "ChromaDB collection not initialized. Call _initialize_client() first."
+            )
+
+        new_ids = {chunk.id for chunk in chunks}
+        stale_ids: list[str] = []
+        for batch in self._batches(list(dict.fromkeys(document_ids))):
+            existing = self._collection.get(where=self._document_filter(batch), include=[])
+            stale_ids.extend(
+                chunk_id for chunk_id in existing["ids"] if chunk_id not in new_ids
+            )
+
+        self.delete_chunks(stale_ids)
+        self.add_chunks(chunks, embeddings)
+
+    def _batches(self, items: list[str]) -> list[list[str]]:
+        """Split items into lists of at most DELETE_BATCH_SIZE."""
+        size = self.DELETE_BATCH_SIZE
+        return [items[start:start + size] for start in range(0, len(items), size)]
+
+    @staticmethod
+    def _document_filter(document_ids: list[str]) -> dict:
+        """
+        Build a Chroma `where` clause matching any of the document IDs.
+
+        Uses `$or` of equalities rather than `$in`, which the pre-0.4 client
+        used for duckdb+parquet persistence does not support.
+        """
+        if len(document_ids) == 1:
+            return {"document_id": document_ids[0]}
+        return {"$or": [{"document_id": document_id} for document_id in document_ids]}
+
+    @staticmethod
+    def _metadata_filter(filters: MetadataFilter | None) -> dict | None:
+        """Translate a MetadataFilter into a Chroma `where` clause (None if empty)."""
+        if filters is None:
+            return None
+
+        conditions = [{field: {"$eq": value}} for field, value in filters.equals.items()]
+        # $or of equalities: the pre-0.4 client does not support $in
+        for field, values in filters.any_of.items():
+            alternatives = [{field: {"$eq": value}} for value in values]
+            conditions.append(alternatives[0] if len(alternatives) == 1 else {"$or": alternatives})
+        conditions.extend(
+            {field: {f"${operator}": bound}}
+            for field, bounds in filters.ranges.items()
+            for operator, bound in bounds.bounds()
+        )
+
+        if not conditions:
+            return None
+        if len(conditions) == 1:
+            return conditions[0]
+        return {"$and": conditions}
@@ -0,0 +1,71 @@
+"""Vector store construction from RAG settings."""
+
+from __future__ import annotations
+
+from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.models.settings import RAGSettings
+
+
+def build_vector_store(settings: RAGSettings) -> VectorStoreInterface:
+    """
+    Build the vector store selected by `settings.vector_store_backend`.
+
+    Backends are imported lazily so unused ones add no startup cost.
+
+    Raises:
+        ValueError: If the backend is unknown
+    """
+    backend = settings.vector_store_backend
+
+    if backend == "chroma":
+        from app.rag.vectorstores.chroma import ChromaVectorStore
+
+        return ChromaVectorStore(
+            collection_name=settings.chroma_collection_name,
+            persist_directory=settings.chroma_persist_dir,
+        )
+
+    if backend == "numpy":
+        from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+        return NumpyVectorStore()
+
+    if backend == "mmap":
+        from app.rag.vectorstores.mmap_store import MmapVectorStore
+
+        return MmapVectorStore(directory=settings.mmap_index_dir)
+
+    if backend == "ivf":
+        from app.rag.vectorstores.ivf_store import IVFVectorStore
+
+        index_dir = settings.ivf_index_dir
+        if index_dir and IVFVectorStore.saved_index_exists(index_dir):
+            return IVFVectorStore.load(index_dir, nprobe=settings.ivf_nprobe)
+        return IVFVectorStore(
+            nlist=settings.ivf_nlist,
+            nprobe=settings.ivf_nprobe,
+            min_train_size=settings.ivf_min_train_size,
+        )
+
+    if backend == "quantized":
+        from app.rag.vectorstores.quantized_store import QuantizedVectorStore
+
+        if settings.quantization == "int8":
+            from app.rag.quantization.scalar import ScalarQuantizer
+
+            quantizer = ScalarQuantizer()
+        elif settings.quantization == "pq":
+            from app.rag.quantization.product import ProductQuantizer
+
+            quantizer = ProductQuantizer(m=settings.pq_subvectors)
+        else:
+            raise ValueError(f"Unknown quantization: {settings.quantization}")
+
+        return QuantizedVectorStore(
+            quantizer=quantizer,
+            train_size=settings.quantization_train_size,
+            full_precision_path=settings.quantization_full_precision_path,
+            rerank_factor=settings.quantization_rerank_factor,
+        )
+
+    raise ValueError(f"Unknown vector store backend: {backend}")
@@ -0,0 +1,66 @@
+"""NumPy helpers shared by the in-process vector store backends.
+
+All in-process backends store L2-normalized float32 rows and report
+squared Euclidean distance between normalized vectors (2 - 2 * cosine),
+which matches Chroma's default "l2" space for normalized embeddings:
+lower is better, 0.0 is identical.
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of matrix with unit-length rows (zero rows kept)."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[np.newaxis, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def similarity_to_distance(similarities: np.ndarray) -> np.ndarray:
+    """Convert cosine similarities of unit vectors to squared L2 distances."""
+    return np.maximum(2.0 - 2.0 * similarities, 0.0)
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest scores, best first.
+
+    Uses argpartition (O(n)) and only sorts the k winners. Entries set to
+    -inf (tombstones, filtered rows) are never returned.
+    """
+    valid = int(np.count_nonzero(np.isfinite(scores)))
+    k = min(k, valid)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k < scores.shape[0]:
+        candidates = np.argpartition(-scores, k - 1)[:k]
+    else:
+        candidates = np.arange(scores.shape[0])
+    order = np.argsort(-scores[candidates], kind="stable")
+    return candidates[order][:k]
+
+
+def top_k_indices_batch(scores: np.ndarray, k: int) -> List[np.ndarray]:
+    """Row-wise top_k_indices for a (queries x rows) score matrix."""
+    if scores.shape[1] == 0:
+        return [np.empty(0, dtype=np.int64) for _ in range(scores.shape[0])]
+
+    k_eff = min(k, scores.shape[1])
+    if k_eff < scores.shape[1]:
+        candidates = np.argpartition(-scores, k_eff - 1, axis=1)[:, :k_eff]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (scores.shape[0], 1))
+
+    results = []
+    for row, row_candidates in zip(scores, candidates):
+        row_candidates = row_candidates[np.isfinite(row[row_candidates])]
+        order = np.argsort(-row[row_candidates], kind="stable")
+        results.append(row_candidates[order])
+    return results
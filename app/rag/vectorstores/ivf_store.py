@@ -0,0 +1,347 @@
+"""IVF (inverted file) approximate nearest-neighbour vector store."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+from app.rag.models.embeddings import (
+    EmbeddingLike,
+    EmbeddingsLike,
+    as_array,
+)
+from app.rag.models.filters import MetadataFilter
+from app.rag.vectorstores.flat_search import normalize_rows, top_k_indices
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+from app.rag.vectorstores.versions import (
+    create_version,
+    current_version,
+    publish_version,
+    sync_file,
+)
+
+# Rows per block when assigning vectors to centroids (bounds temp memory)
+_ASSIGN_BLOCK = 8192
+
+
+def assign_to_centroids(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the most similar centroid for every row of vectors."""
+    assignments = np.empty(vectors.shape[0], dtype=np.int32)
+    for start in range(0, vectors.shape[0], _ASSIGN_BLOCK):
+        block = vectors[start:start + _ASSIGN_BLOCK]
+        assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assignments
+
+
+def spherical_kmeans(
+    vectors: np.ndarray,
+    k: int,
+    iterations: int = 20,
+    seed: int = 0,
+) -> np.ndarray:
+    """
+    Cluster unit vectors into k unit-length centroids (cosine k-means).
+
+    Args:
+        vectors: (n, dim) normalized float32 training vectors
+        k: Number of centroids (clamped to n)
+        iterations: Lloyd iterations
+        seed: Random seed for initialization and empty-cluster reseeding
+
+    Returns:
+        (k, dim) float32 centroid matrix
+    """
+    rng = np.random.default_rng(seed)
+    k = min(k, vectors.shape[0])
+    centroids = vectors[rng.choice(vectors.shape[0], size=k, replace=False)].copy()
+
+    for _ in range(iterations):
+        assignments = assign_to_centroids(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, vectors)
+        counts = np.bincount(assignments, minlength=k)
+
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            sums[empty] = vectors[rng.choice(vectors.shape[0], size=len(empty))]
+
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+class IVFVectorStore(NumpyVectorStore):
+    """Approximate search over an inverted file of k-means clusters.
+
+    Vectors are grouped by their nearest of `nlist` centroids. A query only
+    scores the vectors in its `nprobe` closest lists, trading recall for
+    latency (raise nprobe for recall, lower it for speed). Until
+    `min_train_size` live vectors exist the store answers exactly; the
+    coarse quantizer is then trained once and new vectors are assigned
+    incrementally. Call `train()` to retrain after heavy drift.
+
+    With a metadata filter, probed lists are restricted to matching rows;
+    when fewer rows match than the probed lists hold, the matching rows are
+    scanned exactly instead, so selective filters never starve top_k.
+
+    `save()` writes a new version directory and then switches the CURRENT
+    pointer to it (see versions.py), so a crash or a concurrent `load()`
+    never sees centroids and chunks from different saves.
+    """
+
+    CONFIG_FILE = "ivf.json"
+    ARRAYS_FILE = "ivf.npz"
+    CHUNKS_FILE = "chunks.jsonl"
+
+    def __init__(
+        self,
+        nlist: int = 1024,
+        nprobe: int = 16,
+        min_train_size: int | None = None,
+        kmeans_iterations: int = 20,
+        seed: int = 0,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+    ) -> None:
+        """
+        Initialize an empty, untrained index.
+
+        Args:
+            nlist: Number of coarse clusters (inverted lists)
+            nprobe: Number of lists scanned per query
+            min_train_size: Live vectors required before training (default 39 * nlist)
+            kmeans_iterations: Lloyd iterations when training
+            seed: Random seed for training
+            initial_capacity: Initial matrix capacity
+            compaction_ratio: Tombstone ratio triggering compaction
+        """
+        if nlist <= 0:
+            raise ValueError("nlist must be greater than 0")
+        super().__init__(initial_capacity=initial_capacity, compaction_ratio=compaction_ratio)
+
+        self._nlist = nlist
+        self.nprobe = nprobe
+        self._min_train_size = min_train_size if min_train_size is not None else 39 * nlist
+        self._kmeans_iterations = kmeans_iterations
+        self._seed = seed
+
+        self._centroids: np.ndarray | None = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+        self._lists: List[np.ndarray] = []
+
+    @property
+    def nprobe(self) -> int:
+        """Number of inverted lists scanned per query."""
+        return self._nprobe
+
+    @nprobe.setter
+    def nprobe(self, value: int) -> None:
+        if value <= 0:
+            raise ValueError("nprobe must be greater than 0")
+        self._nprobe = value
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the coarse quantizer has been trained."""
+        return self._centroids is not None
+
+    def train(self, sample_size: int | None = None) -> None:
+        """
+        Train (or retrain) the coarse quantizer on live vectors and reassign all rows.
+
+        Args:
+            sample_size: Training sample size (default 256 * nlist, capped at live rows)
+        """
+        with self._lock:
+            live = np.flatnonzero(self._alive[:self._size])
+            if len(live) == 0:
+                raise ValueError("Cannot train an empty index")
+
+            sample_size = min(sample_size or 256 * self._nlist, len(live))
+            rng = np.random.default_rng(self._seed)
+            sample = self._matrix[rng.choice(live, size=sample_size, replace=False)]
+
+            self._centroids = spherical_kmeans(
+                sample, self._nlist, iterations=self._kmeans_iterations, seed=self._seed
+            )
+            self._assignments = np.zeros(self._matrix.shape[0], dtype=np.int32)
+            self._assignments[:self._size] = assign_to_centroids(
+                self._matrix[:self._size], self._centroids
+            )
+            self._rebuild_lists()
+
+    def query(
+        self,
+        embedding: EmbeddingLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[ScoredDocumentChunk]:
+        """Return approximately the top_k nearest chunks matching filters."""
+        return self.query_many([embedding], top_k=top_k, filters=filters)[0]
+
+    def query_many(
+        self,
+        embeddings: EmbeddingsLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[list[ScoredDocumentChunk]]:
+        """Answer several queries; centroid scoring is one matrix product."""
+        if len(embeddings) == 0:
+            return []
+
+        with self._lock:
+            if not self.is_trained:
+                return super().query_many(embeddings, top_k=top_k, filters=filters)
+
+            if self.count() == 0:
+                return [[] for _ in embeddings]
+
+            queries = normalize_rows(as_array(embeddings))
+            nprobe = min(self._nprobe, self._centroids.shape[0])
+            probes = np.argpartition(-(queries @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+
+            live = self._live_rows(filters)
+            matching = None if filters is None or filters.is_empty else np.flatnonzero(live)
+
+            results = []
+            for query, probe in zip(queries, probes):
+                candidates = np.concatenate([self._lists[list_id] for list_id in probe])
+                if matching is not None and len(matching) <= len(candidates):
+                    # Selective filter: scanning the matches is cheaper and exact
+                    candidates = matching
+                else:
+                    candidates = candidates[live[candidates]]
+                similarities = self._matrix[candidates] @ query
+                best = top_k_indices(similarities, top_k)
+                results.append(self._to_results(candidates[best], similarities[best]))
+            return results
+
+    def save(self, directory: str) -> None:
+        """Persist vectors, chunks and the trained quantizer as a new version in directory."""
+        with self._lock:
+            self.compact()
+            path = create_version(Path(directory))
+
+            arrays = {
+                "vectors": self._matrix[:self._size] if self._matrix is not None else np.zeros((0, 0), np.float32),
+                "assignments": self._assignments[:self._size],
+            }
+            if self._centroids is not None:
+                arrays["centroids"] = self._centroids
+            np.savez(path / self.ARRAYS_FILE, **arrays)
+
+            with open(path / self.CHUNKS_FILE, "w", encoding="utf-8") as handle:
+                for chunk in self._chunks[:self._size]:
+                    handle.write(json.dumps({
+                        "id": chunk.id,
+                        "document_id": chunk.document_id,
+                        "content": chunk.content,
+                        "index": chunk.index,
+                        "metadata": dict(chunk.metadata),
+                    }) + "\n")
+
+            config = {
+                "nlist": self._nlist,
+                "nprobe": self._nprobe,
+                "min_train_size": self._min_train_size,
+                "kmeans_iterations": self._kmeans_iterations,
+                "seed": self._seed,
+            }
+            (path / self.CONFIG_FILE).write_text(json.dumps(config), encoding="utf-8")
+
+            for name in (self.ARRAYS_FILE, self.CHUNKS_FILE, self.CONFIG_FILE):
+                sync_file(path / name)
+            publish_version(Path(directory), path.name)
+
+    @classmethod
+    def saved_index_exists(cls, directory: str) -> bool:
+        """Whether directory holds an index written by save()."""
+        path = Path(directory)
+        return current_version(path) is not None or (path / cls.CONFIG_FILE).exists()
+
+    @classmethod
+    def load(cls, directory: str, nprobe: int | None = None) -> IVFVectorStore:
+        """Load an index written by save(); nprobe overrides the saved value."""
+        path = Path(directory)
+        # Unversioned indexes (saved before versioning) keep files in directory
+        version = current_version(path)
+        if version is not None:
+            path = path / version
+        config = json.loads((path / cls.CONFIG_FILE).read_text(encoding="utf-8"))
+        if nprobe is not None:
+            config["nprobe"] = nprobe
+        store = cls(**config)
+
+        with np.load(path / cls.ARRAYS_FILE) as arrays:
+            vectors = arrays["vectors"]
+            assignments = arrays["assignments"]
+            centroids = arrays["centroids"] if "centroids" in arrays else None
+
+        with open(path / cls.CHUNKS_FILE, encoding="utf-8") as handle:
+            chunks = [DocumentChunk(**json.loads(line)) for line in handle if line.strip()]
+
+        with store._lock:
+            if chunks:
+                store._ensure_capacity(len(chunks), vectors.shape[1])
+                store._matrix[:len(chunks)] = vectors
+                store._alive[:len(chunks)] = True
+                store._chunks = chunks
+                store._size = len(chunks)
+                for row, chunk in enumerate(chunks):
+                    store._row_by_id[chunk.id] = row
+                    store._rows_by_document.setdefault(chunk.document_id, set()).add(row)
+                    store._metadata.add(row, chunk)
+
+            if centroids is not None:
+                store._centroids = centroids
+                store._assignments = np.zeros(store._matrix.shape[0], dtype=np.int32)
+                store._assignments[:store._size] = assignments
+                store._rebuild_lists()
+
+        return store
+
+    def _on_rows_added(self, start: int, end: int) -> None:
+        """Assign new rows to lists, or train once enough vectors exist (lock held)."""
+        if not self.is_trained:
+            if self.count() >= self._min_train_size:
+                self.train()
+            return
+
+        if len(self._assignments) < self._matrix.shape[0]:
+            grown = np.zeros(self._matrix.shape[0], dtype=np.int32)
+            grown[:len(self._assignments)] = self._assignments
+            self._assignments = grown
+
+        new_assignments = assign_to_centroids(self._matrix[start:end], self._centroids)
+        self._assignments[start:end] = new_assignments
+
+        rows = np.arange(start, end)
+        for list_id in np.unique(new_assignments):
+            self._lists[list_id] = np.concatenate(
+                [self._lists[list_id], rows[new_assignments == list_id]]
+            )
+
+    def _on_compacted(self, kept_rows: np.ndarray) -> None:
+        """Renumber list members after compaction (lock held)."""
+        if not self.is_trained:
+            return
+        assignments = np.zeros(self._matrix.shape[0], dtype=np.int32)
+        assignments[:len(kept_rows)] = self._assignments[kept_rows]
+        self._assignments = assignments
+        self._rebuild_lists()
+
+    def _rebuild_lists(self) -> None:
+        """Rebuild inverted lists from the assignment array (lock held)."""
+        assignments = self._assignments[:self._size]
+        order = np.argsort(assignments, kind="stable")
+        boundaries = np.searchsorted(
+            assignments[order], np.arange(self._centroids.shape[0] + 1)
+        )
+        self._lists = [
+            order[boundaries[i]:boundaries[i + 1]].astype(np.int64)
+            for i in range(self._centroids.shape[0])
+        ]
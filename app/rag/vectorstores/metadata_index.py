@@ -0,0 +1,131 @@
+"""Per-field metadata index used to evaluate filters in in-process stores."""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Dict, Mapping, Tuple
+
+import numpy as np
+
+from app.rag.models.documents import DocumentChunk
+from app.rag.models.filters import MetadataFilter, chunk_fields, is_number, value_key
+
+
+class MetadataIndex:
+    """Inverted lists and numeric columns over the metadata of store rows.
+
+    Equality and in-set conditions read the row lists of the requested
+    values (value -> rows, per field); range conditions compare a float64
+    column per field holding NaN for rows without a numeric value. A filter
+    thus costs O(matching rows + rows) array work instead of one Python
+    call per chunk. Rows are only ever appended: deleted rows stay indexed
+    and are excluded by the store's alive mask until `compact()`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._rows = 0
+        self._postings: Dict[str, Dict[Tuple[bool, Any], array]] = {}
+        self._numbers: Dict[str, np.ndarray] = {}
+
+    def add(self, row: int, chunk: DocumentChunk) -> None:
+        """Index the fields of the chunk stored at row (rows arrive in order)."""
+        self.add_fields(row, chunk_fields(chunk))
+
+    def add_fields(self, row: int, fields: Mapping[str, Any]) -> None:
+        """Index already extracted filterable fields (see `chunk_fields`) of row."""
+        for field, value in fields.items():
+            try:
+                key = value_key(value)
+                hash(key)
+            except TypeError:
+                continue  # lists/dicts are not filterable
+            self._postings.setdefault(field, {}).setdefault(key, array("q")).append(row)
+
+            if is_number(value):
+                column = self._numbers.get(field)
+                if column is None or len(column) <= row:
+                    column = self._grow(column, row + 1)
+                    self._numbers[field] = column
+                column[row] = value
+        self._rows = max(self._rows, row + 1)
+
+    def mask(self, filters: MetadataFilter, rows: int) -> np.ndarray:
+        """
+        Boolean mask over the first `rows` rows of those matching filters.
+
+        Args:
+            filters: Conditions to evaluate
+            rows: Number of store rows the mask covers
+
+        Returns:
+            (rows,) bool array, True where every condition holds
+        """
+        mask = np.ones(rows, dtype=bool)
+        for field, expected in filters.equals.items():
+            mask &= self._rows_with(field, [expected], rows)
+        for field, allowed in filters.any_of.items():
+            mask &= self._rows_with(field, allowed, rows)
+        for field, bounds in filters.ranges.items():
+            column = self._column(field, rows)
+            # NaN (missing / non-numeric) fails every comparison
+            with np.errstate(invalid="ignore"):
+                for operator, bound in bounds.bounds():
+                    if operator == "gt":
+                        mask &= column > bound
+                    elif operator == "gte":
+                        mask &= column >= bound
+                    elif operator == "lt":
+                        mask &= column < bound
+                    else:
+                        mask &= column <= bound
+        return mask
+
+    def compact(self, kept_rows: np.ndarray) -> None:
+        """Renumber rows after compaction: old rows `kept_rows` become 0..n-1."""
+        renumber = np.full(self._rows, -1, dtype=np.int64)
+        kept_rows = kept_rows[kept_rows < self._rows]
+        renumber[kept_rows] = np.arange(len(kept_rows))
+
+        postings: Dict[str, Dict[Tuple[bool, Any], array]] = {}
+        for field, values in self._postings.items():
+            for key, rows in values.items():
+                new_rows = renumber[np.frombuffer(rows, dtype=np.int64)]
+                new_rows = new_rows[new_rows >= 0]
+                if len(new_rows):
+                    postings.setdefault(field, {})[key] = array("q", new_rows.tobytes())
+        self._postings = postings
+
+        self._numbers = {
+            field: self._column(field, self._rows)[kept_rows] for field in self._numbers
+        }
+        self._rows = len(kept_rows)
+
+    def _rows_with(self, field: str, values: list, rows: int) -> np.ndarray:
+        """Mask of rows whose field equals any of values."""
+        mask = np.zeros(rows, dtype=bool)
+        postings = self._postings.get(field, {})
+        for value in values:
+            members = postings.get(value_key(value))
+            if members is not None:
+                members = np.frombuffer(members, dtype=np.int64)
+                mask[members[members < rows]] = True
+        return mask
+
+    def _column(self, field: str, rows: int) -> np.ndarray:
+        """Numeric column of field over `rows` rows (NaN where missing)."""
+        column = self._numbers.get(field)
+        if column is None:
+            return np.full(rows, np.nan)
+        if len(column) < rows:
+            column = self._grow(column, rows)
+        return column[:rows]
+
+    @staticmethod
+    def _grow(column: np.ndarray | None, rows: int) -> np.ndarray:
+        """Copy column into a NaN-padded array of at least rows (doubling)."""
+        capacity = max(rows, 2 * len(column) if column is not None else 64)
+        grown = np.full(capacity, np.nan)
+        if column is not None:
+            grown[:len(column)] = column
+        return grown
@@ -0,0 +1,436 @@
+"""Persistent flat vector store backed by memory-mapped float32 files."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+from app.rag.models.embeddings import (
+    EmbeddingLike,
+    EmbeddingsLike,
+    as_array,
+)
+from app.rag.models.filters import MetadataFilter
+from app.rag.vectorstores.flat_search import (
+    normalize_rows,
+    similarity_to_distance,
+    top_k_indices,
+    top_k_indices_batch,
+)
+from app.rag.vectorstores.metadata_index import MetadataIndex
+
+
+class MmapVectorStore(VectorStoreInterface):
+    """Append-only flat index whose vectors live in a memory-mapped file.
+
+    Directory layout:
+        vectors.f32    normalized float32 rows, appended in insert order
+        alive.u8       one byte per row, 0 once the row is deleted/overwritten
+        index.sqlite   sidecar table: row -> chunk ID, document ID, content, metadata,
+                       plus the number of committed rows
+
+    The sidecar is the source of truth. A write appends vector and alive
+    bytes first and then commits its sidecar rows, the overwritten rows'
+    tombstones and the new row count in one transaction; bytes past the
+    committed row count (left by a crash) are ignored and overwritten by
+    the next write, and alive bytes are re-synced from the sidecar on open.
+
+    Opening an index maps the files instead of reading them, so startup is
+    O(1) in index size and all processes opening the same directory share
+    the pages through the OS page cache. Readers pick up rows appended by a
+    writer on their next query. Use a single writer process; compact() must
+    run while no readers are open.
+
+    Metadata filters are evaluated by a MetadataIndex (as in the NumPy
+    store). It is built from the sidecar on the first filtered query, so
+    unfiltered readers never load metadata, and then catches up with rows
+    appended since, including those of other writers.
+    """
+
+    VECTORS_FILE = "vectors.f32"
+    ALIVE_FILE = "alive.u8"
+    SIDECAR_FILE = "index.sqlite"
+
+    # Max IDs per SQL IN (...) clause
+    SQL_BATCH_SIZE = 500
+
+    def __init__(self, directory: str) -> None:
+        """Open (or create) the index stored in directory."""
+        self._directory = Path(directory)
+        self._directory.mkdir(parents=True, exist_ok=True)
+        self._vectors_path = self._directory / self.VECTORS_FILE
+        self._alive_path = self._directory / self.ALIVE_FILE
+        self._lock = threading.RLock()
+
+        self._db = sqlite3.connect(
+            str(self._directory / self.SIDECAR_FILE),
+            check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS chunks (
+                row INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL,
+                document_id TEXT NOT NULL,
+                content TEXT NOT NULL,
+                chunk_index INTEGER NOT NULL,
+                metadata TEXT NOT NULL,
+                alive INTEGER NOT NULL DEFAULT 1
+            );
+            CREATE INDEX IF NOT EXISTS chunks_by_id ON chunks (chunk_id) WHERE alive = 1;
+            CREATE INDEX IF NOT EXISTS chunks_by_document ON chunks (document_id) WHERE alive = 1;
+            """
+        )
+        self._db.commit()
+
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        self._dim: int | None = int(row[0]) if row else None
+
+        self._vectors: np.ndarray | None = None
+        self._alive: np.ndarray | None = None
+        self._rows = 0
+        # Built on the first filtered query; covers rows [0, _indexed_rows)
+        self._metadata_index: MetadataIndex | None = None
+        self._indexed_rows = 0
+        self._refresh()
+        self._sync_alive()
+
+    def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+    ) -> None:
+        """Append chunks; chunks whose ID already exists are overwritten."""
+        if not chunks:
+            return
+
+        if len(chunks) != len(embeddings):
+            raise ValueError(
+                f"Chunks count ({len(chunks)}) must match embeddings count ({len(embeddings)})"
+            )
+
+        # Last occurrence wins for duplicate IDs within one call
+        latest = {chunk.id: position for position, chunk in enumerate(chunks)}
+        keep = sorted(latest.values())
+        chunks = [chunks[position] for position in keep]
+        vectors = normalize_rows(as_array(embeddings))[keep]
+
+        with self._lock:
+            self._refresh()
+            self._check_dim(vectors.shape[1])
+            overwritten = self._rows_for_chunk_ids(list(latest))
+            start = self._committed_rows()
+
+            # Vectors first: until the sidecar commit below they are invisible
+            self._write_tail(self._alive_path, start, np.ones(len(chunks), dtype=np.uint8))
+            self._write_tail(self._vectors_path, start * self._dim * 4, vectors)
+
+            with self._db:
+                self._db.executemany(
+                    "UPDATE chunks SET alive = 0 WHERE row = ?",
+                    [(row,) for row in overwritten],
+                )
+                self._db.executemany(
+                    "INSERT INTO chunks (row, chunk_id, document_id, content, chunk_index, metadata) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            start + offset,
+                            chunk.id,
+                            chunk.document_id,
+                            chunk.content,
+                            chunk.index,
+                            json.dumps(dict(chunk.metadata)),
+                        )
+                        for offset, chunk in enumerate(chunks)
+                    ],
+                )
+                self._set_committed_rows(start + len(chunks))
+
+            self._refresh()
+            self._mark_dead(overwritten)
+
+    def query(
+        self,
+        embedding: EmbeddingLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[ScoredDocumentChunk]:
+        """Return the top_k nearest matching chunks (exact search over the mapping)."""
+        return self.query_many([embedding], top_k=top_k, filters=filters)[0]
+
+    def query_many(
+        self,
+        embeddings: EmbeddingsLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[list[ScoredDocumentChunk]]:
+        """Answer several queries with one matrix-matrix product."""
+        if len(embeddings) == 0:
+            return []
+
+        with self._lock:
+            self._refresh()
+            if self._vectors is None or self._rows == 0:
+                return [[] for _ in embeddings]
+
+            queries = normalize_rows(as_array(embeddings))
+            similarities = queries @ self._vectors.T
+            similarities[:, self._alive == 0] = -np.inf
+            if filters is not None and not filters.is_empty:
+                similarities[:, ~self._filter_index().mask(filters, self._rows)] = -np.inf
+
+            if len(embeddings) == 1:
+                per_query = [top_k_indices(similarities[0], top_k)]
+            else:
+                per_query = top_k_indices_batch(similarities, top_k)
+
+            return [
+                self._to_results(rows, row_similarities[rows])
+                for rows, row_similarities in zip(per_query, similarities)
+            ]
+
+    def delete_by_document_ids(self, document_ids: list[str]) -> None:
+        """Delete all chunks belonging to specified documents."""
+        with self._lock:
+            self._refresh()
+            rows: List[int] = []
+            for batch in self._batches(list(dict.fromkeys(document_ids))):
+                placeholders = ",".join("?" * len(batch))
+                rows.extend(
+                    r[0]
+                    for r in self._db.execute(
+                        f"SELECT row FROM chunks WHERE alive = 1 AND document_id IN ({placeholders})",
+                        batch,
+                    )
+                )
+            self._tombstone_rows(rows)
+
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Delete chunks by their IDs."""
+        with self._lock:
+            self._refresh()
+            self._tombstone_rows(self._rows_for_chunk_ids(chunk_ids))
+
+    def count(self) -> int:
+        """Number of live chunks."""
+        with self._lock:
+            self._refresh()
+            return 0 if self._alive is None else int(np.count_nonzero(self._alive))
+
+    def compact(self) -> None:
+        """
+        Rewrite the index without deleted rows.
+
+        Row numbers change, so this must run while no other process has the
+        index open.
+        """
+        with self._lock:
+            self._refresh()
+            if self._vectors is None:
+                return
+
+            keep = np.flatnonzero(self._alive)
+            if len(keep) == self._rows:
+                return
+
+            vectors_tmp = self._vectors_path.with_suffix(".tmp")
+            alive_tmp = self._alive_path.with_suffix(".tmp")
+            np.ascontiguousarray(self._vectors[keep]).tofile(vectors_tmp)
+            np.ones(len(keep), dtype=np.uint8).tofile(alive_tmp)
+
+            with self._db:
+                self._db.execute("DELETE FROM chunks WHERE alive = 0")
+                self._db.execute("CREATE TEMP TABLE renumber (old INTEGER, new INTEGER)")
+                self._db.executemany(
+                    "INSERT INTO renumber (old, new) VALUES (?, ?)",
+                    [(int(old), new) for new, old in enumerate(keep)],
+                )
+                # Shift out of the way first so new row numbers never collide
+                self._db.execute("UPDATE chunks SET row = -row - 1")
+                self._db.execute(
+                    "UPDATE chunks SET row = (SELECT new FROM renumber WHERE old = -chunks.row - 1)"
+                )
+                self._db.execute("DROP TABLE renumber")
+                self._set_committed_rows(len(keep))
+
+            self._vectors = None
+            self._alive = None
+            self._metadata_index = None  # row numbers changed; rebuilt on demand
+            os.replace(vectors_tmp, self._vectors_path)
+            os.replace(alive_tmp, self._alive_path)
+            self._rows = -1  # force remap
+            self._refresh()
+
+    def close(self) -> None:
+        """Release the mappings and the sidecar connection."""
+        with self._lock:
+            self._vectors = None
+            self._alive = None
+            self._db.close()
+
+    def _refresh(self) -> None:
+        """Remap the files if another writer (or this one) appended rows (lock held)."""
+        if self._dim is None:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+            if row is None:
+                return
+            self._dim = int(row[0])
+
+        if not self._vectors_path.exists() or not self._alive_path.exists():
+            return
+
+        vector_rows = self._vectors_path.stat().st_size // (self._dim * 4)
+        rows = min(vector_rows, self._alive_path.stat().st_size, self._committed_rows())
+        if rows == self._rows:
+            return
+
+        if rows == 0:
+            self._vectors, self._alive, self._rows = None, None, 0
+            return
+
+        self._vectors = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r", shape=(rows, self._dim)
+        )
+        self._alive = np.memmap(self._alive_path, dtype=np.uint8, mode="r+", shape=(rows,))
+        self._rows = rows
+
+    def _filter_index(self) -> MetadataIndex:
+        """Metadata index over the mapped rows, caught up with the sidecar (lock held)."""
+        if self._metadata_index is None or self._indexed_rows > self._rows:
+            self._metadata_index, self._indexed_rows = MetadataIndex(), 0
+
+        if self._indexed_rows < self._rows:
+            records = self._db.execute(
+                "SELECT row, document_id, chunk_index, metadata FROM chunks "
+                "WHERE row >= ? AND row < ? ORDER BY row",
+                (self._indexed_rows, self._rows),
+            )
+            for row, document_id, index, metadata in records:
+                self._metadata_index.add_fields(
+                    row, {"document_id": document_id, "index": index, **json.loads(metadata)}
+                )
+            self._indexed_rows = self._rows
+        return self._metadata_index
+
+    def _check_dim(self, dim: int) -> None:
+        """Record the dimension on first insert, validate it afterwards (lock held)."""
+        if self._dim is None:
+            with self._db:
+                self._db.execute("INSERT INTO meta (key, value) VALUES ('dim', ?)", (str(dim),))
+            self._dim = dim
+        elif dim != self._dim:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match store dimension {self._dim}"
+            )
+
+    def _rows_for_chunk_ids(self, chunk_ids: List[str]) -> List[int]:
+        """Live rows currently holding the given chunk IDs (lock held)."""
+        rows: List[int] = []
+        for batch in self._batches(list(dict.fromkeys(chunk_ids))):
+            placeholders = ",".join("?" * len(batch))
+            rows.extend(
+                r[0]
+                for r in self._db.execute(
+                    f"SELECT row FROM chunks WHERE alive = 1 AND chunk_id IN ({placeholders})",
+                    batch,
+                )
+            )
+        return rows
+
+    def _tombstone_rows(self, rows: List[int]) -> None:
+        """Mark rows deleted in both the alive map and the sidecar (lock held)."""
+        if not rows:
+            return
+
+        with self._db:
+            self._db.executemany(
+                "UPDATE chunks SET alive = 0 WHERE row = ?",
+                [(row,) for row in rows],
+            )
+        self._mark_dead(rows)
+
+    def _mark_dead(self, rows: List[int]) -> None:
+        """Clear the alive bytes of rows already tombstoned in the sidecar (lock held)."""
+        if self._alive is None or not rows:
+            return
+        visible = [row for row in rows if row < self._rows]
+        self._alive[visible] = 0
+        self._alive.flush()
+
+    def _sync_alive(self) -> None:
+        """Clear alive bytes of rows deleted in the sidecar (a crash may have skipped it)."""
+        with self._lock:
+            deleted = self._db.execute("SELECT row FROM chunks WHERE alive = 0")
+            self._mark_dead([r[0] for r in deleted])
+
+    def _committed_rows(self) -> int:
+        """Number of rows whose sidecar records are committed."""
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'rows'").fetchone()
+        if row is not None:
+            return int(row[0])
+        # Index written before the row count was recorded
+        row = self._db.execute("SELECT MAX(row) FROM chunks").fetchone()
+        return 0 if row[0] is None else int(row[0]) + 1
+
+    def _set_committed_rows(self, rows: int) -> None:
+        """Record the committed row count (inside the caller's transaction)."""
+        self._db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('rows', ?)", (str(rows),)
+        )
+
+    @staticmethod
+    def _write_tail(path: Path, offset: int, data: np.ndarray) -> None:
+        """Write data at byte offset, dropping any uncommitted bytes beyond it, and fsync."""
+        with open(path, "ab") as handle:
+            handle.truncate(offset)
+            handle.write(np.ascontiguousarray(data).tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _to_results(
+        self,
+        rows: np.ndarray,
+        similarities: np.ndarray,
+    ) -> list[ScoredDocumentChunk]:
+        """Load chunk data for result rows from the sidecar."""
+        if len(rows) == 0:
+            return []
+
+        placeholders = ",".join("?" * len(rows))
+        records = {
+            record[0]: record
+            for record in self._db.execute(
+                "SELECT row, chunk_id, document_id, content, chunk_index, metadata "
+                f"FROM chunks WHERE row IN ({placeholders})",
+                [int(row) for row in rows],
+            )
+        }
+
+        results = []
+        for row, distance in zip(rows, similarity_to_distance(similarities)):
+            _, chunk_id, document_id, content, index, metadata = records[int(row)]
+            chunk = DocumentChunk(
+                id=chunk_id,
+                document_id=document_id,
+                content=content,
+                index=index,
+                metadata=json.loads(metadata),
+            )
+            results.append(ScoredDocumentChunk(chunk=chunk, score=float(distance)))
+        return results
+
+    def _batches(self, items: List[str]) -> List[List[str]]:
+        """Split items into lists of at most SQL_BATCH_SIZE."""
+        size = self.SQL_BATCH_SIZE
+        return [items[start:start + size] for start in range(0, len(items), size)]
@@ -0,0 +1,272 @@
+"""Pure-NumPy in-memory vector store with exact top-k search."""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, List, Set
+
+import numpy as np
+
+from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+from app.rag.models.embeddings import (
+    EmbeddingLike,
+    EmbeddingsLike,
+    as_array,
+    as_vector,
+)
+from app.rag.models.filters import MetadataFilter
+from app.rag.vectorstores.flat_search import (
+    normalize_rows,
+    similarity_to_distance,
+    top_k_indices,
+    top_k_indices_batch,
+)
+from app.rag.vectorstores.metadata_index import MetadataIndex
+
+
+class NumpyVectorStore(VectorStoreInterface):
+    """Vector store keeping all embeddings in one contiguous float32 matrix.
+
+    Rows are normalized once at insert, so a query is a single
+    matrix-vector product plus argpartition. Deletes and overwrites only
+    tombstone rows; the matrix is compacted once tombstones exceed
+    `compaction_ratio` of the stored rows. Scores are squared L2 distances
+    between normalized vectors (see flat_search). Metadata filters are
+    answered from a per-field MetadataIndex and applied as a row mask
+    before top-k selection.
+    """
+
+    def __init__(
+        self,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+    ) -> None:
+        """Initialize an empty store."""
+        if initial_capacity <= 0:
+            raise ValueError("initial_capacity must be greater than 0")
+        if not 0.0 < compaction_ratio <= 1.0:
+            raise ValueError("compaction_ratio must be in (0, 1]")
+
+        self._initial_capacity = initial_capacity
+        self._compaction_ratio = compaction_ratio
+        self._lock = threading.RLock()
+
+        self._matrix: np.ndarray | None = None  # allocated on first insert
+        self._alive = np.zeros(0, dtype=bool)
+        self._size = 0
+        self._tombstones = 0
+        self._chunks: List[DocumentChunk | None] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._rows_by_document: Dict[str, Set[int]] = {}
+        self._metadata = MetadataIndex()
+
+    def add_chunks(
+        self,
+        chunks: list[DocumentChunk],
+        embeddings: EmbeddingsLike,
+    ) -> None:
+        """Upsert document chunks with embeddings."""
+        if not chunks:
+            return
+
+        if len(chunks) != len(embeddings):
+            raise ValueError(
+                f"Chunks count ({len(chunks)}) must match embeddings count ({len(embeddings)})"
+            )
+
+        vectors = normalize_rows(as_array(embeddings))
+
+        with self._lock:
+            self._ensure_capacity(self._size + len(chunks), vectors.shape[1])
+            start = self._size
+
+            for chunk in chunks:
+                previous = self._row_by_id.get(chunk.id)
+                if previous is not None:
+                    self._tombstone(previous)
+
+                row = self._size
+                self._alive[row] = True
+                self._chunks.append(chunk)
+                self._row_by_id[chunk.id] = row
+                self._rows_by_document.setdefault(chunk.document_id, set()).add(row)
+                self._metadata.add(row, chunk)
+                self._size += 1
+
+            self._write_rows(start, vectors)
+            self._on_rows_added(start, self._size)
+            self._maybe_compact()
+
+    def query(
+        self,
+        embedding: EmbeddingLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[ScoredDocumentChunk]:
+        """Return the top_k nearest chunks matching filters (exact search)."""
+        with self._lock:
+            if self.count() == 0:
+                return []
+
+            query = normalize_rows(as_vector(embedding))
+            similarities = self._similarities(query)[0]
+            similarities[~self._live_rows(filters)] = -np.inf
+
+            rows = top_k_indices(similarities, top_k)
+            return self._to_results(rows, similarities[rows])
+
+    def query_many(
+        self,
+        embeddings: EmbeddingsLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[list[ScoredDocumentChunk]]:
+        """Answer several queries with one matrix-matrix product."""
+        if len(embeddings) == 0:
+            return []
+
+        with self._lock:
+            if self.count() == 0:
+                return [[] for _ in embeddings]
+
+            queries = normalize_rows(as_array(embeddings))
+            similarities = self._similarities(queries)
+            similarities[:, ~self._live_rows(filters)] = -np.inf
+
+            return [
+                self._to_results(rows, row_similarities[rows])
+                for rows, row_similarities in zip(
+                    top_k_indices_batch(similarities, top_k), similarities
+                )
+            ]
+
+    def delete_by_document_ids(self, document_ids: list[str]) -> None:
+        """Delete all chunks belonging to specified documents."""
+        with self._lock:
+            for document_id in document_ids:
+                for row in list(self._rows_by_document.get(document_id, ())):
+                    self._tombstone(row)
+            self._maybe_compact()
+
+    def delete_chunks(self, chunk_ids: list[str]) -> None:
+        """Delete chunks by their IDs."""
+        with self._lock:
+            for chunk_id in chunk_ids:
+                row = self._row_by_id.get(chunk_id)
+                if row is not None:
+                    self._tombstone(row)
+            self._maybe_compact()
+
+    def count(self) -> int:
+        """Number of live chunks."""
+        with self._lock:
+            return self._size - self._tombstones
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and rebuild the row mappings."""
+        with self._lock:
+            if self._tombstones == 0:
+                return
+
+            keep = np.flatnonzero(self._alive[:self._size])
+            capacity = max(self._initial_capacity, len(keep))
+            self._compact_storage(keep, capacity)
+
+            self._alive = np.zeros(capacity, dtype=bool)
+            self._alive[:len(keep)] = True
+            self._chunks = [self._chunks[row] for row in keep]
+            self._size = len(keep)
+            self._tombstones = 0
+
+            self._row_by_id = {}
+            self._rows_by_document = {}
+            for row, chunk in enumerate(self._chunks):
+                self._row_by_id[chunk.id] = row
+                self._rows_by_document.setdefault(chunk.document_id, set()).add(row)
+
+            self._metadata.compact(keep)
+            self._on_compacted(keep)
+
+    def _live_rows(self, filters: MetadataFilter | None) -> np.ndarray:
+        """Mask of stored rows that are alive and match filters (lock held)."""
+        alive = self._alive[:self._size]
+        if filters is None or filters.is_empty:
+            return alive
+        return alive & self._metadata.mask(filters, self._size)
+
+    def _write_rows(self, start: int, vectors: np.ndarray) -> None:
+        """Store normalized vectors at rows start.. (lock held)."""
+        self._matrix[start:start + len(vectors)] = vectors
+
+    def _similarities(self, queries: np.ndarray) -> np.ndarray:
+        """(queries x stored rows) cosine similarities for normalized queries (lock held)."""
+        return queries @ self._matrix[:self._size].T
+
+    def _compact_storage(self, kept_rows: np.ndarray, capacity: int) -> None:
+        """Move vectors of kept_rows to rows 0..n-1 of a new buffer (lock held)."""
+        matrix = np.zeros((capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:len(kept_rows)] = self._matrix[kept_rows]
+        self._matrix = matrix
+
+    def _on_rows_added(self, start: int, end: int) -> None:
+        """Hook for subclasses: rows [start, end) were written (lock held)."""
+
+    def _on_compacted(self, kept_rows: np.ndarray) -> None:
+        """Hook for subclasses: old rows `kept_rows` are now rows 0..n-1 (lock held)."""
+
+    def _to_results(
+        self,
+        rows: np.ndarray,
+        similarities: np.ndarray,
+    ) -> list[ScoredDocumentChunk]:
+        """Build scored chunks from row indices and their similarities."""
+        distances = similarity_to_distance(similarities)
+        return [
+            ScoredDocumentChunk(chunk=self._chunks[row], score=float(distance))
+            for row, distance in zip(rows, distances)
+        ]
+
+    def _tombstone(self, row: int) -> None:
+        """Mark a row deleted (lock held)."""
+        if not self._alive[row]:
+            return
+        chunk = self._chunks[row]
+        self._alive[row] = False
+        self._tombstones += 1
+        self._row_by_id.pop(chunk.id, None)
+        rows = self._rows_by_document.get(chunk.document_id)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self._rows_by_document[chunk.document_id]
+
+    def _maybe_compact(self) -> None:
+        """Compact once tombstones exceed the configured ratio (lock held)."""
+        if self._size and self._tombstones > self._compaction_ratio * self._size:
+            self.compact()
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        """Allocate or grow (by doubling) the matrix to hold rows (lock held)."""
+        if self._matrix is None:
+            capacity = max(self._initial_capacity, rows)
+            self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+            self._alive = np.zeros(capacity, dtype=bool)
+            return
+
+        if dim != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match store dimension {self._matrix.shape[1]}"
+            )
+
+        capacity = self._matrix.shape[0]
+        if rows <= capacity:
+            return
+
+        while capacity < rows:
+            capacity *= 2
+        matrix = np.zeros((capacity, dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._matrix, self._alive = matrix, alive
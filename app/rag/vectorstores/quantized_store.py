@@ -0,0 +1,220 @@
+"""In-memory vector store holding compressed (quantized) embeddings."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from app.rag.interfaces.quantizer import QuantizerInterface
+from app.rag.models.documents import ScoredDocumentChunk
+from app.rag.models.embeddings import (
+    EmbeddingLike,
+    EmbeddingsLike,
+    as_array,
+)
+from app.rag.models.filters import MetadataFilter
+from app.rag.vectorstores.flat_search import normalize_rows, top_k_indices_batch
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+class QuantizedVectorStore(NumpyVectorStore):
+    """NumPy store that keeps only quantized codes in RAM.
+
+    Until `train_size` live vectors exist, vectors are kept in float32 and
+    search is exact. The quantizer is then trained on them, every row is
+    encoded and the float matrix is released; later inserts are encoded
+    directly. Queries are scored against the codes with asymmetric distance
+    computation.
+
+    When `full_precision_path` is set, normalized float32 vectors are also
+    appended to that file and the best `top_k * rerank_factor` candidates
+    are re-scored exactly from it (read through a memory map, so the file
+    does not count against process RAM). Without it, scores are the
+    approximate ones.
+    """
+
+    def __init__(
+        self,
+        quantizer: QuantizerInterface,
+        train_size: int = 10_000,
+        full_precision_path: str | None = None,
+        rerank_factor: int = 4,
+        initial_capacity: int = 1024,
+        compaction_ratio: float = 0.25,
+    ) -> None:
+        """
+        Initialize an empty store.
+
+        Args:
+            quantizer: Codec used to compress vectors (ScalarQuantizer, ProductQuantizer)
+            train_size: Live vectors required before the quantizer is trained
+            full_precision_path: Optional float32 file used for re-ranking
+            rerank_factor: Candidates re-scored per requested result (0 disables)
+            initial_capacity: Initial buffer capacity
+            compaction_ratio: Tombstone ratio triggering compaction
+        """
+        if train_size <= 0:
+            raise ValueError("train_size must be greater than 0")
+        if rerank_factor < 0:
+            raise ValueError("rerank_factor must be >= 0")
+        super().__init__(initial_capacity=initial_capacity, compaction_ratio=compaction_ratio)
+
+        self._quantizer = quantizer
+        self._train_size = train_size
+        self._rerank_factor = rerank_factor
+        self._codes: np.ndarray | None = None
+        self._dim: int | None = None
+
+        self._full_path = Path(full_precision_path) if full_precision_path else None
+        self._full: np.ndarray | None = None
+        if self._full_path is not None:
+            # The store is in-memory: start from an empty full-precision file
+            self._full_path.parent.mkdir(parents=True, exist_ok=True)
+            self._full_path.write_bytes(b"")
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether vectors are stored as codes."""
+        return self._codes is not None
+
+    @property
+    def vector_bytes(self) -> int:
+        """Bytes of RAM used by stored vectors (codes or float matrix)."""
+        with self._lock:
+            if self._codes is not None:
+                return int(self._codes[:self._size].nbytes)
+            if self._matrix is not None:
+                return int(self._matrix[:self._size].nbytes)
+            return 0
+
+    def train(self) -> None:
+        """Train the quantizer on live vectors and switch storage to codes."""
+        with self._lock:
+            if self._codes is not None:
+                raise RuntimeError("Store is already quantized")
+
+            live = np.flatnonzero(self._alive[:self._size])
+            if len(live) == 0:
+                raise ValueError("Cannot train on an empty store")
+
+            self._quantizer.train(self._matrix[live])
+            codes = np.zeros((self._matrix.shape[0], self._quantizer.code_size), dtype=np.uint8)
+            codes[:self._size] = self._quantizer.encode(self._matrix[:self._size])
+            self._codes = codes
+            self._matrix = None
+
+    def query(
+        self,
+        embedding: EmbeddingLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[ScoredDocumentChunk]:
+        """Return the top_k nearest chunks matching filters."""
+        return self.query_many([embedding], top_k=top_k, filters=filters)[0]
+
+    def query_many(
+        self,
+        embeddings: EmbeddingsLike,
+        top_k: int = 5,
+        filters: MetadataFilter | None = None,
+    ) -> list[list[ScoredDocumentChunk]]:
+        """Score queries against codes, then optionally re-rank exactly."""
+        if len(embeddings) == 0:
+            return []
+
+        with self._lock:
+            if not self.is_trained or not self._can_rerank():
+                return super().query_many(embeddings, top_k=top_k, filters=filters)
+
+            if self.count() == 0:
+                return [[] for _ in embeddings]
+
+            queries = normalize_rows(as_array(embeddings))
+            approximate = self._similarities(queries)
+            approximate[:, ~self._live_rows(filters)] = -np.inf
+            candidates = top_k_indices_batch(approximate, top_k * self._rerank_factor)
+
+            full = self._full_vectors()
+            results = []
+            for query, rows in zip(queries, candidates):
+                exact = full[rows] @ query
+                order = np.argsort(-exact, kind="stable")[:top_k]
+                results.append(self._to_results(rows[order], exact[order]))
+            return results
+
+    def _can_rerank(self) -> bool:
+        return self._full_path is not None and self._rerank_factor > 0
+
+    def _full_vectors(self) -> np.ndarray:
+        """Memory map of the full-precision file covering all rows (lock held)."""
+        if self._full is None or self._full.shape[0] != self._size:
+            self._full = np.memmap(
+                self._full_path, dtype=np.float32, mode="r", shape=(self._size, self._dim)
+            )
+        return self._full
+
+    def _ensure_capacity(self, rows: int, dim: int) -> None:
+        """Grow the float matrix (untrained) or the code buffer (lock held)."""
+        if self._dim is None:
+            self._dim = dim
+        elif dim != self._dim:
+            raise ValueError(
+                f"Embedding dimension {dim} does not match store dimension {self._dim}"
+            )
+
+        if self._codes is None:
+            super()._ensure_capacity(rows, dim)
+            return
+
+        capacity = self._codes.shape[0]
+        if rows <= capacity:
+            return
+
+        while capacity < rows:
+            capacity *= 2
+        codes = np.zeros((capacity, self._codes.shape[1]), dtype=np.uint8)
+        codes[:self._size] = self._codes[:self._size]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._size] = self._alive[:self._size]
+        self._codes, self._alive = codes, alive
+
+    def _write_rows(self, start: int, vectors: np.ndarray) -> None:
+        """Store rows as codes (or floats before training) (lock held)."""
+        if self._full_path is not None:
+            with open(self._full_path, "ab") as handle:
+                handle.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+
+        if self._codes is None:
+            super()._write_rows(start, vectors)
+        else:
+            self._codes[start:start + len(vectors)] = self._quantizer.encode(vectors)
+
+    def _similarities(self, queries: np.ndarray) -> np.ndarray:
+        """Exact before training, asymmetric code distances afterwards (lock held)."""
+        if self._codes is None:
+            return super()._similarities(queries)
+        return self._quantizer.similarities(queries, self._codes[:self._size])
+
+    def _compact_storage(self, kept_rows: np.ndarray, capacity: int) -> None:
+        """Compact codes (or floats) and the full-precision file (lock held)."""
+        if self._full_path is not None:
+            kept = np.ascontiguousarray(self._full_vectors()[kept_rows])
+            self._full = None
+            temporary = self._full_path.with_suffix(".tmp")
+            kept.tofile(temporary)
+            os.replace(temporary, self._full_path)
+
+        if self._codes is None:
+            super()._compact_storage(kept_rows, capacity)
+            return
+
+        codes = np.zeros((capacity, self._codes.shape[1]), dtype=np.uint8)
+        codes[:len(kept_rows)] = self._codes[kept_rows]
+        self._codes = codes
+
+    def _on_rows_added(self, start: int, end: int) -> None:
+        """Train once enough vectors have been collected (lock held)."""
+        if self._codes is None and self.count() >= self._train_size:
+            self.train()
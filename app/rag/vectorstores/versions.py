@@ -0,0 +1,70 @@
+"""Index directories published as immutable versions behind a pointer file.
+
+A writer fills a fresh `vNNNNNNNN` directory, fsyncs its files and then
+atomically replaces the pointer file naming the current version. Readers
+resolve the pointer first, so they only ever see complete versions; a
+crash mid-write leaves an orphan directory that the next publish removes.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shutil
+from pathlib import Path
+from typing import List
+
+POINTER_FILE = "CURRENT"
+
+_VERSION_RE = re.compile(r"v\d{8}")
+
+
+def version_directories(root: Path) -> List[Path]:
+    """Version directories in root, oldest first."""
+    if not root.is_dir():
+        return []
+    return sorted(
+        entry for entry in root.iterdir()
+        if entry.is_dir() and _VERSION_RE.fullmatch(entry.name)
+    )
+
+
+def current_version(root: Path) -> str | None:
+    """Version named by the pointer file, or None if nothing was published."""
+    try:
+        return (root / POINTER_FILE).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def create_version(root: Path) -> Path:
+    """Create and return the directory the next version is written to."""
+    root.mkdir(parents=True, exist_ok=True)
+    versions = version_directories(root)
+    number = int(versions[-1].name[1:]) if versions else 0
+    directory = root / f"v{number + 1:08d}"
+    directory.mkdir()
+    return directory
+
+
+def sync_file(path: Path) -> None:
+    """Flush a written file to disk before the version holding it is published."""
+    with open(path, "rb") as handle:
+        os.fsync(handle.fileno())
+
+
+def publish_version(root: Path, version: str) -> None:
+    """
+    Point root at version, then delete every other version but the previous one.
+
+    The previous version is kept for readers that resolved the pointer
+    just before the switch and are still loading it.
+    """
+    previous = current_version(root)
+    temporary = root / (POINTER_FILE + ".tmp")
+    temporary.write_text(version, encoding="utf-8")
+    os.replace(temporary, root / POINTER_FILE)
+
+    for directory in version_directories(root):
+        if directory.name not in (version, previous):
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,131 @@
+"""
+Wiring of the RAG pipeline used by the API.
+
+Builds embedder, vector store, retrieval and LLM provider from settings.
+"""
+
+from app.core.config import Settings
+from app.rag.cache.generation import IndexGeneration
+from app.rag.cache.response_cache import ResponseCache
+from app.rag.cache.semantic_cache import SemanticCache
+from app.rag.concurrency.single_flight import AsyncSingleFlight, SingleFlight
+from app.rag.embeddings.factory import build_embedder
+from app.rag.lexical.bm25 import BM25Index
+from app.rag.llm.providers.async_ollama_provider import AsyncOllamaProvider
+from app.rag.llm.transport import AsyncHTTPTransport
+from app.rag.models.settings import RAGSettings
+from app.rag.prompts.token_counter import load_token_counter
+from app.rag.reranking.cross_encoder import CrossEncoderReranker
+from app.rag.services.async_rag_llm_service import AsyncRAGLLMService
+from app.rag.services.async_retrieval_service import AsyncRetrievalService
+from app.rag.services.context_builder import ContextBuilder
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.factory import build_vector_store
+
+
+def build_async_rag_service(
+    settings: Settings,
+    rag_settings: RAGSettings | None = None,
+) -> AsyncRAGLLMService:
+    """
+    Build the async RAG service from application and RAG settings.
+
+    Args:
+        settings: Application settings (LLM server, HTTP client limits)
+        rag_settings: RAG settings (defaults when None)
+
+    Returns:
+        AsyncRAGLLMService: Ready-to-use service; call aclose() on shutdown
+    """
+    rag_settings = rag_settings or RAGSettings()
+    generation = IndexGeneration(rag_settings.index_generation_path)
+    semantic_cache = None
+    if rag_settings.semantic_cache_size > 0:
+        semantic_cache = SemanticCache(
+            threshold=rag_settings.semantic_cache_threshold,
+            max_items=rag_settings.semantic_cache_size,
+        )
+    embedder = build_embedder(rag_settings)
+    context_builder = ContextBuilder(
+        count_tokens=(
+            load_token_counter(rag_settings.context_tokenizer)
+            if rag_settings.context_max_tokens else None
+        ),
+        max_tokens=rag_settings.context_max_tokens,
+        embedder=embedder,
+        sentences_per_chunk=rag_settings.context_sentences_per_chunk,
+        dedupe_threshold=rag_settings.context_dedupe_threshold,
+        stable_order=rag_settings.context_stable_order,
+    )
+    reranker = None
+    if rag_settings.reranker_model_name:
+        reranker = CrossEncoderReranker(
+            rag_settings.reranker_model_name,
+            batch_size=rag_settings.rerank_batch_size,
+            latency_budget_ms=rag_settings.rerank_latency_budget_ms,
+        )
+    lexical_index = None
+    if rag_settings.retrieval_mode == "hybrid":
+        # Reloads on search whenever the indexer process flushes a new version
+        lexical_index = BM25Index(
+            k1=rag_settings.bm25_k1,
+            b=rag_settings.bm25_b,
+            path=rag_settings.lexical_index_dir,
+        )
+    retrieval_service = RetrievalService(
+        embedder=embedder,
+        vector_store=build_vector_store(rag_settings),
+        semantic_cache=semantic_cache,
+        generation=generation,
+        single_flight=(
+            SingleFlight(rag_settings.single_flight_timeout)
+            if rag_settings.single_flight_enabled else None
+        ),
+        context_builder=context_builder,
+        reranker=reranker,
+        rerank_candidates=rag_settings.rerank_candidates,
+        lexical_index=lexical_index,
+        retrieval_mode=rag_settings.retrieval_mode,
+        fusion_candidates=rag_settings.fusion_candidates,
+        rrf_k=rag_settings.rrf_k,
+    )
+    transport = AsyncHTTPTransport(
+        pool_size=settings.llm_pool_size,
+        connect_timeout=settings.llm_connect_timeout,
+        read_timeout=settings.llm_read_timeout,
+        max_retries=settings.llm_max_retries,
+        backoff_base=settings.llm_backoff_base,
+    )
+    llm = AsyncOllamaProvider(
+        base_url=settings.ollama_base_url,
+        model=settings.ollama_model,
+        transport=transport,
+        keep_alive=settings.ollama_keep_alive,
+        options={
+            name: value
+            for name, value in (
+                ("num_ctx", settings.ollama_num_ctx),
+                ("num_keep", settings.ollama_num_keep),
+            )
+            if value is not None
+        },
+    )
+    cache = None
+    if rag_settings.response_cache_size > 0:
+        cache = ResponseCache(
+            max_items=rag_settings.response_cache_size,
+            ttl_seconds=rag_settings.response_cache_ttl_seconds,
+            path=rag_settings.response_cache_path,
+        )
+    return AsyncRAGLLMService(
+        AsyncRetrievalService(retrieval_service),
+        llm,
+        top_k=rag_settings.default_top_k,
+        cache=cache,
+        generation=generation,
+        reuse_semantic_answers=semantic_cache is not None and rag_settings.semantic_cache_answers,
+        single_flight=(
+            AsyncSingleFlight(rag_settings.single_flight_timeout)
+            if rag_settings.single_flight_enabled else None
+        ),
+    )
@@ -0,0 +1,179 @@
+"""Tests for the async LLM provider, retrieval facade and RAG service."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+
+import httpx
+import pytest
+
+from app.rag.llm.interfaces.async_llm_interface import AsyncLLMInterface
+from app.rag.llm.providers.async_ollama_provider import AsyncOllamaProvider
+from app.rag.llm.transport import AsyncHTTPTransport
+from app.rag.services.async_rag_llm_service import AsyncRAGLLMService
+from app.rag.services.async_retrieval_service import AsyncRetrievalService
+
+
+class _FakeRetrievalService:
+    """Sync retrieval fake recording the thread it runs on."""
+
+    def __init__(self) -> None:
+        self.threads = []
+
+    def retrieve_with_context(self, query_text, *, top_k=5, max_chars=8000, filters=None):
+        self.threads.append(threading.get_ident())
+        return ([], f"context for {query_text}")
+
+    def retrieve_many_with_context(self, queries, *, top_k=5, max_chars=8000, filters=None):
+        self.threads.append(threading.get_ident())
+        return [([], f"context for {query}") for query in queries]
+
+
+class _SlowLLM(AsyncLLMInterface):
+    """Async fake that sleeps and tracks how many calls overlap."""
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+
+    async def generate(self, prompt: str) -> str:
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return prompt
+
+
+def _ollama(handler) -> AsyncOllamaProvider:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    transport = AsyncHTTPTransport(client=client, max_retries=0)
+    return AsyncOllamaProvider("http://ollama:11434/", "llama2", transport=transport)
+
+
+def test_async_ollama_posts_generate_request():
+    """The provider posts a non-streaming generate request and returns 'response'."""
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["url"] = str(request.url)
+        seen["payload"] = json.loads(request.content)
+        return httpx.Response(200, json={"response": "hi"})
+
+    answer = asyncio.run(_ollama(handler).generate("prompt"))
+
+    assert answer == "hi"
+    assert seen["url"] == "http://ollama:11434/api/generate"
+    assert seen["payload"] == {"model": "llama2", "prompt": "prompt", "stream": False}
+
+
+@pytest.mark.parametrize(
+    "response, message",
+    [
+        (httpx.Response(500, text="boom"), "Ollama HTTP error: 500"),
+        (httpx.Response(200, json={"other": 1}), "missing 'response' field"),
+        (httpx.Response(200, text="not json"), "Invalid JSON"),
+    ],
+)
+def test_async_ollama_errors_raise_runtime_error(response, message):
+    provider = _ollama(lambda request: response)
+    with pytest.raises(RuntimeError, match=message):
+        asyncio.run(provider.generate("prompt"))
+
+
+def test_async_ollama_connection_error():
+    def handler(request):
+        raise httpx.ConnectError("refused")
+
+    with pytest.raises(RuntimeError, match="Ollama connection error"):
+        asyncio.run(_ollama(handler).generate("prompt"))
+
+
+def test_retrieval_runs_off_the_event_loop():
+    """Blocking retrieval is executed in a worker thread."""
+    fake = _FakeRetrievalService()
+    service = AsyncRetrievalService(fake)
+
+    results, context = asyncio.run(service.retrieve_with_context("q"))
+
+    assert context == "context for q"
+    assert fake.threads[0] != threading.get_ident()
+
+
+def test_answer_many_overlaps_llm_calls():
+    """Generations for a batch run concurrently, up to the configured cap."""
+    llm = _SlowLLM()
+    service = AsyncRAGLLMService(
+        AsyncRetrievalService(_FakeRetrievalService()), llm, max_concurrent_generations=3
+    )
+
+    answers = asyncio.run(service.answer_many([f"q{i}" for i in range(8)]))
+
+    assert all(f"context for q{i}" in answer for i, answer in enumerate(answers))
+    assert llm.peak == 3
+
+
+def test_concurrent_answers_share_one_loop():
+    """Many answer() calls wait on the LLM at the same time."""
+    llm = _SlowLLM()
+    service = AsyncRAGLLMService(AsyncRetrievalService(_FakeRetrievalService()), llm)
+
+    async def run():
+        return await asyncio.gather(*(service.answer(f"q{i}") for i in range(20)))
+
+    answers = asyncio.run(run())
+
+    assert len(answers) == 20
+    assert llm.peak > 1
+
+
+class _ThreadRecordingCache:
+    """Response cache fake recording the threads its blocking calls run on."""
+
+    def __init__(self) -> None:
+        self.entries = {}
+        self.threads = []
+
+    def get(self, key):
+        self.threads.append(threading.get_ident())
+        return self.entries.get(key)
+
+    def put(self, key, value):
+        self.threads.append(threading.get_ident())
+        self.entries[key] = value
+
+
+class _ThreadRecordingGeneration:
+    def __init__(self) -> None:
+        self.threads = []
+
+    def current(self):
+        self.threads.append(threading.get_ident())
+        return 0
+
+
+def test_cache_and_generation_lookups_run_off_the_event_loop():
+    """SQLite-backed cache and generation calls never block the loop thread."""
+    cache, generation = _ThreadRecordingCache(), _ThreadRecordingGeneration()
+    service = AsyncRAGLLMService(
+        AsyncRetrievalService(_FakeRetrievalService()),
+        _SlowLLM(),
+        cache=cache,
+        generation=generation,
+    )
+
+    async def run():
+        loop_thread = threading.get_ident()
+        first = await service.answer("q")
+        again = await service.answer("q")
+        streamed = [fragment async for fragment in service.answer_stream("q")]
+        batch = await service.answer_many(["q", "other"])
+        return loop_thread, first, again, streamed, batch
+
+    loop_thread, first, again, streamed, batch = asyncio.run(run())
+
+    assert first == again == streamed[0] == batch[0]
+    assert len(cache.entries) == 2
+    assert cache.threads and loop_thread not in cache.threads
+    assert generation.threads and loop_thread not in generation.threads
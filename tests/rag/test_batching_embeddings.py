@@ -0,0 +1,117 @@
+"""Tests for the micro-batching embedding provider and histograms."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.rag.embeddings.batching_provider import BatchingEmbeddingProvider
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.metrics.histogram import Histogram
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+
+
+class _RecordingEmbedder(EmbeddingInterface):
+    """Embeds text as [len(text), 1]; records each batch."""
+
+    def __init__(self, fail: bool = False) -> None:
+        self.batches = []
+        self._fail = fail
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return self.embed_batch([text]).to_vectors()[0]
+
+    def embed_texts(self, texts):
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts):
+        self.batches.append(list(texts))
+        if self._fail:
+            raise RuntimeError("model crashed")
+        return EmbeddingBatch(np.array([[len(t), 1.0] for t in texts], dtype=np.float32))
+
+
+def _concurrently(count: int, target) -> list:
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_model_calls():
+    inner = _RecordingEmbedder()
+    batcher = BatchingEmbeddingProvider(inner, max_batch_size=64, max_wait_ms=50)
+
+    results = _concurrently(16, lambda i: batcher.embed_text("x" * (i + 1)))
+    batcher.close()
+
+    assert [r.vector[0] for r in results] == [float(i + 1) for i in range(16)]
+    assert len(inner.batches) < 16
+    assert sum(len(b) for b in inner.batches) == 16
+    assert batcher.batch_sizes.count == len(inner.batches)
+    assert batcher.latencies_ms.count == 16
+
+
+def test_batch_is_flushed_at_max_size():
+    """A full batch is encoded without waiting for max_wait."""
+    inner = _RecordingEmbedder()
+    batcher = BatchingEmbeddingProvider(inner, max_batch_size=4, max_wait_ms=10_000)
+
+    started = time.monotonic()
+    _concurrently(4, lambda i: batcher.embed_text(str(i)))
+    batcher.close()
+
+    assert time.monotonic() - started < 5
+    assert max(len(b) for b in inner.batches) <= 4
+
+
+def test_large_requests_bypass_the_queue():
+    inner = _RecordingEmbedder()
+    batcher = BatchingEmbeddingProvider(inner, max_batch_size=2)
+
+    batch = batcher.embed_batch(["a", "bb", "ccc"])
+
+    assert batch.array[:, 0].tolist() == [1.0, 2.0, 3.0]
+    assert inner.batches == [["a", "bb", "ccc"]]
+
+
+def test_errors_reach_every_caller():
+    batcher = BatchingEmbeddingProvider(_RecordingEmbedder(fail=True), max_wait_ms=1)
+
+    with pytest.raises(RuntimeError, match="model crashed"):
+        batcher.embed_text("x")
+    batcher.close()
+
+
+def test_closed_batcher_rejects_requests():
+    batcher = BatchingEmbeddingProvider(_RecordingEmbedder())
+    batcher.close()
+
+    with pytest.raises(RuntimeError, match="closed"):
+        batcher.embed_text("x")
+
+
+def test_histogram_buckets_and_quantiles():
+    histogram = Histogram([1, 10, 100])
+    for value in [0.5, 5, 5, 50, 500]:
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+
+    assert snapshot.counts == [1, 2, 1, 1]
+    assert snapshot.count == 5
+    assert snapshot.mean == pytest.approx(112.1)
+    assert snapshot.quantile(0.5) == 10
+    assert snapshot.quantile(1.0) == 500
@@ -0,0 +1,87 @@
+"""Tests for the content-hash embedding cache."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.rag.embeddings.cached_provider import CachedEmbeddingProvider
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.models.embeddings import EmbeddingVector
+
+
+class _CountingEmbedder(EmbeddingInterface):
+    """Fake embedder recording every batch it receives."""
+
+    def __init__(self) -> None:
+        self.calls = []
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts):
+        self.calls.append(list(texts))
+        return [EmbeddingVector(vector=[float(len(t)), 0.5]) for t in texts]
+
+
+def test_only_misses_reach_the_model():
+    """Cached texts are served from memory; misses go in one batch."""
+    inner = _CountingEmbedder()
+    cache = CachedEmbeddingProvider(inner, model_name="fake")
+
+    cache.embed_texts(["alpha", "beta"])
+    result = cache.embed_texts(["alpha", "gamma", "beta", "delta"])
+
+    assert inner.calls == [["alpha", "beta"], ["gamma", "delta"]]
+    assert [v.vector[0] for v in result] == [5.0, 5.0, 4.0, 5.0]
+    assert cache.stats.memory_hits == 2
+    assert cache.stats.misses == 4
+
+
+def test_normalized_text_shares_cache_entry():
+    """Whitespace differences map to the same cache key."""
+    inner = _CountingEmbedder()
+    cache = CachedEmbeddingProvider(inner, model_name="fake")
+
+    cache.embed_text("hello   world")
+    cache.embed_text("  hello world\n")
+
+    assert len(inner.calls) == 1
+    assert cache.stats.hits == 1
+
+
+def test_model_name_is_part_of_key():
+    """Different models never share entries."""
+    cache_a = CachedEmbeddingProvider(_CountingEmbedder(), model_name="a")
+    cache_b = CachedEmbeddingProvider(_CountingEmbedder(), model_name="b")
+    assert cache_a.cache_key("text") != cache_b.cache_key("text")
+
+
+def test_disk_tier_survives_restart(tmp_path: Path):
+    """A new provider instance reads vectors persisted by a previous one."""
+    cache_path = str(tmp_path / "embeddings.sqlite")
+
+    first = CachedEmbeddingProvider(_CountingEmbedder(), model_name="fake", cache_path=cache_path)
+    first.embed_texts(["persisted text"])
+    first.close()
+
+    inner = _CountingEmbedder()
+    second = CachedEmbeddingProvider(inner, model_name="fake", cache_path=cache_path)
+    result = second.embed_text("persisted text")
+
+    assert inner.calls == []
+    assert result.vector == pytest.approx([14.0, 0.5])
+    assert second.stats.disk_hits == 1
+
+
+def test_lru_evicts_oldest_entries():
+    """Memory tier is bounded by max_memory_items."""
+    inner = _CountingEmbedder()
+    cache = CachedEmbeddingProvider(inner, model_name="fake", max_memory_items=2)
+
+    cache.embed_texts(["one", "two", "three"])
+    cache.embed_text("one")
+
+    assert inner.calls[-1] == ["one"]
+    assert cache.stats.hit_rate == 0.0
@@ -0,0 +1,65 @@
+"""Tests for batched deletes and replace in ChromaVectorStore (fake collection)."""
+
+from __future__ import annotations
+
+from app.rag.models.documents import DocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.vectorstores.chroma import ChromaVectorStore
+
+
+class _FakeCollection:
+    """Minimal stand-in for a Chroma collection recording calls."""
+
+    def __init__(self, existing_ids=None) -> None:
+        self.deletes = []
+        self.upserts = []
+        self.existing_ids = existing_ids or []
+
+    def delete(self, ids=None, where=None):
+        self.deletes.append({"ids": ids, "where": where})
+
+    def get(self, where=None, include=None):
+        return {"ids": list(self.existing_ids)}
+
+    def upsert(self, ids, embeddings, documents, metadatas):
+        self.upserts.append(ids)
+
+
+def _store(collection: _FakeCollection) -> ChromaVectorStore:
+    """Build a store around a fake collection without a Chroma client."""
+    store = ChromaVectorStore.__new__(ChromaVectorStore)
+    store._collection = collection
+    return store
+
+
+def test_delete_by_document_ids_is_batched():
+    """Thousands of document IDs are deleted in a few filtered calls."""
+    collection = _FakeCollection()
+    store = _store(collection)
+    document_ids = [f"doc{i}" for i in range(1200)]
+
+    store.delete_by_document_ids(document_ids)
+
+    assert len(collection.deletes) == 3
+    first = collection.deletes[0]["where"]["$or"]
+    assert len(first) == ChromaVectorStore.DELETE_BATCH_SIZE
+    assert first[0] == {"document_id": "doc0"}
+
+
+def test_delete_single_document_uses_equality_filter():
+    """A single ID uses a plain equality filter."""
+    collection = _FakeCollection()
+    _store(collection).delete_by_document_ids(["doc1"])
+    assert collection.deletes == [{"ids": None, "where": {"document_id": "doc1"}}]
+
+
+def test_replace_documents_deletes_only_stale_chunks():
+    """Replace upserts the new chunks and deletes chunks no longer present."""
+    collection = _FakeCollection(existing_ids=["d::chunk:0", "d::chunk:1", "d::chunk:2"])
+    store = _store(collection)
+    chunks = [DocumentChunk(id="d::chunk:0", document_id="d", content="new", index=0)]
+
+    store.replace_documents(["d"], chunks, [EmbeddingVector(vector=[1.0])])
+
+    assert collection.deletes == [{"ids": ["d::chunk:1", "d::chunk:2"], "where": None}]
+    assert collection.upserts == [["d::chunk:0"]]
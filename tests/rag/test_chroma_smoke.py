@@ -57,3 +57,24 @@ def test_chroma_vector_store_guard_check():
 
     with pytest.raises(RuntimeError, match="collection not initialized"):
         store.add_chunks([chunk], [embedding])
+
+
+def test_chroma_delete_by_document_ids(tmp_path: Path):
+    """Deleting by document ID removes all of that document's chunks only."""
+    store = ChromaVectorStore(
+        collection_name="delete_test",
+        persist_directory=str(tmp_path / "chroma_delete"),
+    )
+    chunks = [
+        DocumentChunk(id=f"{doc}::chunk:{i}", document_id=doc, content=f"{doc} {i}", index=i)
+        for doc in ("doc1", "doc2", "doc3")
+        for i in range(2)
+    ]
+    embeddings = [EmbeddingVector(vector=[0.1 * i, 0.2, 0.3]) for i in range(len(chunks))]
+    store.add_chunks(chunks, embeddings)
+
+    store.delete_by_document_ids(["doc1", "doc3"])
+
+    assert store._collection.count() == 2
+    remaining = store._collection.get(include=["metadatas"])
+    assert {meta["document_id"] for meta in remaining["metadatas"]} == {"doc2"}
@@ -0,0 +1,106 @@
+"""Tests for chunking strategies."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.rag.chunking.factory import build_chunker
+from app.rag.chunking.fixed_size import FixedSizeChunker
+from app.rag.chunking.sentence import SentenceChunker
+from app.rag.chunking.token import TokenChunker
+from app.rag.models.settings import RAGSettings
+
+
+def _word_count(text: str) -> int:
+    """Fake tokenizer: one token per whitespace-separated word."""
+    return len(text.split())
+
+
+def test_fixed_size_short_text_single_chunk():
+    """Text shorter than chunk_size yields exactly one chunk."""
+    chunker = FixedSizeChunker(chunk_size=100, chunk_overlap=10)
+    assert chunker.split_text("Short document.") == ["Short document."]
+
+
+def test_fixed_size_blank_text_no_chunks():
+    """Blank text yields no chunks."""
+    assert FixedSizeChunker().split_text("   \n ") == []
+
+
+def test_fixed_size_windows_and_overlap():
+    """Windows respect chunk_size and consecutive chunks overlap."""
+    text = " ".join(f"word{i}" for i in range(200))
+    chunker = FixedSizeChunker(chunk_size=100, chunk_overlap=20)
+
+    chunks = chunker.split_text(text)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    # Every word survives chunking
+    for i in range(200):
+        assert any(f"word{i}" in chunk for chunk in chunks)
+    # Overlap: the tail of a chunk reappears at the start of the next
+    assert chunks[0].split()[-1] in chunks[1]
+
+
+def test_fixed_size_invalid_overlap():
+    """Overlap must be smaller than chunk size."""
+    with pytest.raises(ValueError):
+        FixedSizeChunker(chunk_size=10, chunk_overlap=10)
+
+
+def test_sentence_chunker_keeps_sentences_whole():
+    """Sentence chunker never splits inside a sentence."""
+    sentences = [f"This is sentence number {i}." for i in range(20)]
+    text = " ".join(sentences)
+    chunker = SentenceChunker(max_chars=120)
+
+    chunks = chunker.split_text(text)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 120 for chunk in chunks)
+    rejoined = " ".join(chunks)
+    for sentence in sentences:
+        assert sentence in rejoined
+
+
+def test_sentence_chunker_keeps_paragraph_breaks():
+    """Short paragraphs are packed together with blank-line separators."""
+    text = "First paragraph.\n\nSecond paragraph."
+    chunks = SentenceChunker(max_chars=200).split_text(text)
+    assert chunks == ["First paragraph.\n\nSecond paragraph."]
+
+
+def test_token_chunker_respects_token_budget():
+    """Token chunker keeps every chunk within max_tokens."""
+    text = " ".join(f"Sentence {i} has five tokens." for i in range(30))
+    chunker = TokenChunker(count_tokens=_word_count, max_tokens=12, overlap_tokens=5)
+
+    chunks = chunker.split_text(text)
+
+    assert len(chunks) > 1
+    assert all(_word_count(chunk) <= 12 for chunk in chunks)
+    # Overlap repeats the previous trailing sentence
+    assert chunks[0].split(". ")[-1] in chunks[1]
+
+
+def test_token_chunker_splits_oversized_sentence():
+    """A sentence larger than the budget is split on words."""
+    text = " ".join(["token"] * 25)
+    chunks = TokenChunker(count_tokens=_word_count, max_tokens=10).split_text(text)
+    assert [_word_count(chunk) for chunk in chunks] == [10, 10, 5]
+
+
+def test_build_chunker_from_settings():
+    """Factory selects the configured strategy."""
+    assert isinstance(build_chunker(RAGSettings()), FixedSizeChunker)
+    assert isinstance(
+        build_chunker(RAGSettings(chunking_strategy="sentence")), SentenceChunker
+    )
+    assert isinstance(
+        build_chunker(RAGSettings(chunking_strategy="token"), count_tokens=_word_count),
+        TokenChunker,
+    )
+
+    with pytest.raises(ValueError, match="count_tokens"):
+        build_chunker(RAGSettings(chunking_strategy="token"))
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import pytest
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
 from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
 from app.rag.services.context_builder import ContextBuilder
 
 
@@ -146,3 +150,84 @@ def test_build_respects_exact_limit():
     assert len(result) == 107
     assert result.count("A") == 50
     assert result.count("B") == 50
+
+
+def _scored(content: str, i: int = 0) -> ScoredDocumentChunk:
+    return ScoredDocumentChunk(
+        chunk=DocumentChunk(
+            id=f"doc{i}::chunk:0",
+            document_id=f"doc{i}",
+            content=content,
+            index=0,
+            metadata={},
+        ),
+        score=0.1 * i,
+    )
+
+
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
+class _KeywordEmbedder(EmbeddingInterface):
+    """Embeds text as counts of a few keywords plus a constant dimension."""
+
+    KEYWORDS = ("cache", "index", "weather")
+
+    def embed_text(self, text):
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts):
+        return [
+            EmbeddingVector(vector=[float(t.lower().count(k)) for k in self.KEYWORDS] + [1.0])
+            for t in texts
+        ]
+
+
+def test_token_budget_skips_and_continues():
+    """A chunk over the remaining budget is skipped, later ones still fit."""
+    builder = ContextBuilder(count_tokens=_count_words, max_tokens=10)
+    chunks = [_scored("a b c", 0), _scored("long " * 20, 1), _scored("d e f", 2)]
+
+    result = builder.build(chunks)
+
+    # Separator "---" counts as one word: 3 + 1 + 3 tokens
+    assert result == "a b c\n\n---\n\nd e f"
+
+
+def test_token_budget_still_respects_max_chars():
+    builder = ContextBuilder(count_tokens=_count_words, max_tokens=100)
+
+    assert builder.build([_scored("x" * 50, 0), _scored("y", 1)], max_chars=20) == "y"
+
+
+def test_near_duplicates_are_dropped():
+    """The better-ranked copy of near-identical chunks is kept."""
+    builder = ContextBuilder(dedupe_threshold=0.8)
+    text = "the cache is invalidated when the index generation advances"
+    chunks = [_scored(text, 0), _scored(text.upper() + " ", 1), _scored("other text here", 2)]
+
+    assert builder.build(chunks) == text + "\n\n---\n\nother text here"
+
+
+def test_sentences_trimmed_to_query_in_original_order():
+    builder = ContextBuilder(embedder=_KeywordEmbedder(), sentences_per_chunk=2)
+    chunk = _scored(
+        "The index is rebuilt nightly. It rained today. "
+        "The weather was bad. A cache sits in front of the index."
+    )
+
+    result = builder.build([chunk], query="how is the index cache refreshed?")
+
+    assert result == "The index is rebuilt nightly. A cache sits in front of the index."
+    # Without a query, chunks are left untouched
+    assert builder.build([chunk]) == chunk.chunk.content
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError, match="count_tokens"):
+        ContextBuilder(max_tokens=100)
+    with pytest.raises(ValueError, match="embedder"):
+        ContextBuilder(sentences_per_chunk=2)
+    with pytest.raises(ValueError):
+        ContextBuilder(dedupe_threshold=0.0)
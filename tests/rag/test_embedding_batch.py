@@ -0,0 +1,109 @@
+"""Tests for the array-backed EmbeddingBatch type."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.rag.embeddings.cached_provider import CachedEmbeddingProvider
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.models.documents import DocumentBase
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector, as_array, as_vector
+from app.rag.services.indexing import IndexingService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+class _ListEmbedder(EmbeddingInterface):
+    """Fake embedder implementing only the per-vector API."""
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts):
+        return [EmbeddingVector(vector=[float(len(t)), 1.0, 0.0]) for t in texts]
+
+
+class _BatchEmbedder(_ListEmbedder):
+    """Fake embedder with a native batch path that records its calls."""
+
+    def __init__(self) -> None:
+        self.batch_calls = 0
+
+    def embed_batch(self, texts):
+        self.batch_calls += 1
+        return EmbeddingBatch(np.array([[float(len(t)), 1.0, 0.0] for t in texts]))
+
+
+def test_batch_rows_are_views():
+    """Rows and the backing array share memory with the batch."""
+    array = np.arange(6, dtype=np.float32).reshape(2, 3)
+    batch = EmbeddingBatch(array)
+
+    assert batch.array is array
+    assert np.shares_memory(batch.row(1), array)
+    assert len(batch) == 2
+    assert batch.dim == 3
+
+
+def test_batch_converts_to_float32_and_validates_shape():
+    """Non-float32 input is converted; 1-D input is rejected."""
+    assert EmbeddingBatch(np.ones((2, 2), dtype=np.float64)).array.dtype == np.float32
+    with pytest.raises(ValueError, match="2-D"):
+        EmbeddingBatch(np.ones(3))
+
+
+def test_vectors_round_trip():
+    """from_vectors / to_vectors preserve values and order."""
+    vectors = [EmbeddingVector(vector=[1.0, 2.0]), EmbeddingVector(vector=[3.0, 4.0])]
+    batch = EmbeddingBatch.from_vectors(vectors)
+
+    assert batch.array.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+    assert batch.to_vectors() == vectors
+
+
+def test_as_array_accepts_all_forms():
+    """Batches pass through without copying; lists are stacked."""
+    batch = EmbeddingBatch(np.ones((2, 2), dtype=np.float32))
+
+    assert as_array(batch) is batch.array
+    assert as_array([EmbeddingVector(vector=[1.0, 0.0])]).shape == (1, 2)
+    assert as_array([np.zeros(2), [1.0, 1.0]]).shape == (2, 2)
+    assert as_array([]).shape == (0, 0)
+    assert as_vector(EmbeddingVector(vector=[1.0, 2.0])).dtype == np.float32
+
+
+def test_default_embed_batch_wraps_embed_texts():
+    """Providers without a native batch path still return an EmbeddingBatch."""
+    batch = _ListEmbedder().embed_batch(["ab", "abcd"])
+
+    assert isinstance(batch, EmbeddingBatch)
+    assert batch.array[:, 0].tolist() == [2.0, 4.0]
+
+
+def test_cached_provider_returns_batches():
+    """The cache serves arrays and keeps the per-vector shim working."""
+    inner = _BatchEmbedder()
+    cache = CachedEmbeddingProvider(inner, model_name="fake")
+
+    first = cache.embed_batch(["a", "bb"])
+    second = cache.embed_batch(["bb", "a"])
+
+    assert inner.batch_calls == 1
+    assert second.array.tolist() == first.array[::-1].tolist()
+    assert cache.embed_text("a").vector == [1.0, 1.0, 0.0]
+
+
+def test_services_use_batches_end_to_end():
+    """Indexing and retrieval move embeddings as batches only."""
+    embedder = _BatchEmbedder()
+    store = NumpyVectorStore()
+    IndexingService(embedder, store).index_documents([
+        DocumentBase(id="short", content="ab"),
+        DocumentBase(id="long", content="a" * 40),
+    ])
+
+    results = RetrievalService(embedder, store).retrieve("abc", top_k=1)
+
+    assert embedder.batch_calls == 2
+    assert results[0].chunk.document_id == "short"
@@ -15,7 +15,7 @@ class FakeLLM(LLMInterface):
 class FakeRetrievalService:
     """Fake retrieval service for testing."""
     
-    def retrieve_with_context(self, query: str) -> tuple[list, str]:
+    def retrieve_with_context(self, query: str, **kwargs) -> tuple[list, str]:
         """Return dummy context."""
         return ([], "dummy context")
 
@@ -0,0 +1,178 @@
+"""Tests for the pooled LLM HTTP transports."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+
+import httpx
+import pytest
+
+from app.rag.llm.providers.ollama_provider import OllamaProvider
+from app.rag.llm.transport import AsyncHTTPTransport, HTTPTransport, backoff_delay
+
+
+def _transport(handler, **kwargs) -> HTTPTransport:
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    return HTTPTransport(client=client, backoff_base=0.0, **kwargs)
+
+
+def _flaky(failures: int, error=None, status: int = 503):
+    """Handler failing `failures` times, then answering 200."""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) <= failures:
+            if error is not None:
+                raise error
+            return httpx.Response(status)
+        return httpx.Response(200, json={"response": "ok"})
+
+    return handler, calls
+
+
+def test_backoff_is_bounded_full_jitter():
+    rng = random.Random(0)
+    delays = [backoff_delay(attempt, 0.5, 2.0, rng) for attempt in range(10)]
+
+    assert all(0.0 <= d <= 2.0 for d in delays)
+    assert backoff_delay(0, 0.5, 2.0, rng) <= 0.5
+
+
+def test_transient_status_is_retried():
+    handler, calls = _flaky(2, status=503)
+    transport = _transport(handler, max_retries=2)
+
+    response = transport.post_json("http://llm/api/generate", {})
+
+    assert response.json() == {"response": "ok"}
+    assert len(calls) == 3
+    assert transport.metrics.retries == 2
+    assert transport.metrics.failures == 0
+
+
+def test_connection_errors_are_retried_then_raised():
+    handler, calls = _flaky(5, error=httpx.ConnectError("refused"))
+    transport = _transport(handler, max_retries=1)
+
+    with pytest.raises(httpx.ConnectError):
+        transport.post_json("http://llm/api/generate", {})
+
+    assert len(calls) == 2
+    assert transport.metrics.failures == 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [httpx.ReadTimeout("slow"), httpx.RemoteProtocolError("dropped")],
+    ids=["read-timeout", "dropped"],
+)
+def test_errors_after_sending_are_not_retried(error):
+    """The generation may already be running upstream: never resend the POST."""
+    handler, calls = _flaky(5, error=error)
+    transport = _transport(handler, max_retries=3)
+
+    with pytest.raises(type(error)):
+        transport.post_json("http://llm/api/generate", {})
+
+    assert len(calls) == 1
+    assert transport.metrics.retries == 0
+
+
+@pytest.mark.parametrize("status", [400, 502, 504])
+def test_client_and_gateway_errors_are_not_retried(status):
+    """The request may already be running upstream behind a 502/504."""
+    handler, calls = _flaky(5, status=status)
+    transport = _transport(handler, max_retries=3)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        transport.post_json("http://llm/api/generate", {})
+
+    assert len(calls) == 1
+
+
+def test_stream_retries_before_first_line():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, content=b"a\nb\n")
+
+    transport = _transport(handler, max_retries=1)
+
+    assert list(transport.stream_lines("http://llm/api/generate", {})) == ["a", "b"]
+    assert len(calls) == 2
+    assert transport.metrics.in_use == 0
+
+
+def test_pool_saturation_is_measured():
+    """Requests beyond pool_size wait for a slot and are counted."""
+    gate = threading.Event()
+
+    def handler(request):
+        gate.wait(timeout=5)
+        return httpx.Response(200, json={"response": "ok"})
+
+    transport = _transport(handler, pool_size=2)
+    threads = [
+        threading.Thread(target=transport.post_json, args=("http://llm/x", {}))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    while transport.metrics.in_use < 2:
+        pass
+    assert transport.metrics.saturation == 1.0
+    gate.set()
+    for thread in threads:
+        thread.join()
+
+    metrics = transport.metrics
+    assert metrics.requests == 4
+    assert metrics.peak_in_use == 2
+    assert metrics.waits == 2
+    assert metrics.in_use == 0
+
+
+def test_providers_share_one_transport():
+    handler, calls = _flaky(0)
+    transport = _transport(handler)
+    first = OllamaProvider("http://llm", "a", transport=transport)
+    second = OllamaProvider("http://llm", "b", transport=transport)
+
+    assert first.generate("x") == second.generate("y") == "ok"
+    assert transport.metrics.requests == 2
+
+
+def test_ollama_maps_exhausted_retries_to_runtime_error():
+    handler, _ = _flaky(5, status=503)
+    provider = OllamaProvider("http://llm", "m", transport=_transport(handler, max_retries=1))
+
+    with pytest.raises(RuntimeError, match="Ollama HTTP error: 503"):
+        provider.generate("x")
+
+
+def test_async_transport_retries_and_counts():
+    handler, calls = _flaky(1, error=httpx.ConnectTimeout("slow connect"))
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    transport = AsyncHTTPTransport(client=client, backoff_base=0.0, pool_size=4)
+
+    response = asyncio.run(transport.post_json("http://llm/api/generate", {}))
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+    assert transport.metrics.retries == 1
+
+
+def test_stream_read_timeout_is_not_retried():
+    handler, calls = _flaky(5, error=httpx.ReadTimeout("slow"))
+    transport = _transport(handler, max_retries=2)
+
+    with pytest.raises(httpx.ReadTimeout):
+        list(transport.stream_lines("http://llm/api/generate", {}))
+
+    assert len(calls) == 1
@@ -0,0 +1,181 @@
+"""Tests for the BM25 inverted index and hybrid retrieval."""
+
+from __future__ import annotations
+
+import pytest
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.lexical.bm25 import BM25Index, tokenize
+from app.rag.lexical.fusion import reciprocal_rank_fusion
+from app.rag.models.documents import DocumentBase, DocumentChunk, ScoredDocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.services.index_manifest import IndexManifest
+from app.rag.services.indexing import IndexingService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+class _ThemeEmbedder(EmbeddingInterface):
+    """Embeds by theme words only, so identifiers carry no vector signal."""
+
+    THEMES = ("printer", "network", "billing")
+
+    def embed_text(self, text):
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts):
+        return [
+            EmbeddingVector(vector=[float(t.lower().count(w)) for w in self.THEMES] + [0.1])
+            for t in texts
+        ]
+
+
+def _chunk(chunk_id: str, content: str, document_id: str | None = None) -> DocumentChunk:
+    return DocumentChunk(
+        id=chunk_id, document_id=document_id or chunk_id.split("::")[0], content=content, index=0
+    )
+
+
+def _ids(results):
+    return [r.chunk.id for r in results]
+
+
+DOCUMENTS = [
+    DocumentBase(id="paper-jam", content="Network printer error E-1042 when paper jams."),
+    DocumentBase(id="toner", content="Printer toner is low: replace the printer cartridge."),
+    DocumentBase(id="drivers", content="Printer drivers: install the printer package."),
+    DocumentBase(id="wifi", content="Network drops: restart the router and the network adapter."),
+    DocumentBase(id="invoice", content="Billing invoices for SKU-7731 are sent monthly."),
+]
+
+
+def test_tokenize_keeps_identifiers_and_parts():
+    assert tokenize("Error E-1042, see SKU_77.b") == [
+        "error", "e-1042", "e", "1042", "see", "sku_77.b", "sku", "77", "b",
+    ]
+
+
+def test_bm25_ranks_rare_terms_and_updates_incrementally():
+    index = BM25Index()
+    index.add_chunks([
+        _chunk("a::0", "printer error E-1042 printer"),
+        _chunk("b::0", "printer manual"),
+        _chunk("c::0", "router error"),
+    ])
+
+    assert _ids(index.search("E-1042")) == ["a::0"]
+    assert set(_ids(index.search("printer"))) == {"a::0", "b::0"}
+    assert all(r.score < 0 for r in index.search("error"))
+
+    # Upsert replaces content; deletes by chunk and by document id
+    index.add_chunks([_chunk("a::0", "nothing relevant")])
+    assert index.search("E-1042") == []
+    index.delete_by_document_ids(["b"])
+    index.delete_chunks(["c::0", "missing"])
+    assert index.count() == 1
+    assert index.search("printer error") == []
+
+
+def test_bm25_persists_and_compacts(tmp_path):
+    index = BM25Index(path=str(tmp_path))
+    index.add_chunks([_chunk(f"d{i}::0", f"common term{i}") for i in range(10)])
+    index.delete_chunks([f"d{i}::0" for i in range(5)])
+    index.flush()
+
+    reloaded = BM25Index(path=str(tmp_path))
+
+    assert reloaded.count() == 5
+    assert _ids(reloaded.search("term7")) == ["d7::0"]
+    assert len(reloaded.search("common", top_k=10)) == 5
+    reloaded.add_chunks([_chunk("new::0", "term7 term7")])
+    assert _ids(reloaded.search("term7"))[0] == "new::0"
+
+
+def test_bm25_reader_reloads_flushed_versions(tmp_path):
+    """A reader picks up another process's flush; a torn flush is never seen."""
+    writer = BM25Index(path=str(tmp_path))
+    writer.add_chunks([_chunk("old::0", "legacy E-1042")])
+    writer.flush()
+    reader = BM25Index(path=str(tmp_path))
+    assert _ids(reader.search("E-1042")) == ["old::0"]
+
+    writer.delete_chunks(["old::0"])
+    writer.add_chunks([_chunk("new::0", "fresh TN-450")])
+    writer.flush()
+
+    assert reader.search("E-1042") == []
+    assert _ids(reader.search("TN-450")) == ["new::0"]
+
+    # An interrupted flush (version directory without the pointer switch)
+    (tmp_path / "v00000003").mkdir()
+    (tmp_path / "v00000003" / BM25Index.CONFIG_FILE).write_text("{}", encoding="utf-8")
+    assert _ids(BM25Index(path=str(tmp_path)).search("TN-450")) == ["new::0"]
+    writer.add_chunks([_chunk("next::0", "later")])
+    writer.flush()
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ["v00000002", "v00000004"]
+
+    # Flushing without changes publishes nothing
+    writer.flush()
+    BM25Index(path=str(tmp_path)).flush()
+    assert (tmp_path / BM25Index.POINTER_FILE).read_text(encoding="utf-8") == "v00000004"
+    assert sorted(p.name for p in tmp_path.iterdir() if p.is_dir()) == ["v00000002", "v00000004"]
+
+
+def test_bm25_keeps_unflushed_local_changes(tmp_path):
+    first, second = BM25Index(path=str(tmp_path)), BM25Index(path=str(tmp_path))
+    first.add_chunks([_chunk("a::0", "alpha")])
+    second.add_chunks([_chunk("b::0", "beta")])
+    first.flush()
+
+    assert _ids(second.search("beta")) == ["b::0"]
+
+
+def test_reciprocal_rank_fusion():
+    first = [ScoredDocumentChunk(chunk=_chunk(c, c), score=0.0) for c in ("a", "b", "c")]
+    second = [ScoredDocumentChunk(chunk=_chunk(c, c), score=0.0) for c in ("c", "a")]
+
+    fused = reciprocal_rank_fusion([first, second], k=60)
+
+    assert _ids(fused) == ["a", "c", "b"]
+    assert fused[0].score == pytest.approx(-(1 / 61 + 1 / 62))
+    assert len(reciprocal_rank_fusion([first, second], top_k=1)) == 1
+
+
+def test_indexing_service_keeps_lexical_index_in_sync(tmp_path):
+    lexical = BM25Index(path=str(tmp_path / "bm25"))
+    service = IndexingService(
+        _ThemeEmbedder(), NumpyVectorStore(), lexical_index=lexical,
+        manifest=IndexManifest(str(tmp_path / "manifest.db")),
+    )
+    service.index_documents_incremental(DOCUMENTS)
+    assert lexical.count() == len(DOCUMENTS)
+
+    service.index_documents_incremental(DOCUMENTS[1:], remove_missing=True)
+    service.replace_documents([DocumentBase(id="toner", content="Toner TN-450 fits.")])
+
+    reloaded = BM25Index(path=str(tmp_path / "bm25"))
+    assert reloaded.search("E-1042") == []
+    assert _ids(reloaded.search("TN-450")) == ["toner::chunk:0"]
+
+
+def test_hybrid_retrieval_finds_exact_identifiers():
+    """Vector search misses the error code; hybrid fusion brings it into top_k."""
+    store, lexical = NumpyVectorStore(), BM25Index()
+    IndexingService(_ThemeEmbedder(), store, lexical_index=lexical).index_documents(DOCUMENTS)
+
+    vector = RetrievalService(_ThemeEmbedder(), store)
+    hybrid = RetrievalService(
+        _ThemeEmbedder(), store, lexical_index=lexical, retrieval_mode="hybrid"
+    )
+    query = "printer E-1042"
+
+    assert "paper-jam" not in [r.chunk.document_id for r in vector.retrieve(query, top_k=2)]
+    assert "paper-jam" in [r.chunk.document_id for r in hybrid.retrieve(query, top_k=2)]
+    assert hybrid.retrieve_many(["SKU-7731"], top_k=1)[0][0].chunk.document_id == "invoice"
+
+
+def test_hybrid_mode_requires_an_index():
+    with pytest.raises(ValueError, match="lexical_index"):
+        RetrievalService(_ThemeEmbedder(), NumpyVectorStore(), retrieval_mode="hybrid")
+    with pytest.raises(ValueError, match="retrieval_mode"):
+        RetrievalService(_ThemeEmbedder(), NumpyVectorStore(), retrieval_mode="bm25")
@@ -0,0 +1,170 @@
+"""Tests for manifest-based incremental indexing."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from app.rag.chunking.fixed_size import FixedSizeChunker
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.models.documents import DocumentBase
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.services.index_manifest import IndexManifest
+from app.rag.services.indexing import IndexingService
+
+
+class _CountingEmbedder(EmbeddingInterface):
+    """Fake embedder counting embedded texts."""
+
+    def __init__(self) -> None:
+        self.embedded = 0
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts):
+        self.embedded += len(texts)
+        return [EmbeddingVector(vector=[1.0, 0.0]) for _ in texts]
+
+
+class _DictVectorStore(VectorStoreInterface):
+    """Vector store keeping chunks in a dict keyed by chunk ID."""
+
+    def __init__(self) -> None:
+        self.chunks = {}
+
+    def add_chunks(self, chunks, embeddings):
+        for chunk in chunks:
+            self.chunks[chunk.id] = chunk
+
+    def query(self, embedding, top_k: int = 5):
+        return []
+
+    def delete_by_document_ids(self, document_ids):
+        for chunk_id, chunk in list(self.chunks.items()):
+            if chunk.document_id in document_ids:
+                del self.chunks[chunk_id]
+
+    def delete_chunks(self, chunk_ids):
+        for chunk_id in chunk_ids:
+            self.chunks.pop(chunk_id, None)
+
+
+def _service(manifest: IndexManifest, embedder, store) -> IndexingService:
+    return IndexingService(
+        embedder=embedder,
+        vector_store=store,
+        chunker=FixedSizeChunker(chunk_size=40, chunk_overlap=0),
+        batch_size=3,
+        manifest=manifest,
+    )
+
+
+def test_unchanged_documents_are_skipped():
+    """Second run with identical input embeds nothing."""
+    embedder, store = _CountingEmbedder(), _DictVectorStore()
+    service = _service(IndexManifest(), embedder, store)
+    documents = [DocumentBase(id=f"doc{i}", content=f"Document {i}") for i in range(5)]
+
+    first = service.index_documents_incremental(documents)
+    embedded_after_first = embedder.embedded
+    second = service.index_documents_incremental(documents)
+
+    assert first.added == 5
+    assert second.unchanged == 5
+    assert second.added == second.updated == 0
+    assert embedder.embedded == embedded_after_first
+
+
+def test_metadata_change_counts_as_update():
+    """Changing only metadata re-indexes the document."""
+    embedder, store = _CountingEmbedder(), _DictVectorStore()
+    service = _service(IndexManifest(), embedder, store)
+
+    service.index_documents_incremental([DocumentBase(id="d", content="Text", metadata={"v": 1})])
+    report = service.index_documents_incremental(
+        [DocumentBase(id="d", content="Text", metadata={"v": 2})]
+    )
+
+    assert report.updated == 1
+    assert store.chunks["d::chunk:0"].metadata == {"v": 2}
+
+
+def test_shrinking_document_deletes_stale_chunks():
+    """Chunks that disappear after an edit are removed from the store."""
+    embedder, store = _CountingEmbedder(), _DictVectorStore()
+    service = _service(IndexManifest(), embedder, store)
+    long_text = " ".join(f"word{i:03d}" for i in range(40))
+
+    service.index_documents_incremental([DocumentBase(id="d", content=long_text)])
+    chunk_count = len(store.chunks)
+    report = service.index_documents_incremental([DocumentBase(id="d", content="short")])
+
+    assert chunk_count > 1
+    assert report.updated == 1
+    assert report.chunks_deleted == chunk_count - 1
+    assert list(store.chunks) == ["d::chunk:0"]
+
+
+def test_only_changed_chunks_are_reembedded():
+    """Appending text re-embeds only the chunks that changed."""
+    embedder, store = _CountingEmbedder(), _DictVectorStore()
+    service = _service(IndexManifest(), embedder, store)
+    base = " ".join(f"word{i:03d}" for i in range(20))
+
+    service.index_documents_incremental([DocumentBase(id="d", content=base)])
+    before = embedder.embedded
+    report = service.index_documents_incremental(
+        [DocumentBase(id="d", content=base + " extra")]
+    )
+
+    assert report.updated == 1
+    assert 0 < report.chunks_embedded < len(store.chunks)
+    assert embedder.embedded - before == report.chunks_embedded
+
+
+def test_remove_missing_documents(tmp_path: Path):
+    """Documents absent from a full run are removed, manifest persists to disk."""
+    embedder, store = _CountingEmbedder(), _DictVectorStore()
+    manifest_path = str(tmp_path / "manifest.sqlite")
+    service = _service(IndexManifest(manifest_path), embedder, store)
+
+    service.index_documents_incremental(
+        [DocumentBase(id="keep", content="Keep me"), DocumentBase(id="gone", content="Bye")]
+    )
+
+    reopened = _service(IndexManifest(manifest_path), embedder, store)
+    report = reopened.index_documents_incremental(
+        [DocumentBase(id="keep", content="Keep me")],
+        remove_missing=True,
+    )
+
+    assert report.unchanged == 1
+    assert report.removed == 1
+    assert list(store.chunks) == ["keep::chunk:0"]
+
+
+def test_incremental_requires_manifest():
+    """Without a manifest the incremental mode is unavailable."""
+    service = IndexingService(embedder=_CountingEmbedder(), vector_store=_DictVectorStore())
+    with pytest.raises(RuntimeError, match="IndexManifest"):
+        service.index_documents_incremental([])
+
+
+def test_replace_documents_drops_trailing_chunks():
+    """Full replace (no manifest) removes chunks of documents that shrank."""
+    store = _DictVectorStore()
+    service = IndexingService(
+        embedder=_CountingEmbedder(),
+        vector_store=store,
+        chunker=FixedSizeChunker(chunk_size=40, chunk_overlap=0),
+    )
+    long_text = " ".join(f"word{i:03d}" for i in range(40))
+
+    service.index_documents([DocumentBase(id="d", content=long_text)])
+    total = service.replace_documents([DocumentBase(id="d", content="short")])
+
+    assert total == 1
+    assert list(store.chunks) == ["d::chunk:0"]
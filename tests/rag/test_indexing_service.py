@@ -1,5 +1,11 @@
+import pytest
+
+from app.rag.chunking.sentence import SentenceChunker
+from app.rag.chunking.token import TokenChunker
 from app.rag.interfaces.embeddings import EmbeddingInterface
 from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.lexical.bm25 import BM25Index
+from app.rag.models.settings import RAGSettings
 from app.rag.services.indexing import IndexingService
 
 
@@ -21,10 +27,48 @@ class _DummyVectorStore(VectorStoreInterface):
     def delete_by_document_ids(self, document_ids):
         raise NotImplementedError
 
+    def delete_chunks(self, chunk_ids):
+        raise NotImplementedError
+
 
 def test_indexing_service_can_be_constructed() -> None:
     service = IndexingService(
         embedder=_DummyEmbedder(),
         vector_store=_DummyVectorStore(),
     )
-    assert service is not None
\ No newline at end of file
+    assert service is not None
+
+
+class _TokenCountingEmbedder(_DummyEmbedder):
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+
+def test_from_settings_applies_chunking_and_batch_settings(tmp_path) -> None:
+    settings = RAGSettings(
+        chunking_strategy="sentence",
+        chunk_size=300,
+        chunk_overlap=50,
+        indexing_batch_size=16,
+        retrieval_mode="hybrid",
+        lexical_index_dir=str(tmp_path / "lexical"),
+    )
+
+    service = IndexingService.from_settings(settings, _DummyEmbedder(), _DummyVectorStore())
+
+    assert isinstance(service._chunker, SentenceChunker)
+    assert service._batch_size == 16
+    assert isinstance(service._lexical_index, BM25Index)
+
+
+def test_from_settings_token_chunker_uses_embedder_tokenizer() -> None:
+    settings = RAGSettings(chunking_strategy="token", chunk_max_tokens=4, chunk_overlap_tokens=1)
+
+    service = IndexingService.from_settings(
+        settings, _TokenCountingEmbedder(), _DummyVectorStore()
+    )
+
+    assert isinstance(service._chunker, TokenChunker)
+    assert service._lexical_index is None
+    with pytest.raises(ValueError):
+        IndexingService.from_settings(settings, _DummyEmbedder(), _DummyVectorStore())
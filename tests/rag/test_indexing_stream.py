@@ -0,0 +1,99 @@
+"""Tests for chunked, streaming indexing in IndexingService."""
+
+from __future__ import annotations
+
+from app.rag.chunking.fixed_size import FixedSizeChunker
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.models.documents import DocumentBase
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.services.indexing import IndexingService
+
+
+class _FakeEmbedder(EmbeddingInterface):
+    """Deterministic embedder recording batch sizes."""
+
+    def __init__(self) -> None:
+        self.batch_sizes = []
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return EmbeddingVector(vector=[float(len(text)), 1.0])
+
+    def embed_texts(self, texts):
+        self.batch_sizes.append(len(texts))
+        return [self.embed_text(text) for text in texts]
+
+
+class _RecordingVectorStore(VectorStoreInterface):
+    """Vector store keeping upserted chunks by ID."""
+
+    def __init__(self) -> None:
+        self.chunks = {}
+        self.calls = 0
+
+    def add_chunks(self, chunks, embeddings):
+        assert len(chunks) == len(embeddings)
+        self.calls += 1
+        for chunk in chunks:
+            self.chunks[chunk.id] = chunk
+
+    def query(self, embedding, top_k: int = 5):
+        return []
+
+    def delete_by_document_ids(self, document_ids):
+        raise NotImplementedError
+
+    def delete_chunks(self, chunk_ids):
+        raise NotImplementedError
+
+
+def test_long_document_is_split_with_deterministic_ids():
+    """Long documents produce multiple chunks using the {doc}::chunk:{i} scheme."""
+    store = _RecordingVectorStore()
+    service = IndexingService(
+        embedder=_FakeEmbedder(),
+        vector_store=store,
+        chunker=FixedSizeChunker(chunk_size=50, chunk_overlap=10),
+    )
+    document = DocumentBase(
+        id="big",
+        content=" ".join(f"word{i}" for i in range(100)),
+        metadata={"source": "test"},
+    )
+
+    service.index_documents([document])
+
+    ids = sorted(store.chunks, key=lambda chunk_id: store.chunks[chunk_id].index)
+    assert len(ids) > 1
+    assert ids == [f"big::chunk:{i}" for i in range(len(ids))]
+    assert all(chunk.metadata == {"source": "test"} for chunk in store.chunks.values())
+
+
+def test_stream_uses_bounded_micro_batches():
+    """Streaming indexing never embeds more than batch_size chunks at once."""
+    embedder = _FakeEmbedder()
+    store = _RecordingVectorStore()
+    service = IndexingService(embedder=embedder, vector_store=store, batch_size=4)
+
+    def documents():
+        for i in range(10):
+            yield DocumentBase(id=f"doc{i}", content=f"Document number {i}")
+
+    total = service.index_documents_stream(documents())
+
+    assert total == 10
+    assert embedder.batch_sizes == [4, 4, 2]
+    assert store.calls == 3
+    assert len(store.chunks) == 10
+
+
+def test_reindexing_same_documents_is_idempotent():
+    """Re-indexing produces the same chunk IDs (upsert, not insert)."""
+    store = _RecordingVectorStore()
+    service = IndexingService(embedder=_FakeEmbedder(), vector_store=store)
+    documents = [DocumentBase(id="doc1", content="Stable content")]
+
+    service.index_documents(documents)
+    service.index_documents(documents)
+
+    assert list(store.chunks) == ["doc1::chunk:0"]
@@ -0,0 +1,126 @@
+"""Tests for the IVF approximate nearest-neighbour store."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.rag.models.documents import DocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.services.recall_report import measure_recall, sweep_nprobe
+from app.rag.vectorstores.ivf_store import IVFVectorStore
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+def _clustered_data(n: int = 2000, dim: int = 16, clusters: int = 20, seed: int = 0):
+    """Gaussian blobs around random centers (realistic for embeddings)."""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=n)
+    return centers[labels] + 0.3 * rng.normal(size=(n, dim)), rng
+
+
+def _fill(store, vectors) -> None:
+    chunks = [
+        DocumentChunk(id=f"doc{i}::chunk:0", document_id=f"doc{i}", content=f"c{i}", index=0)
+        for i in range(len(vectors))
+    ]
+    embeddings = [EmbeddingVector(vector=list(v)) for v in vectors]
+    for start in range(0, len(chunks), 256):
+        store.add_chunks(chunks[start:start + 256], embeddings[start:start + 256])
+
+
+def test_untrained_index_is_exact():
+    """Below min_train_size the IVF store answers exactly."""
+    vectors, rng = _clustered_data(n=100)
+    exact, ivf = NumpyVectorStore(), IVFVectorStore(nlist=16, nprobe=1)
+    _fill(exact, vectors)
+    _fill(ivf, vectors)
+
+    assert not ivf.is_trained
+    query = EmbeddingVector(vector=list(rng.normal(size=16)))
+    assert [r.chunk.id for r in ivf.query(query, top_k=5)] == [r.chunk.id for r in exact.query(query, top_k=5)]
+
+
+def test_trains_automatically_and_recall_grows_with_nprobe():
+    """Once trained, recall increases with nprobe and reaches 1.0 at nprobe=nlist."""
+    vectors, rng = _clustered_data()
+    exact, ivf = NumpyVectorStore(), IVFVectorStore(nlist=32, nprobe=1, min_train_size=500)
+    _fill(exact, vectors)
+    _fill(ivf, vectors)
+    queries = [EmbeddingVector(vector=list(q)) for q in rng.normal(size=(30, 16))]
+
+    reports = sweep_nprobe(exact, ivf, queries, [1, 4, 32], top_k=10)
+
+    assert ivf.is_trained
+    assert ivf.nprobe == 1  # restored after the sweep
+    recalls = [report.recall for report in reports]
+    assert recalls == sorted(recalls)
+    assert recalls[-1] == pytest.approx(1.0)
+    assert reports[1].recall > 0.5
+
+
+def test_incremental_inserts_and_deletes_after_training():
+    """Vectors added after training are searchable; deletes are honoured."""
+    vectors, _ = _clustered_data(n=600)
+    ivf = IVFVectorStore(nlist=8, nprobe=8, min_train_size=500)
+    _fill(ivf, vectors)
+
+    new_chunk = DocumentChunk(id="new::chunk:0", document_id="new", content="new", index=0)
+    target = [1.0] + [0.0] * 15
+    ivf.add_chunks([new_chunk], [EmbeddingVector(vector=target)])
+    assert ivf.query(EmbeddingVector(vector=target), top_k=1)[0].chunk.id == "new::chunk:0"
+
+    ivf.delete_by_document_ids(["new"])
+    assert ivf.query(EmbeddingVector(vector=target), top_k=1)[0].chunk.id != "new::chunk:0"
+
+
+def test_save_and_load_round_trip(tmp_path: Path):
+    """A saved index loads with identical results."""
+    vectors, rng = _clustered_data(n=800)
+    ivf = IVFVectorStore(nlist=8, nprobe=2, min_train_size=500)
+    _fill(ivf, vectors)
+    ivf.save(str(tmp_path / "ivf"))
+
+    loaded = IVFVectorStore.load(str(tmp_path / "ivf"))
+    query = EmbeddingVector(vector=list(rng.normal(size=16)))
+
+    assert loaded.is_trained
+    assert loaded.count() == ivf.count()
+    assert [r.chunk.id for r in loaded.query(query)] == [r.chunk.id for r in ivf.query(query)]
+
+
+def test_save_publishes_complete_versions(tmp_path: Path):
+    """Readers load the last complete save; interrupted saves are ignored."""
+    vectors, rng = _clustered_data(n=600)
+    ivf = IVFVectorStore(nlist=8, nprobe=8, min_train_size=500)
+    _fill(ivf, vectors)
+    directory = tmp_path / "ivf"
+    ivf.save(str(directory))
+    ivf.delete_by_document_ids(["doc0", "doc1"])
+    ivf.save(str(directory))
+
+    # A save that crashed before switching the pointer
+    (directory / "v00000003").mkdir()
+    (directory / "v00000003" / IVFVectorStore.CONFIG_FILE).write_text("{}", encoding="utf-8")
+
+    assert IVFVectorStore.saved_index_exists(str(directory))
+    assert IVFVectorStore.load(str(directory)).count() == ivf.count()
+    ivf.save(str(directory))
+    assert sorted(p.name for p in directory.iterdir() if p.is_dir()) == ["v00000002", "v00000004"]
+    assert not IVFVectorStore.saved_index_exists(str(tmp_path / "missing"))
+
+
+def test_measure_recall_reports_latency():
+    """Recall report of a store against itself is perfect."""
+    vectors, rng = _clustered_data(n=50)
+    exact = NumpyVectorStore()
+    _fill(exact, vectors)
+
+    report = measure_recall(exact, exact, [EmbeddingVector(vector=list(rng.normal(size=16)))], top_k=5)
+
+    assert report.recall == 1.0
+    assert report.queries == 1
+    assert report.exact_latency_ms >= 0.0
@@ -0,0 +1,125 @@
+"""Tests for streaming generation (Ollama NDJSON, RAG services)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.rag.cache.response_cache import ResponseCache
+from app.rag.llm.interfaces.llm_interface import LLMInterface
+from app.rag.llm.providers.async_ollama_provider import AsyncOllamaProvider
+from app.rag.llm.providers.ollama_provider import OllamaProvider
+from app.rag.llm.transport import AsyncHTTPTransport, HTTPTransport
+from app.rag.services.rag_llm_service import RAGLLMService
+
+_NDJSON = b"".join(
+    json.dumps(line).encode("utf-8") + b"\n"
+    for line in [
+        {"response": "Hel", "done": False},
+        {"response": "lo", "done": False},
+        {"response": "", "done": True},
+    ]
+)
+
+
+class FakeLLM(LLMInterface):
+    """LLM implementing only generate()."""
+
+    def generate(self, prompt: str) -> str:
+        return "whole answer"
+
+
+class FakeRetrievalService:
+    def retrieve_with_context(self, query: str, **kwargs) -> tuple[list, str]:
+        return ([], "dummy context")
+
+
+def _ollama(handler) -> OllamaProvider:
+    transport = HTTPTransport(client=httpx.Client(transport=httpx.MockTransport(handler)))
+    return OllamaProvider(base_url="http://ollama:11434", model="llama2", transport=transport)
+
+
+def test_ollama_stream_yields_ndjson_fragments():
+    """Fragments are yielded per NDJSON line until done."""
+    sent = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        sent.append(json.loads(request.content))
+        return httpx.Response(200, content=_NDJSON)
+
+    fragments = list(_ollama(handler).generate_stream("prompt"))
+
+    assert fragments == ["Hel", "lo"]
+    assert sent[0]["stream"] is True
+
+
+def test_ollama_stream_error_line_raises():
+    provider = _ollama(lambda request: httpx.Response(200, content=b'{"error": "model not found"}\n'))
+
+    with pytest.raises(RuntimeError, match="model not found"):
+        list(provider.generate_stream("prompt"))
+
+
+def test_default_stream_falls_back_to_generate():
+    assert list(FakeLLM().generate_stream("prompt")) == ["whole answer"]
+
+
+def test_answer_stream_yields_llm_fragments():
+    service = RAGLLMService(retrieval_service=FakeRetrievalService(), llm=FakeLLM())
+
+    assert list(service.answer_stream("question")) == ["whole answer"]
+
+
+def test_async_ollama_stream():
+    """The async provider streams lines from a pooled client."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=_NDJSON)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = AsyncOllamaProvider(
+        "http://ollama:11434", "llama2", transport=AsyncHTTPTransport(client=client)
+    )
+
+    async def collect():
+        return [fragment async for fragment in provider.generate_stream("prompt")]
+
+    assert asyncio.run(collect()) == ["Hel", "lo"]
+
+
+def test_truncated_stream_raises_and_is_not_cached():
+    """A stream cut before the "done" line is an error, never a cached answer."""
+    truncated = _NDJSON.rsplit(b"\n", 2)[0] + b"\n"
+    service = RAGLLMService(
+        retrieval_service=FakeRetrievalService(),
+        llm=_ollama(lambda request: httpx.Response(200, content=truncated)),
+        cache=ResponseCache(),
+    )
+
+    fragments = []
+    with pytest.raises(RuntimeError, match="ended before done"):
+        for fragment in service.answer_stream("question"):
+            fragments.append(fragment)
+
+    assert fragments == ["Hel", "lo"]
+    assert service.cache.get(service._cache_key("question")) is None
+
+
+def test_async_truncated_stream_raises():
+    truncated = _NDJSON.rsplit(b"\n", 2)[0] + b"\n"
+    client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: httpx.Response(200, content=truncated))
+    )
+    provider = AsyncOllamaProvider(
+        "http://ollama:11434", "llama2", transport=AsyncHTTPTransport(client=client)
+    )
+
+    async def collect():
+        return [fragment async for fragment in provider.generate_stream("prompt")]
+
+    with pytest.raises(RuntimeError, match="ended before done"):
+        asyncio.run(collect())
@@ -0,0 +1,278 @@
+"""Tests for structured metadata filters in vector stores and retrieval."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.rag.cache.semantic_cache import SemanticCache
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.lexical.bm25 import BM25Index
+from app.rag.models.documents import DocumentBase, DocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.models.filters import MetadataFilter, Range
+from app.rag.quantization.scalar import ScalarQuantizer
+from app.rag.services.indexing import IndexingService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.chroma import ChromaVectorStore
+from app.rag.vectorstores.ivf_store import IVFVectorStore
+from app.rag.vectorstores.mmap_store import MmapVectorStore
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+from app.rag.vectorstores.quantized_store import QuantizedVectorStore
+
+DIM = 8
+
+
+def _chunks(n: int):
+    """Chunk i: lang alternates en/de, year 2015 + i % 10, draft when i % 3 == 0."""
+    return [
+        DocumentChunk(
+            id=f"doc{i}::chunk:0",
+            document_id=f"doc{i}",
+            content=f"text {i}",
+            index=0,
+            metadata={
+                "lang": "en" if i % 2 == 0 else "de",
+                "year": 2015 + i % 10,
+                "draft": i % 3 == 0,
+            },
+        )
+        for i in range(n)
+    ]
+
+
+def _vectors(n: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+
+
+def _reference(chunks, vectors, query, filters, top_k):
+    """Exact filtered nearest neighbours by brute force."""
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    similarities = normalized @ (query / np.linalg.norm(query))
+    allowed = [i for i, chunk in enumerate(chunks) if filters.matches(chunk)]
+    best = sorted(allowed, key=lambda i: -similarities[i])[:top_k]
+    return [chunks[i].id for i in best]
+
+
+def _ids(results):
+    return [r.chunk.id for r in results]
+
+
+FILTER = MetadataFilter(
+    equals={"lang": "en"},
+    any_of={"year": [2017, 2019, 2021, 2023]},
+    ranges={"year": Range(gte=2018)},
+)
+
+
+def test_filter_semantics():
+    chunk = _chunks(4)[3]  # de, 2018, draft
+
+    assert MetadataFilter().is_empty
+    assert MetadataFilter().matches(chunk)
+    assert MetadataFilter(equals={"draft": True}).matches(chunk)
+    assert not MetadataFilter(equals={"draft": 1}).matches(chunk)
+    assert MetadataFilter(equals={"year": 2018.0, "document_id": "doc3"}).matches(chunk)
+    assert MetadataFilter(any_of={"lang": ["en", "de"]}).matches(chunk)
+    assert not MetadataFilter(ranges={"year": Range(gt=2018)}).matches(chunk)
+    assert not MetadataFilter(ranges={"lang": Range(lt=1)}).matches(chunk)
+    assert not MetadataFilter(equals={"missing": "x"}).matches(chunk)
+    with pytest.raises(ValueError):
+        Range()
+    with pytest.raises(ValueError):
+        MetadataFilter(equals={"$and": 1})
+    with pytest.raises(ValueError):
+        MetadataFilter(any_of={"lang": []})
+
+
+@pytest.mark.parametrize(
+    "make_store",
+    [
+        lambda tmp_path: NumpyVectorStore(initial_capacity=4),
+        lambda tmp_path: IVFVectorStore(nlist=8, nprobe=1, min_train_size=64),
+        lambda tmp_path: QuantizedVectorStore(ScalarQuantizer(), train_size=64),
+        lambda tmp_path: MmapVectorStore(str(tmp_path / "mmap")),
+    ],
+    ids=["numpy", "ivf", "quantized", "mmap"],
+)
+def test_filtered_query_returns_only_matches(tmp_path, make_store):
+    chunks, vectors = _chunks(200), _vectors(200)
+    store = make_store(tmp_path)
+    store.add_chunks(chunks, vectors)
+    queries = _vectors(3, seed=1)
+
+    for query, results in zip(queries, store.query_many(queries, top_k=5, filters=FILTER)):
+        assert len(results) == 5
+        assert all(FILTER.matches(r.chunk) for r in results)
+    # Filters narrowing to a handful of rows still fill top_k (IVF scans them exactly)
+    narrow = MetadataFilter(any_of={"document_id": ["doc1", "doc7", "doc150"]})
+    assert sorted(_ids(store.query(queries[0], top_k=5, filters=narrow))) == [
+        "doc150::chunk:0", "doc1::chunk:0", "doc7::chunk:0",
+    ]
+    assert store.query(queries[0], top_k=5, filters=MetadataFilter(equals={"lang": "fr"})) == []
+
+
+def test_numpy_filters_are_exact_and_survive_updates():
+    chunks, vectors = _chunks(100), _vectors(100)
+    store = NumpyVectorStore(initial_capacity=8, compaction_ratio=0.1)
+    store.add_chunks(chunks, vectors)
+    query = _vectors(1, seed=2)[0]
+
+    assert _ids(store.query(query, top_k=10, filters=FILTER)) == _reference(
+        chunks, vectors, query, FILTER, 10
+    )
+
+    # Delete (compacting) and upsert chunks with changed metadata
+    store.delete_by_document_ids([f"doc{i}" for i in range(0, 100, 4)])
+    moved = chunks[2].model_copy(update={"metadata": {"lang": "de", "year": 2020}})
+    store.add_chunks([moved], vectors[2:3])
+    remaining = [c for i, c in enumerate(chunks) if i % 4 and i != 2] + [moved]
+    remaining_vectors = np.vstack(
+        [vectors[i] for i in range(100) if i % 4 and i != 2] + [vectors[2]]
+    )
+
+    assert _ids(store.query(query, top_k=10, filters=FILTER)) == _reference(
+        remaining, remaining_vectors, query, FILTER, 10
+    )
+
+
+def test_mmap_filters_follow_other_writers_and_compaction(tmp_path):
+    chunks, vectors = _chunks(100), _vectors(100)
+    writer = MmapVectorStore(str(tmp_path / "mmap"))
+    writer.add_chunks(chunks[:60], vectors[:60])
+    reader = MmapVectorStore(str(tmp_path / "mmap"))
+    query = _vectors(1, seed=2)[0]
+
+    assert _ids(reader.query(query, top_k=10, filters=FILTER)) == _reference(
+        chunks[:60], vectors[:60], query, FILTER, 10
+    )
+
+    # The reader's index catches up with appended rows and overwrites
+    moved = chunks[2].model_copy(update={"metadata": {"lang": "de", "year": 2020}})
+    writer.add_chunks(chunks[60:] + [moved], np.vstack([vectors[60:], vectors[2:3]]))
+    remaining = [c for i, c in enumerate(chunks) if i != 2] + [moved]
+    remaining_vectors = np.vstack([vectors[:2], vectors[3:], vectors[2:3]])
+    assert _ids(reader.query(query, top_k=10, filters=FILTER)) == _reference(
+        remaining, remaining_vectors, query, FILTER, 10
+    )
+    reader.close()
+
+    writer.delete_by_document_ids([f"doc{i}" for i in range(0, 100, 4)])
+    writer.compact()
+    kept = [i for i, c in enumerate(remaining) if int(c.document_id[3:]) % 4]
+    assert _ids(writer.query(query, top_k=10, filters=FILTER)) == _reference(
+        [remaining[i] for i in kept], remaining_vectors[kept], query, FILTER, 10
+    )
+
+
+def test_backends_agree_on_unusual_field_names(tmp_path):
+    names = ['say "hi"', "a.b", "it's", "[0]"]
+    chunks = [
+        DocumentChunk(
+            id=f"doc{i}::chunk:0",
+            document_id=f"doc{i}",
+            content="text",
+            index=0,
+            metadata={name: i % 2 for name in names},
+        )
+        for i in range(10)
+    ]
+    vectors = _vectors(10)
+    numpy_store, mmap_store = NumpyVectorStore(), MmapVectorStore(str(tmp_path / "mmap"))
+    for store in (numpy_store, mmap_store):
+        store.add_chunks(chunks, vectors)
+
+    for name in names:
+        filters = MetadataFilter(equals={name: 1}, ranges={name: Range(gte=1)})
+        expected = _reference(chunks, vectors, vectors[0], filters, 10)
+        assert len(expected) == 5
+        assert _ids(numpy_store.query(vectors[0], top_k=10, filters=filters)) == expected
+        assert _ids(mmap_store.query(vectors[0], top_k=10, filters=filters)) == expected
+
+
+def test_chroma_translates_filters_to_where():
+    class _FakeCollection:
+        def __init__(self) -> None:
+            self.kwargs = []
+
+        def query(self, query_embeddings, n_results, **kwargs):
+            self.kwargs.append(kwargs)
+            return {"ids": [], "distances": [], "documents": [], "metadatas": []}
+
+    store = ChromaVectorStore.__new__(ChromaVectorStore)
+    store._collection = _FakeCollection()
+
+    store.query([1.0, 0.0], top_k=3, filters=FILTER)
+    store.query([1.0, 0.0], top_k=3, filters=MetadataFilter(equals={"lang": "en"}))
+    store.query([1.0, 0.0], top_k=3, filters=MetadataFilter(any_of={"lang": ["en"]}))
+    store.query([1.0, 0.0], top_k=3, filters=MetadataFilter())
+
+    assert store._collection.kwargs == [
+        {"where": {"$and": [
+            {"lang": {"$eq": "en"}},
+            {"$or": [{"year": {"$eq": year}} for year in (2017, 2019, 2021, 2023)]},
+            {"year": {"$gte": 2018.0}},
+        ]}},
+        {"where": {"lang": {"$eq": "en"}}},
+        {"where": {"lang": {"$eq": "en"}}},
+        {},
+    ]
+
+
+class _KeywordEmbedder(EmbeddingInterface):
+    """Counts of a few keywords plus a constant dimension."""
+
+    WORDS = ("printer", "router", "invoice")
+
+    def embed_text(self, text):
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts):
+        return [
+            EmbeddingVector(vector=[float(t.lower().count(w)) for w in self.WORDS] + [0.5])
+            for t in texts
+        ]
+
+
+DOCUMENTS = [
+    DocumentBase(id="p-en", content="Printer printer setup", metadata={"lang": "en"}),
+    DocumentBase(id="p-de", content="Printer printer Einrichtung", metadata={"lang": "de"}),
+    DocumentBase(id="r-de", content="Router printer Neustart", metadata={"lang": "de"}),
+]
+
+
+def test_retrieval_pushes_filters_down_and_bypasses_the_cache():
+    store = NumpyVectorStore()
+    IndexingService(_KeywordEmbedder(), store).index_documents(DOCUMENTS)
+    service = RetrievalService(
+        _KeywordEmbedder(), store, semantic_cache=SemanticCache(threshold=0.99)
+    )
+    german = MetadataFilter(equals={"lang": "de"})
+
+    unfiltered = service.retrieve("printer", top_k=1)
+    filtered = service.retrieve("printer", top_k=2, filters=german)
+    batched = service.retrieve_many(["printer", "router"], top_k=1, filters=german)
+
+    assert unfiltered[0].chunk.document_id == "p-en"
+    assert [r.chunk.document_id for r in filtered] == ["p-de", "r-de"]
+    assert [results[0].chunk.document_id for results in batched] == ["p-de", "r-de"]
+    assert service.retrieve("printer", top_k=1)[0].chunk.document_id == "p-en"
+    stats = service.semantic_cache.stats
+    assert (stats.size, stats.hits) == (1, 1)
+
+
+def test_hybrid_retrieval_filters_lexical_results():
+    store, lexical = NumpyVectorStore(), BM25Index()
+    IndexingService(_KeywordEmbedder(), store, lexical_index=lexical).index_documents(DOCUMENTS)
+    service = RetrievalService(
+        _KeywordEmbedder(), store, lexical_index=lexical, retrieval_mode="hybrid"
+    )
+
+    results = service.retrieve("Einrichtung setup", top_k=3, filters=MetadataFilter(
+        any_of={"lang": ["en"]}
+    ))
+
+    assert [r.chunk.document_id for r in results] == ["p-en"]
+    assert [r.chunk.id for r in lexical.search(
+        "printer", filters=MetadataFilter(equals={"document_id": "r-de"})
+    )] == ["r-de::chunk:0"]
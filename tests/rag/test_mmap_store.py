@@ -0,0 +1,134 @@
+"""Tests for the memory-mapped persistent vector store."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.rag.models.documents import DocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.vectorstores.mmap_store import MmapVectorStore
+
+
+def _chunk(document_id: str, index: int = 0, **metadata) -> DocumentChunk:
+    return DocumentChunk(
+        id=f"{document_id}::chunk:{index}",
+        document_id=document_id,
+        content=f"{document_id} content {index}",
+        index=index,
+        metadata=metadata,
+    )
+
+
+def _vec(*values: float) -> EmbeddingVector:
+    return EmbeddingVector(vector=list(values))
+
+
+def test_reopen_reads_persisted_index(tmp_path: Path):
+    """A new instance maps the existing files and returns the same results."""
+    directory = str(tmp_path / "index")
+    store = MmapVectorStore(directory)
+    store.add_chunks(
+        [_chunk("a", source="x"), _chunk("b")],
+        [_vec(1, 0, 0), _vec(0, 1, 0)],
+    )
+    store.close()
+
+    reopened = MmapVectorStore(directory)
+    results = reopened.query(_vec(1, 0, 0), top_k=2)
+
+    assert reopened.count() == 2
+    assert isinstance(reopened._vectors, np.memmap)
+    assert [r.chunk.document_id for r in results] == ["a", "b"]
+    assert results[0].score == pytest.approx(0.0, abs=1e-6)
+    assert results[0].chunk.metadata == {"source": "x"}
+
+
+def test_reader_sees_rows_appended_by_writer(tmp_path: Path):
+    """A second instance on the same directory picks up appended rows."""
+    directory = str(tmp_path / "index")
+    writer = MmapVectorStore(directory)
+    writer.add_chunks([_chunk("a")], [_vec(1, 0)])
+    reader = MmapVectorStore(directory)
+
+    writer.add_chunks([_chunk("b")], [_vec(0, 1)])
+
+    assert [r.chunk.document_id for r in reader.query(_vec(0, 1), top_k=1)] == ["b"]
+
+
+def test_overwrite_and_delete(tmp_path: Path):
+    """Overwriting tombstones the old row; deletes hide documents."""
+    store = MmapVectorStore(str(tmp_path / "index"))
+    store.add_chunks([_chunk("a"), _chunk("b"), _chunk("c")], [_vec(1, 0), _vec(0, 1), _vec(1, 1)])
+
+    store.add_chunks([_chunk("a")], [_vec(0, 1)])
+    store.delete_by_document_ids(["b"])
+
+    assert store.count() == 2
+    ids = [r.chunk.document_id for r in store.query(_vec(0, 1), top_k=5)]
+    assert ids == ["a", "c"]
+
+
+def test_compact_removes_dead_rows(tmp_path: Path):
+    """Compaction shrinks the files and keeps live data queryable."""
+    directory = tmp_path / "index"
+    store = MmapVectorStore(str(directory))
+    store.add_chunks([_chunk(f"d{i}") for i in range(4)], [_vec(1, i) for i in range(4)])
+    store.delete_chunks(["d0::chunk:0", "d2::chunk:0"])
+
+    store.compact()
+
+    assert (directory / MmapVectorStore.VECTORS_FILE).stat().st_size == 2 * 2 * 4
+    assert store.count() == 2
+    assert {r.chunk.document_id for r in store.query(_vec(1, 1), top_k=5)} == {"d1", "d3"}
+
+
+def test_query_many_and_empty_store(tmp_path: Path):
+    """Empty stores return empty lists; batched queries match single ones."""
+    store = MmapVectorStore(str(tmp_path / "index"))
+    assert store.query_many([_vec(1, 0), _vec(0, 1)]) == [[], []]
+
+    store.add_chunks([_chunk("a"), _chunk("b")], [_vec(1, 0), _vec(0, 1)])
+    batched = store.query_many([_vec(1, 0), _vec(0, 1)], top_k=1)
+    assert [[r.chunk.document_id for r in results] for results in batched] == [["a"], ["b"]]
+
+
+def test_crash_before_sidecar_commit_leaves_index_writable(tmp_path: Path):
+    """Bytes appended without a committed sidecar row are ignored, then overwritten."""
+    directory = tmp_path / "index"
+    store = MmapVectorStore(str(directory))
+    store.add_chunks([_chunk("a"), _chunk("b")], [_vec(1, 0), _vec(0, 1)])
+    store.close()
+    # Simulate a crash after the byte append of an overwrite of "a"
+    with open(directory / MmapVectorStore.ALIVE_FILE, "ab") as handle:
+        handle.write(b"\x01")
+    with open(directory / MmapVectorStore.VECTORS_FILE, "ab") as handle:
+        handle.write(np.array([0.6, 0.8], dtype=np.float32).tobytes())
+
+    reopened = MmapVectorStore(str(directory))
+    assert reopened.count() == 2
+    assert [r.chunk.document_id for r in reopened.query(_vec(1, 0), top_k=1)] == ["a"]
+
+    reopened.add_chunks([_chunk("a"), _chunk("c")], [_vec(0, 1), _vec(1, 1)])
+
+    assert reopened.count() == 3
+    assert (directory / MmapVectorStore.VECTORS_FILE).stat().st_size == 4 * 2 * 4
+    assert {r.chunk.document_id for r in reopened.query(_vec(0, 1), top_k=2)} == {"a", "b"}
+
+
+def test_crash_after_sidecar_commit_is_repaired_on_open(tmp_path: Path):
+    """An overwritten row whose alive byte was never cleared stays hidden."""
+    directory = tmp_path / "index"
+    store = MmapVectorStore(str(directory))
+    store.add_chunks([_chunk("a")], [_vec(1, 0)])
+    store.add_chunks([_chunk("a")], [_vec(0, 1)])
+    store.close()
+    # Simulate a crash before the old row's alive byte was cleared
+    (directory / MmapVectorStore.ALIVE_FILE).write_bytes(b"\x01\x01")
+
+    reopened = MmapVectorStore(str(directory))
+
+    assert reopened.count() == 1
+    assert len(reopened.query(_vec(1, 0), top_k=5)) == 1
@@ -0,0 +1,135 @@
+"""Tests for the NumPy in-memory vector store."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.rag.models.documents import DocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.models.settings import RAGSettings
+from app.rag.vectorstores.factory import build_vector_store
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+def _chunk(document_id: str, index: int = 0) -> DocumentChunk:
+    return DocumentChunk(
+        id=f"{document_id}::chunk:{index}",
+        document_id=document_id,
+        content=f"{document_id} content {index}",
+        index=index,
+    )
+
+
+def _populated_store(vectors, **kwargs) -> NumpyVectorStore:
+    store = NumpyVectorStore(initial_capacity=2, **kwargs)
+    store.add_chunks(
+        [_chunk(f"doc{i}") for i in range(len(vectors))],
+        [EmbeddingVector(vector=list(v)) for v in vectors],
+    )
+    return store
+
+
+def test_query_returns_nearest_first_with_distance_scores():
+    """Results are ordered by squared L2 distance of normalized vectors."""
+    store = _populated_store([[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]])
+
+    results = store.query(EmbeddingVector(vector=[1.0, 0.0, 0.0]), top_k=2)
+
+    assert [r.chunk.document_id for r in results] == ["doc0", "doc2"]
+    assert results[0].score == pytest.approx(0.0, abs=1e-6)
+    scores = [r.score for r in results]
+    assert scores == sorted(scores)
+
+
+def test_query_matches_brute_force():
+    """argpartition top-k equals a full sort on random data."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 16))
+    store = _populated_store(vectors)
+    query = rng.normal(size=16)
+
+    results = store.query(EmbeddingVector(vector=list(query)), top_k=10)
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    expected = np.argsort(-(normalized @ (query / np.linalg.norm(query))))[:10]
+    assert [r.chunk.document_id for r in results] == [f"doc{i}" for i in expected]
+
+
+def test_query_many_matches_single_queries():
+    """Batched queries return the same results as one-by-one queries."""
+    rng = np.random.default_rng(1)
+    store = _populated_store(rng.normal(size=(50, 8)))
+    queries = [EmbeddingVector(vector=list(q)) for q in rng.normal(size=(4, 8))]
+
+    batched = store.query_many(queries, top_k=5)
+
+    for query, results in zip(queries, batched):
+        single = store.query(query, top_k=5)
+        assert [r.chunk.id for r in results] == [r.chunk.id for r in single]
+
+
+def test_upsert_replaces_existing_chunk():
+    """Re-adding a chunk ID overwrites it instead of duplicating."""
+    store = _populated_store([[1, 0], [0, 1]])
+    store.add_chunks([_chunk("doc0")], [EmbeddingVector(vector=[0.0, 1.0])])
+
+    assert store.count() == 2
+    results = store.query(EmbeddingVector(vector=[0.0, 1.0]), top_k=2)
+    assert all(r.score == pytest.approx(0.0, abs=1e-6) for r in results)
+
+
+def test_delete_tombstones_and_compaction():
+    """Deleted documents disappear from results and trigger compaction."""
+    store = _populated_store([[1, 0], [0, 1], [1, 1], [1, -1]], compaction_ratio=0.5)
+
+    store.delete_by_document_ids(["doc0"])
+    assert store.count() == 3
+    assert "doc0" not in [r.chunk.document_id for r in store.query(EmbeddingVector(vector=[1.0, 0.0]), top_k=4)]
+
+    store.delete_chunks(["doc1::chunk:0", "doc2::chunk:0"])
+    # 3 of 4 rows were tombstoned, above the 0.5 ratio: matrix compacted
+    assert store._size == 1
+    assert [r.chunk.document_id for r in store.query(EmbeddingVector(vector=[1.0, 0.0]), top_k=4)] == ["doc3"]
+
+
+def test_empty_store_and_dimension_mismatch():
+    """Empty store returns no results; mismatched dimensions are rejected."""
+    store = NumpyVectorStore()
+    assert store.query(EmbeddingVector(vector=[1.0, 0.0])) == []
+
+    store.add_chunks([_chunk("a")], [EmbeddingVector(vector=[1.0, 0.0])])
+    with pytest.raises(ValueError, match="dimension"):
+        store.add_chunks([_chunk("b")], [EmbeddingVector(vector=[1.0, 0.0, 0.0])])
+
+
+def test_factory_builds_numpy_backend():
+    """RAGSettings can select the NumPy backend."""
+    store = build_vector_store(RAGSettings(vector_store_backend="numpy"))
+    assert isinstance(store, NumpyVectorStore)
+
+
+def test_plugs_into_retrieval_service():
+    """RetrievalService works unchanged on top of the NumPy store."""
+    from app.rag.interfaces.embeddings import EmbeddingInterface
+    from app.rag.services.retrieval_service import RetrievalService
+
+    class _KeywordEmbedder(EmbeddingInterface):
+        def embed_text(self, text: str) -> EmbeddingVector:
+            return EmbeddingVector(vector=[float("apple" in text), float("cnc" in text), 0.1])
+
+        def embed_texts(self, texts):
+            return [self.embed_text(t) for t in texts]
+
+    embedder = _KeywordEmbedder()
+    store = NumpyVectorStore()
+    chunks = [
+        DocumentChunk(id="fruit::chunk:0", document_id="fruit", content="apple banana", index=0),
+        DocumentChunk(id="tools::chunk:0", document_id="tools", content="cnc welding", index=0),
+    ]
+    store.add_chunks(chunks, embedder.embed_texts([c.content for c in chunks]))
+
+    results = RetrievalService(embedder=embedder, vector_store=store).retrieve("apple", top_k=2)
+
+    assert results[0].chunk.document_id == "fruit"
+    assert results[0].score < results[1].score
@@ -0,0 +1,121 @@
+"""Tests for the ONNX Runtime embedding provider."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.rag.embeddings.factory import embedder_factory, embedding_cache_namespace
+from app.rag.embeddings.onnx_provider import OnnxEmbeddingProvider, export_onnx_model
+from app.rag.models.settings import RAGSettings
+
+
+class _FakeTokenizer:
+    """Whitespace tokenizer producing tokenizers-like encodings."""
+
+    def encode_batch(self, texts):
+        return [self._encode(text) for text in texts]
+
+    def encode(self, text, add_special_tokens=True):
+        return self._encode(text)
+
+    @staticmethod
+    def _encode(text):
+        ids = [len(word) for word in text.split()] or [1]
+        return SimpleNamespace(ids=ids, attention_mask=[1] * len(ids), type_ids=[0] * len(ids))
+
+
+class _FakeSession:
+    """Returns token embeddings [id, 1] and records padded batch widths."""
+
+    def __init__(self) -> None:
+        self.widths = []
+
+    def get_inputs(self):
+        return [SimpleNamespace(name="input_ids"), SimpleNamespace(name="attention_mask")]
+
+    def run(self, outputs, feeds):
+        assert set(feeds) == {"input_ids", "attention_mask"}
+        ids = feeds["input_ids"]
+        self.widths.append(ids.shape[1])
+        return [np.stack([ids.astype(np.float32), np.ones_like(ids, dtype=np.float32)], axis=-1)]
+
+
+class _FakeOnnxProvider(OnnxEmbeddingProvider):
+    def __init__(self, **kwargs) -> None:
+        super().__init__("unused", **kwargs)
+        self.session = _FakeSession()
+
+    def _load(self):
+        return _FakeTokenizer(), self.session
+
+
+def test_batches_are_length_sorted_and_order_restored():
+    """Short texts are padded together; rows come back in input order."""
+    provider = _FakeOnnxProvider(batch_size=2, normalize=False)
+    texts = ["a b c d e f", "xx", "yyy zzz w", "q"]
+
+    batch = provider.embed_batch(texts)
+
+    # Sorted token counts 1, 1 | 3, 6: each batch padded only to its own max
+    assert provider.session.widths == [1, 6]
+    # Mean pooling over real tokens only (padding is masked out)
+    assert batch.array[:, 0].tolist() == pytest.approx([1.0, 2.0, 7 / 3, 1.0])
+    assert batch.array[:, 1].tolist() == [1.0, 1.0, 1.0, 1.0]
+
+
+def test_normalized_output_and_empty_input():
+    provider = _FakeOnnxProvider()
+
+    batch = provider.embed_batch(["hello world", "x"])
+
+    assert np.allclose(np.linalg.norm(batch.array, axis=1), 1.0)
+    assert len(provider.embed_batch([])) == 0
+    assert len(provider.embed_text("hi").vector) == 2
+
+
+def test_factory_selects_backend_and_cache_namespace():
+    """The ONNX backend gets its own embedding cache namespace."""
+    onnx = RAGSettings(embedding_backend="onnx", onnx_quantized=True, onnx_model_dir="models")
+
+    provider = embedder_factory(onnx)()
+    assert isinstance(provider, OnnxEmbeddingProvider)
+    assert not provider._normalize
+    assert provider._batch_size == onnx.embedding_encode_batch_size
+    assert embedding_cache_namespace(onnx).endswith(":onnx-int8")
+    normalized = RAGSettings(
+        embedding_backend="onnx", onnx_quantized=True, embedding_normalize=True
+    )
+    assert embedder_factory(normalized)()._normalize
+    assert embedding_cache_namespace(normalized).endswith(":onnx-int8:normalized")
+    assert embedding_cache_namespace(RAGSettings()) == RAGSettings().embedding_model_name
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        embedder_factory(RAGSettings(embedding_backend="tf"))
+
+
+@pytest.mark.parametrize("quantized, threshold", [(False, 0.999), (True, 0.98)])
+def test_parity_with_sentence_transformers(tmp_path, quantized, threshold):
+    """ONNX output matches sentence-transformers up to cosine >= threshold."""
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("tokenizers")
+    pytest.importorskip("optimum.onnxruntime")
+    sentence_transformers = pytest.importorskip("sentence_transformers")
+
+    model_name = RAGSettings().embedding_model_name
+    texts = [
+        "Hello, world!",
+        "Retrieval-augmented generation grounds answers in documents.",
+        "short",
+        "A much longer sentence " * 20,
+    ]
+
+    export_onnx_model(model_name, str(tmp_path), quantize=quantized)
+    onnx = OnnxEmbeddingProvider(str(tmp_path), quantized=quantized).embed_batch(texts).array
+    reference = sentence_transformers.SentenceTransformer(model_name).encode(
+        texts, convert_to_numpy=True, normalize_embeddings=True
+    )
+
+    cosines = np.sum(onnx * reference, axis=1)
+    assert cosines.min() >= threshold
@@ -0,0 +1,189 @@
+"""Tests for process-pool embedding and pipelined parallel indexing."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+import types
+from functools import partial
+
+import numpy as np
+import pytest
+
+from app.rag.chunking.fixed_size import FixedSizeChunker
+from app.rag.embeddings import process_pool_provider
+from app.rag.embeddings.process_pool_provider import ProcessPoolEmbeddingProvider
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.models.documents import DocumentBase
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+from app.rag.services.indexing import IndexingService
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+class PidEmbedder(EmbeddingInterface):
+    """Deterministic fake embedder; module-level so worker processes can import it.
+
+    The last column records the process that built it, to check the model
+    is built once per worker.
+    """
+
+    def __init__(self, dim: int = 4) -> None:
+        self._dim = dim
+        self._pid = float(os.getpid())
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts):
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts):
+        rows = np.zeros((len(texts), self._dim + 1), dtype=np.float32)
+        for i, text in enumerate(texts):
+            rows[i, :self._dim] = [len(text), sum(map(ord, text)) % 97, 1.0, 0.5][:self._dim]
+        rows[:, self._dim] = self._pid
+        return EmbeddingBatch(rows)
+
+
+class FailingEmbedder(PidEmbedder):
+    """Fake embedder raising inside the worker."""
+
+    def embed_batch(self, texts):
+        raise RuntimeError("model exploded")
+
+
+class ContentEmbedder(PidEmbedder):
+    """Fake embedder without the process column, so vectors do not depend on the worker."""
+
+    def __init__(self, dim: int = 4) -> None:
+        super().__init__(dim)
+        self._pid = 0.0
+
+
+class SlowEmbedder(PidEmbedder):
+    """Fake embedder taking a while per shard, so batches are still queued."""
+
+    def embed_batch(self, texts):
+        time.sleep(0.05)
+        return super().embed_batch(texts)
+
+
+@pytest.fixture
+def pool():
+    provider = ProcessPoolEmbeddingProvider(partial(PidEmbedder, 4), workers=2, shard_size=3)
+    yield provider
+    provider.close()
+
+
+def _documents(count: int = 12):
+    return [DocumentBase(id=f"doc-{i}", content=f"document {i} " * (i + 3)) for i in range(count)]
+
+
+def test_shards_are_reassembled_in_input_order(pool):
+    """Rows come back in input order across shards and workers."""
+    texts = [f"text {'x' * i}" for i in range(10)]
+
+    batch = pool.embed_batch(texts)
+    expected = PidEmbedder(4).embed_batch(texts).array
+
+    assert len(batch) == 10
+    assert np.array_equal(batch.array[:, :4], expected[:, :4])
+    # Embedded in worker processes, never in the parent
+    assert os.getpid() not in set(batch.array[:, 4].tolist())
+    assert len(pool.embed_batch([])) == 0
+
+
+def test_model_loaded_once_per_worker(pool):
+    """Every shard is embedded by one of the pool's long-lived embedders."""
+    pids = set()
+    for _ in range(4):
+        pids |= set(pool.embed_batch([f"t{i}" for i in range(12)]).array[:, 4].tolist())
+
+    assert 1 <= len(pids) <= pool.workers
+
+
+def test_parallel_indexing_matches_sequential():
+    """IDs, order and vectors match index_documents_stream."""
+    chunker = FixedSizeChunker(chunk_size=40, chunk_overlap=0)
+    sequential_store = NumpyVectorStore()
+    IndexingService(ContentEmbedder(4), sequential_store, chunker=chunker, batch_size=5) \
+        .index_documents_stream(_documents())
+
+    pool = ProcessPoolEmbeddingProvider(partial(ContentEmbedder, 4), workers=2, shard_size=3)
+    parallel_store = NumpyVectorStore()
+    try:
+        total = IndexingService(ContentEmbedder(4), parallel_store, chunker=chunker, batch_size=5) \
+            .index_documents_parallel(_documents(), pool, max_in_flight=2)
+    finally:
+        pool.close()
+
+    assert total == sequential_store.count() == parallel_store.count()
+    assert [c.id for c in parallel_store._chunks] == [c.id for c in sequential_store._chunks]
+
+    assert np.array_equal(parallel_store._matrix[:total], sequential_store._matrix[:total])
+    query = ContentEmbedder(4).embed_batch(["document 3 document 3"]).array[0]
+    assert [r.chunk.id for r in parallel_store.query(query, top_k=3)] == \
+        [r.chunk.id for r in sequential_store.query(query, top_k=3)]
+
+
+def test_worker_errors_propagate():
+    """A failing worker surfaces its exception to the indexing call."""
+    provider = ProcessPoolEmbeddingProvider(partial(FailingEmbedder, 4), workers=1)
+    try:
+        with pytest.raises(RuntimeError, match="model exploded"):
+            IndexingService(PidEmbedder(4), NumpyVectorStore()) \
+                .index_documents_parallel(_documents(2), provider)
+    finally:
+        provider.close()
+
+
+def test_failure_mid_stream_cancels_queued_shards_cleanly(caplog):
+    """Abandoned batches are cancelled without errors in the shard callbacks."""
+    provider = ProcessPoolEmbeddingProvider(partial(SlowEmbedder, 4), workers=1, shard_size=1)
+
+    def documents():
+        yield from _documents(6)
+        raise RuntimeError("source failed")
+
+    try:
+        with caplog.at_level(logging.ERROR, logger="concurrent.futures"):
+            with pytest.raises(RuntimeError, match="source failed"):
+                IndexingService(PidEmbedder(4), NumpyVectorStore(), batch_size=4) \
+                    .index_documents_parallel(documents(), provider, max_in_flight=8)
+            provider.close()
+    finally:
+        provider.close()
+
+    assert not caplog.records
+
+
+def test_initializer_caps_worker_threads(monkeypatch):
+    """Workers share the cores: thread env vars and torch are capped per worker."""
+    calls = []
+    monkeypatch.setitem(
+        process_pool_provider.sys.modules,
+        "torch",
+        types.SimpleNamespace(set_num_threads=calls.append),
+    )
+    for name in process_pool_provider.THREAD_ENV_VARS:
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setattr(process_pool_provider.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(process_pool_provider, "_worker_embedder", None)
+
+    provider = ProcessPoolEmbeddingProvider(partial(PidEmbedder, 4), workers=3)
+    process_pool_provider._init_worker(provider._factory, provider.threads_per_worker)
+
+    assert provider.threads_per_worker == 2
+    assert calls == [2]
+    assert all(os.environ[name] == "2" for name in process_pool_provider.THREAD_ENV_VARS)
+    assert ProcessPoolEmbeddingProvider(PidEmbedder, workers=16).threads_per_worker == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        ProcessPoolEmbeddingProvider(PidEmbedder, workers=0)
+    with pytest.raises(ValueError):
+        ProcessPoolEmbeddingProvider(PidEmbedder, shard_size=0)
+    with pytest.raises(ValueError):
+        ProcessPoolEmbeddingProvider(PidEmbedder, threads_per_worker=0)
@@ -0,0 +1,94 @@
+"""Tests for the cache-friendly prompt layout and Ollama prompt-cache options."""
+
+from __future__ import annotations
+
+import json
+
+import httpx
+
+from app.rag.llm.interfaces.llm_interface import LLMInterface
+from app.rag.llm.providers.ollama_provider import OllamaProvider
+from app.rag.llm.transport import HTTPTransport
+from app.rag.models.documents import DocumentChunk, ScoredDocumentChunk
+from app.rag.prompts.prompt_builder import PromptBuilder
+from app.rag.services.context_builder import ContextBuilder
+from app.rag.services.ttft_benchmark import benchmark_prompts, measure_ttft
+
+
+def _scored(document_id: str, index: int) -> ScoredDocumentChunk:
+    return ScoredDocumentChunk(
+        chunk=DocumentChunk(
+            id=f"{document_id}::chunk:{index}",
+            document_id=document_id,
+            content=f"{document_id} part {index}",
+            index=index,
+        ),
+        score=0.0,
+    )
+
+
+class _StreamingLLM(LLMInterface):
+    def __init__(self) -> None:
+        self.prompts = []
+
+    def generate(self, prompt: str) -> str:
+        return "answer"
+
+    def generate_stream(self, prompt: str):
+        self.prompts.append(prompt)
+        yield "first"
+        yield "second"
+
+
+def test_prompts_share_the_system_prefix():
+    """Per-request data never appears before the fixed instruction."""
+    first = PromptBuilder.build(context="a", query="x?")
+    second = PromptBuilder.build(context="b", query="y?")
+
+    assert first.startswith(PromptBuilder.SYSTEM_PREFIX)
+    assert second.startswith(PromptBuilder.SYSTEM_PREFIX)
+    assert first.index("Context:") < first.index("Question:")
+
+
+def test_stable_order_makes_context_independent_of_rank():
+    """The same chunks in different rank order give the same context."""
+    chunks = [_scored("b", 0), _scored("a", 1), _scored("a", 0)]
+    builder = ContextBuilder(stable_order=True)
+
+    assert builder.build(chunks) == builder.build(chunks[::-1])
+    assert builder.build(chunks).split(ContextBuilder.SEPARATOR) == [
+        "a part 0", "a part 1", "b part 0",
+    ]
+    # Selection is still by rank: only the best chunk fits
+    assert builder.build(chunks, max_chars=8) == "b part 0"
+
+
+def test_ollama_sends_keep_alive_and_options():
+    seen = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen["payload"] = json.loads(request.content)
+        return httpx.Response(200, json={"response": "hi"})
+
+    transport = HTTPTransport(client=httpx.Client(transport=httpx.MockTransport(handler)))
+    provider = OllamaProvider(
+        "http://ollama:11434", "llama2", transport=transport,
+        keep_alive="30m", options={"num_keep": 64},
+    )
+
+    assert provider.generate("prompt") == "hi"
+    assert seen["payload"]["keep_alive"] == "30m"
+    assert seen["payload"]["options"] == {"num_keep": 64}
+
+
+def test_measure_ttft_reads_only_the_first_fragment():
+    llm = _StreamingLLM()
+    prompts = benchmark_prompts(ContextBuilder(stable_order=True), 3)
+
+    report = measure_ttft(llm, prompts, label="stable")
+
+    assert report.runs == 3
+    assert report.label == "stable"
+    assert llm.prompts == prompts
+    # Stable order: every prompt shares everything up to the question
+    assert len({prompt.rsplit("Question:", 1)[0] for prompt in prompts}) == 1
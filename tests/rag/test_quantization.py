@@ -0,0 +1,130 @@
+"""Tests for quantizers and the quantized vector store."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.rag.models.documents import DocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.quantization.product import ProductQuantizer
+from app.rag.quantization.scalar import ScalarQuantizer
+from app.rag.services.recall_report import measure_recall
+from app.rag.vectorstores.flat_search import normalize_rows
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+from app.rag.vectorstores.quantized_store import QuantizedVectorStore
+
+
+def _unit_vectors(n: int, dim: int = 32, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(10, dim))
+    return normalize_rows(centers[rng.integers(0, 10, n)] + 0.4 * rng.normal(size=(n, dim)))
+
+
+def _fill(store, vectors) -> None:
+    store.add_chunks(
+        [
+            DocumentChunk(id=f"doc{i}::chunk:0", document_id=f"doc{i}", content=f"c{i}", index=0)
+            for i in range(len(vectors))
+        ],
+        [EmbeddingVector(vector=list(v)) for v in vectors],
+    )
+
+
+def test_scalar_quantizer_round_trip_and_adc():
+    """int8 codes reconstruct vectors closely and ADC matches decoded dot products."""
+    vectors = _unit_vectors(500)
+    quantizer = ScalarQuantizer()
+    quantizer.train(vectors)
+
+    codes = quantizer.encode(vectors)
+    assert codes.dtype == np.uint8 and codes.shape == (500, 32)
+    assert np.abs(quantizer.decode(codes) - vectors).max() < 0.02
+
+    queries = vectors[:3]
+    np.testing.assert_allclose(
+        quantizer.similarities(queries, codes),
+        queries @ quantizer.decode(codes).T,
+        atol=1e-4,
+    )
+
+
+def test_product_quantizer_adc_matches_decoded():
+    """PQ lookup-table similarities equal dot products with decoded vectors."""
+    vectors = _unit_vectors(600)
+    quantizer = ProductQuantizer(m=8, ksub=64, iterations=10)
+    quantizer.train(vectors)
+
+    codes = quantizer.encode(vectors)
+    assert codes.shape == (600, 8)
+    np.testing.assert_allclose(
+        quantizer.similarities(vectors[:4], codes),
+        vectors[:4] @ quantizer.decode(codes).T,
+        atol=1e-4,
+    )
+
+
+def test_product_quantizer_requires_divisible_dimension():
+    """Dimension must split evenly into sub-vectors."""
+    with pytest.raises(ValueError, match="divisible"):
+        ProductQuantizer(m=5).train(_unit_vectors(50))
+
+
+def test_quantized_store_compresses_after_training():
+    """Store switches to codes at train_size and keeps good recall."""
+    vectors = _unit_vectors(1000)
+    exact = NumpyVectorStore()
+    store = QuantizedVectorStore(ScalarQuantizer(), train_size=500)
+    _fill(exact, vectors)
+    _fill(store, vectors)
+
+    assert store.is_trained
+    assert store.vector_bytes == 1000 * 32  # one byte per dimension
+
+    queries = [EmbeddingVector(vector=list(q)) for q in _unit_vectors(20, seed=1)]
+    report = measure_recall(exact, store, queries, top_k=10)
+    assert report.recall > 0.8
+
+
+def test_pq_store_with_full_precision_rerank(tmp_path: Path):
+    """Re-ranking from the full-precision file restores exact top results."""
+    vectors = _unit_vectors(800)
+    exact = NumpyVectorStore()
+    store = QuantizedVectorStore(
+        ProductQuantizer(m=4, ksub=32, iterations=8),
+        train_size=400,
+        full_precision_path=str(tmp_path / "full.f32"),
+        rerank_factor=50,
+    )
+    _fill(exact, vectors)
+    _fill(store, vectors)
+
+    query = EmbeddingVector(vector=list(_unit_vectors(1, seed=2)[0]))
+    expected = exact.query(query, top_k=3)
+    results = store.query(query, top_k=3)
+
+    assert store.vector_bytes == 800 * 4
+    assert [r.chunk.id for r in results] == [r.chunk.id for r in expected]
+    assert [r.score for r in results] == pytest.approx([r.score for r in expected], abs=1e-5)
+
+
+def test_quantized_store_delete_and_compact(tmp_path: Path):
+    """Deletes and compaction keep codes and the full-precision file aligned."""
+    vectors = _unit_vectors(200)
+    store = QuantizedVectorStore(
+        ScalarQuantizer(),
+        train_size=100,
+        full_precision_path=str(tmp_path / "full.f32"),
+        compaction_ratio=0.1,
+    )
+    _fill(store, vectors)
+
+    store.delete_by_document_ids([f"doc{i}" for i in range(0, 200, 2)])
+
+    assert store.count() == 100
+    query = EmbeddingVector(vector=list(vectors[1]))
+    top = store.query(query, top_k=1)[0]
+    assert top.chunk.id == "doc1::chunk:0"
+    assert top.score == pytest.approx(0.0, abs=1e-5)
@@ -0,0 +1,147 @@
+"""Tests for the cross-encoder re-ranking stage."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.interfaces.reranker import RerankerInterface
+from app.rag.lexical.bm25 import BM25Index
+from app.rag.models.documents import DocumentBase, DocumentChunk, ScoredDocumentChunk
+from app.rag.models.embeddings import EmbeddingVector
+from app.rag.reranking.cross_encoder import CrossEncoderReranker
+from app.rag.services.indexing import IndexingService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+class _FakeCrossEncoder:
+    """Relevance = number of query words in the passage; records batch sizes."""
+
+    def __init__(self) -> None:
+        self.batches = []
+
+    def predict(self, pairs, batch_size=32, convert_to_numpy=True):
+        self.batches.append(len(pairs))
+        return np.array(
+            [sum(word in passage.split() for word in query.split()) for query, passage in pairs],
+            dtype=np.float32,
+        )
+
+
+class _FakeClock:
+    """Advances 10 ms every time it is read."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 0.010
+        return self.now
+
+
+class _ConstantEmbedder(EmbeddingInterface):
+    """Every text gets the same vector, so vector order carries no signal."""
+
+    def embed_text(self, text):
+        return EmbeddingVector(vector=[1.0, 0.0])
+
+    def embed_texts(self, texts):
+        return [self.embed_text(t) for t in texts]
+
+
+def _reranker(**kwargs) -> CrossEncoderReranker:
+    reranker = CrossEncoderReranker(**kwargs)
+    reranker._model = _FakeCrossEncoder()
+    return reranker
+
+
+def _candidates(*contents: str):
+    return [
+        ScoredDocumentChunk(
+            chunk=DocumentChunk(id=f"d{i}::chunk:0", document_id=f"d{i}", content=c, index=0),
+            score=float(i),
+        )
+        for i, c in enumerate(contents)
+    ]
+
+
+def test_rerank_orders_by_relevance_in_batches():
+    reranker = _reranker(batch_size=2)
+    candidates = _candidates("nothing here", "error E42 occurs", "E42", "error code E42 explained")
+
+    results = reranker.rerank("error E42", candidates, top_k=3)
+
+    assert [r.chunk.document_id for r in results] == ["d1", "d3", "d2"]
+    assert [r.score for r in results] == sorted(r.score for r in results)
+    assert reranker._model.batches == [2, 2]
+
+
+def test_latency_budget_leaves_rest_in_vector_order():
+    """Past the budget, unscored candidates follow the scored ones unchanged."""
+    reranker = _reranker(batch_size=2, latency_budget_ms=15, clock=_FakeClock())
+    candidates = _candidates("a", "b", "E42", "E42 E42", "E42")
+
+    results = reranker.rerank("E42", candidates, top_k=5)
+
+    assert reranker._model.batches == [2]
+    assert [r.chunk.document_id for r in results] == ["d0", "d1", "d2", "d3", "d4"]
+    assert [r.score for r in results] == sorted(r.score for r in results)
+
+
+def test_retrieval_fetches_candidates_and_reranks():
+    store = NumpyVectorStore()
+    IndexingService(_ConstantEmbedder(), store).index_documents([
+        DocumentBase(id=f"doc{i}", content=text)
+        for i, text in enumerate(["unrelated", "filler text", "SKU-123 manual", "more filler"])
+    ])
+    service = RetrievalService(
+        _ConstantEmbedder(), store, reranker=_reranker(), rerank_candidates=10
+    )
+
+    results = service.retrieve("SKU-123", top_k=1)
+    batched = service.retrieve_many(["SKU-123"], top_k=1)
+
+    assert results[0].chunk.document_id == "doc2"
+    assert batched[0][0].chunk.document_id == "doc2"
+
+
+class _RecordingReranker(RerankerInterface):
+    """Keeps the candidate order and records how many candidates it scored."""
+
+    def __init__(self) -> None:
+        self.scored = []
+
+    def rerank(self, query, candidates, *, top_k):
+        self.scored.append(len(candidates))
+        return list(candidates)[:top_k]
+
+
+def test_hybrid_reranking_scores_at_most_rerank_candidates():
+    store, lexical, reranker = NumpyVectorStore(), BM25Index(), _RecordingReranker()
+    IndexingService(_ConstantEmbedder(), store, lexical_index=lexical).index_documents([
+        DocumentBase(id=f"doc{i}", content=f"word{i} " + ("shared " if i % 2 else ""))
+        for i in range(12)
+    ])
+    service = RetrievalService(
+        _ConstantEmbedder(),
+        store,
+        reranker=reranker,
+        rerank_candidates=4,
+        lexical_index=lexical,
+        retrieval_mode="hybrid",
+        fusion_candidates=6,
+    )
+
+    assert len(service.retrieve("shared word2", top_k=2)) == 2
+    assert reranker.scored == [4]
+
+
+def test_invalid_options():
+    with pytest.raises(ValueError):
+        CrossEncoderReranker(batch_size=0)
+    with pytest.raises(ValueError):
+        CrossEncoderReranker(latency_budget_ms=0)
+    with pytest.raises(ValueError):
+        RetrievalService(_ConstantEmbedder(), NumpyVectorStore(), rerank_candidates=0)
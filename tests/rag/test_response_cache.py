@@ -0,0 +1,159 @@
+"""Tests for the response cache and index generation invalidation."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from app.rag.cache.generation import IndexGeneration
+from app.rag.cache.response_cache import ResponseCache, response_cache_key
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.llm.interfaces.llm_interface import LLMInterface
+from app.rag.models.documents import DocumentBase
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+from app.rag.services.indexing import IndexingService
+from app.rag.services.rag_llm_service import RAGLLMService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _ConstantEmbedder(EmbeddingInterface):
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return EmbeddingVector(vector=[1.0, 0.0])
+
+    def embed_texts(self, texts):
+        return [self.embed_text(text) for text in texts]
+
+    def embed_batch(self, texts):
+        return EmbeddingBatch(np.tile([1.0, 0.0], (len(texts), 1)))
+
+
+class _CountingLLM(LLMInterface):
+    model = "fake-model"
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return f"answer #{self.calls}"
+
+
+def _key(query: str, **overrides) -> str:
+    params = dict(top_k=5, max_chars=8000, model="m", template_version="1", generation=0)
+    params.update(overrides)
+    return response_cache_key(query, **params)
+
+
+def test_key_normalizes_query_and_covers_every_input():
+    assert _key("What is RAG?") == _key("  what   is rag? ")
+    base = _key("q")
+    for change in [
+        {"top_k": 3},
+        {"max_chars": 10},
+        {"model": "other"},
+        {"template_version": "2"},
+        {"generation": 1},
+    ]:
+        assert _key("q", **change) != base
+
+
+def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = ResponseCache(ttl_seconds=10, clock=clock)
+    cache.put("k", "v")
+
+    clock.now += 9
+    assert cache.get("k") == "v"
+    clock.now += 2
+    assert cache.get("k") is None
+    assert cache.stats.expired == 1
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_items=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.stats.evicted == 1
+
+
+def test_file_tier_is_shared_between_instances(tmp_path: Path):
+    path = str(tmp_path / "responses.sqlite")
+    ResponseCache(path=path).put("k", "shared answer")
+
+    other = ResponseCache(path=path)
+    assert other.get("k") == "shared answer"
+    assert other.stats.disk_hits == 1
+
+
+def test_generation_counter_is_monotonic_and_shared(tmp_path: Path):
+    path = str(tmp_path / "generation.sqlite")
+    writer, reader = IndexGeneration(path), IndexGeneration(path)
+
+    assert reader.current() == 0
+    assert writer.bump() == 1
+    assert writer.bump() == 2
+    assert reader.current() == 2
+
+
+def test_repeated_question_skips_retrieval_and_llm():
+    store = NumpyVectorStore()
+    llm = _CountingLLM()
+    service = RAGLLMService(
+        RetrievalService(_ConstantEmbedder(), store), llm, cache=ResponseCache()
+    )
+
+    first = service.answer("What is RAG?")
+    second = service.answer("what is  RAG?")
+
+    assert first == second == "answer #1"
+    assert llm.calls == 1
+    assert service.cache.stats.memory_hits == 1
+
+
+def test_indexing_invalidates_cached_answers():
+    """A write through IndexingService bumps the generation and misses the cache."""
+    embedder = _ConstantEmbedder()
+    store = NumpyVectorStore()
+    generation = IndexGeneration()
+    indexing = IndexingService(embedder, store, generation=generation)
+    llm = _CountingLLM()
+    service = RAGLLMService(
+        RetrievalService(embedder, store), llm, cache=ResponseCache(), generation=generation
+    )
+
+    service.answer("question")
+    indexing.index_documents([DocumentBase(id="doc", content="new facts")])
+    after = service.answer("question")
+
+    assert generation.current() == 1
+    assert after == "answer #2"
+
+
+def test_answer_many_and_stream_use_cache():
+    llm = _CountingLLM()
+    service = RAGLLMService(
+        RetrievalService(_ConstantEmbedder(), NumpyVectorStore()), llm, cache=ResponseCache()
+    )
+
+    service.answer("a")
+    answers = service.answer_many(["a", "b"])
+    streamed = list(service.answer_stream("b"))
+
+    assert answers == ["answer #1", "answer #2"]
+    assert streamed == ["answer #2"]
+    assert llm.calls == 2
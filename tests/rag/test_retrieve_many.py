@@ -0,0 +1,160 @@
+"""Tests for batched retrieval and answering."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.interfaces.vector_store import VectorStoreInterface
+from app.rag.llm.interfaces.llm_interface import LLMInterface
+from app.rag.models.documents import DocumentBase
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+from app.rag.services.indexing import IndexingService
+from app.rag.services.rag_llm_service import RAGLLMService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.chroma import ChromaVectorStore
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+_TOPICS = ["apple", "welding", "python"]
+
+
+class _TopicEmbedder(EmbeddingInterface):
+    """One-hot embedding of the first known topic word; counts batch calls."""
+
+    def __init__(self) -> None:
+        self.batch_calls = 0
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return self.embed_batch([text]).to_vectors()[0]
+
+    def embed_texts(self, texts):
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts):
+        self.batch_calls += 1
+        array = np.zeros((len(texts), len(_TOPICS)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for column, topic in enumerate(_TOPICS):
+                if topic in text:
+                    array[row, column] = 1.0
+                    break
+        return EmbeddingBatch(array)
+
+
+class _LoopingStore(VectorStoreInterface):
+    """Store without a native query_many, recording single queries."""
+
+    def __init__(self) -> None:
+        self.queries = 0
+
+    def add_chunks(self, chunks, embeddings):
+        pass
+
+    def query(self, embedding, top_k: int = 5, filters=None):
+        self.queries += 1
+        return []
+
+    def delete_by_document_ids(self, document_ids):
+        pass
+
+    def delete_chunks(self, chunk_ids):
+        pass
+
+
+class _EchoLLM(LLMInterface):
+    """Fake LLM answering with its prompt."""
+
+    def generate(self, prompt: str) -> str:
+        return prompt
+
+
+def _indexed_store(embedder: EmbeddingInterface) -> NumpyVectorStore:
+    store = NumpyVectorStore()
+    IndexingService(embedder, store).index_documents(
+        [DocumentBase(id=topic, content=f"all about {topic}") for topic in _TOPICS]
+    )
+    return store
+
+
+def test_retrieve_many_embeds_and_searches_once():
+    """N queries cost one embedding batch and return per-query results."""
+    embedder = _TopicEmbedder()
+    store = _indexed_store(embedder)
+    embedder.batch_calls = 0
+
+    results = RetrievalService(embedder, store).retrieve_many(
+        ["python tips", "apple pie", "welding rods"], top_k=1
+    )
+
+    assert embedder.batch_calls == 1
+    assert [r[0].chunk.document_id for r in results] == ["python", "apple", "welding"]
+
+
+def test_retrieve_many_matches_retrieve():
+    """Batched results equal one-at-a-time results."""
+    embedder = _TopicEmbedder()
+    service = RetrievalService(embedder, _indexed_store(embedder))
+    queries = ["apple", "python", "welding apple"]
+
+    batched = service.retrieve_many(queries, top_k=3)
+
+    assert batched == [service.retrieve(q, top_k=3) for q in queries]
+
+
+def test_retrieve_many_validates_inputs():
+    service = RetrievalService(_TopicEmbedder(), _LoopingStore())
+
+    assert service.retrieve_many([]) == []
+    with pytest.raises(ValueError, match="Query text cannot be empty"):
+        service.retrieve_many(["ok", "  "])
+    with pytest.raises(ValueError, match="top_k must be greater than 0"):
+        service.retrieve_many(["ok"], top_k=0)
+
+
+def test_interface_query_many_falls_back_to_query():
+    """Stores without a batched search still answer query_many."""
+    store = _LoopingStore()
+
+    assert store.query_many(np.eye(3, dtype=np.float32)) == [[], [], []]
+    assert store.queries == 3
+
+
+def test_chroma_query_many_uses_one_call():
+    """All query embeddings go to Chroma in one request."""
+
+    class _FakeCollection:
+        def __init__(self) -> None:
+            self.calls = []
+
+        def query(self, query_embeddings, n_results):
+            self.calls.append(query_embeddings)
+            return {
+                "ids": [[f"q{i}::chunk:0"] for i in range(len(query_embeddings))],
+                "distances": [[0.1 * i] for i in range(len(query_embeddings))],
+                "documents": [["text"] for _ in query_embeddings],
+                "metadatas": [[{"document_id": f"q{i}", "index": 0}] for i in range(len(query_embeddings))],
+            }
+
+    store = ChromaVectorStore.__new__(ChromaVectorStore)
+    store._collection = _FakeCollection()
+
+    results = store.query_many(np.eye(2, dtype=np.float32), top_k=1)
+
+    assert len(store._collection.calls) == 1
+    assert [r[0].chunk.document_id for r in results] == ["q0", "q1"]
+    assert store.query([1.0, 0.0])[0].chunk.id == "q0::chunk:0"
+
+
+def test_answer_many_returns_one_answer_per_query():
+    embedder = _TopicEmbedder()
+    store = _indexed_store(embedder)
+    service = RAGLLMService(RetrievalService(embedder, store), _EchoLLM())
+    embedder.batch_calls = 0
+
+    answers = service.answer_many(["apple?", "python?"])
+
+    assert len(answers) == 2
+    assert "Question: apple?" in answers[0] and "all about apple" in answers[0]
+    assert "Question: python?" in answers[1] and "all about python" in answers[1]
+    assert embedder.batch_calls == 1
@@ -0,0 +1,156 @@
+"""Tests for the semantic (similar-query) cache."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.rag.cache.generation import IndexGeneration
+from app.rag.cache.semantic_cache import SemanticCache
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.llm.interfaces.llm_interface import LLMInterface
+from app.rag.models.documents import DocumentBase
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+from app.rag.services.indexing import IndexingService
+from app.rag.services.rag_llm_service import RAGLLMService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+# Paraphrases share a direction; the small second component differs
+_VECTORS = {
+    "how do i reset my password": [1.0, 0.02, 0.0],
+    "password reset steps": [1.0, 0.05, 0.0],
+    "shipping times": [0.0, 0.0, 1.0],
+}
+
+
+class _TableEmbedder(EmbeddingInterface):
+    """Embeds known phrases from a table, anything else to one fixed vector."""
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return EmbeddingVector(vector=_VECTORS.get(text, [0.0, 1.0, 0.0]))
+
+    def embed_texts(self, texts):
+        return [self.embed_text(text) for text in texts]
+
+    def embed_batch(self, texts):
+        return EmbeddingBatch(np.array([self.embed_text(t).vector for t in texts]))
+
+
+class _CountingStore(NumpyVectorStore):
+    """NumPy store counting searched query embeddings."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.queries = 0
+
+    def query(self, embedding, top_k: int = 5, filters=None):
+        self.queries += 1
+        return super().query(embedding, top_k=top_k, filters=filters)
+
+    def query_many(self, embeddings, top_k: int = 5, filters=None):
+        self.queries += len(embeddings)
+        return super().query_many(embeddings, top_k=top_k, filters=filters)
+
+
+class _CountingLLM(LLMInterface):
+    """Fake LLM numbering its answers."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def generate(self, prompt: str) -> str:
+        self.calls += 1
+        return f"answer #{self.calls}"
+
+
+def _service(threshold: float = 0.99, generation=None):
+    store = _CountingStore()
+    embedder = _TableEmbedder()
+    indexing = IndexingService(embedder, store, generation=generation)
+    indexing.index_documents([DocumentBase(id="doc", content="shipping times")])
+    retrieval = RetrievalService(
+        embedder, store, semantic_cache=SemanticCache(threshold=threshold), generation=generation
+    )
+    return retrieval, store, indexing
+
+
+def test_paraphrase_reuses_retrieval_results():
+    retrieval, store, _ = _service()
+
+    first = retrieval.retrieve("how do i reset my password", top_k=1)
+    second = retrieval.retrieve("password reset steps", top_k=1)
+
+    assert second == first
+    assert store.queries == 1
+    assert retrieval.semantic_cache.stats.hits == 1
+    assert retrieval.semantic_cache.stats.hit_rate == 0.5
+
+
+def test_dissimilar_query_misses():
+    retrieval, store, _ = _service()
+
+    retrieval.retrieve("how do i reset my password", top_k=1)
+    retrieval.retrieve("shipping times", top_k=1)
+
+    assert store.queries == 2
+
+
+def test_larger_top_k_is_not_served_from_smaller_entry():
+    retrieval, store, _ = _service()
+
+    retrieval.retrieve("how do i reset my password", top_k=1)
+    retrieval.retrieve("password reset steps", top_k=3)
+    retrieval.retrieve("how do i reset my password", top_k=2)
+
+    assert store.queries == 2
+
+
+def test_index_writes_invalidate_entries():
+    generation = IndexGeneration()
+    retrieval, store, indexing = _service(generation=generation)
+
+    retrieval.retrieve("shipping times", top_k=1)
+    indexing.index_documents([DocumentBase(id="doc2", content="other")])
+    retrieval.retrieve("shipping times", top_k=1)
+
+    assert store.queries == 2
+
+
+def test_retrieve_many_searches_only_misses():
+    retrieval, store, _ = _service()
+    retrieval.retrieve("how do i reset my password", top_k=1)
+
+    results = retrieval.retrieve_many(["password reset steps", "shipping times"], top_k=1)
+
+    assert store.queries == 2
+    assert results[1][0].chunk.document_id == "doc"
+
+
+def test_lru_eviction_bounds_size():
+    cache = SemanticCache(threshold=0.99, max_items=2)
+    for i, vector in enumerate(np.eye(3, dtype=np.float32)):
+        cache.store(vector, query=f"q{i}", top_k=1, results=[])
+
+    assert cache.stats.size == 2
+    assert cache.stats.evicted == 1
+    assert cache.lookup(np.eye(3)[0], top_k=1) is None
+    assert cache.lookup(np.eye(3)[2], top_k=1).query == "q2"
+
+
+def test_threshold_is_validated():
+    with pytest.raises(ValueError):
+        SemanticCache(threshold=0.0)
+
+
+def test_answers_reused_for_paraphrases():
+    retrieval, _, _ = _service()
+    llm = _CountingLLM()
+    service = RAGLLMService(retrieval, llm, reuse_semantic_answers=True)
+
+    first = service.answer("how do i reset my password")
+    second = service.answer("password reset steps")
+
+    assert first == second == "answer #1"
+    assert llm.calls == 1
+    assert retrieval.semantic_cache.stats.answer_hits == 1
@@ -0,0 +1,115 @@
+"""Tests for length bucketing and overflow handling in the sentence-transformers provider."""
+
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.rag.embeddings.factory import embedding_cache_namespace
+from app.rag.embeddings.sentence_transformer_provider import (
+    SentenceTransformerEmbeddingProvider,
+)
+from app.rag.models.settings import RAGSettings
+
+
+class _FakeTokenizer:
+    """One token per word; token id is the word length."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, texts, add_special_tokens=False):
+        self.calls += 1
+        return {"input_ids": [[len(word) for word in text.split()] for text in texts]}
+
+    def encode(self, text, add_special_tokens=False):
+        return self([text])["input_ids"][0]
+
+    def decode(self, ids):
+        return " ".join("w" * i for i in ids)
+
+
+class _FakeModel:
+    """Embeds a text as [word count, mean word length]; records encode batches."""
+
+    max_seq_length = 6
+
+    def __init__(self) -> None:
+        self.tokenizer = _FakeTokenizer()
+        self.batches = []
+
+    def encode(self, texts, batch_size=32, convert_to_numpy=True):
+        self.batches.append(list(texts))
+        rows = []
+        for text in texts:
+            words = text.split()
+            rows.append([float(len(words)), float(np.mean([len(w) for w in words]))])
+        return np.array(rows, dtype=np.float32)
+
+
+def _provider(**kwargs) -> SentenceTransformerEmbeddingProvider:
+    provider = SentenceTransformerEmbeddingProvider("fake", **kwargs)
+    provider._model = _FakeModel()
+    return provider
+
+
+def test_buckets_are_length_sorted_and_order_restored():
+    """Similar lengths share an encode call; rows keep input order."""
+    provider = _provider(batch_size=2)
+    texts = ["a b c d", "a", "a b c", "a b"]
+
+    batch = provider.embed_batch(texts)
+
+    assert provider._model.batches == [["a", "a b"], ["a b c", "a b c d"]]
+    assert batch.array[:, 0].tolist() == [4.0, 1.0, 3.0, 2.0]
+
+
+def test_truncate_buckets_by_characters_without_tokenizing():
+    """Truncate mode orders by character count; only the model tokenizes."""
+    provider = _provider(batch_size=2)
+
+    provider.embed_batch(["tiny", "a b", "a much longer text", "medium text"])
+
+    assert provider._model.tokenizer.calls == 0
+    assert provider._model.batches == [["a b", "tiny"], ["medium text", "a much longer text"]]
+
+
+def test_truncate_leaves_long_texts_to_the_model():
+    provider = _provider()
+
+    batch = provider.embed_batch(["x " * 10])
+
+    assert provider._model.batches == [["x " * 10]]
+    assert batch.array[0, 0] == 10.0
+
+
+def test_split_pools_windows_weighted_by_tokens():
+    """Over-long texts are split into max_seq_length - 2 token windows and mean-pooled."""
+    provider = _provider(overflow="split")
+    # 10 tokens of length 1, then 2 tokens of length 3: windows of 4, 4, 4
+    text = "a " * 10 + "bbb bbb"
+
+    batch = provider.embed_batch([text, "short"])
+
+    encoded = sorted(len(piece.split()) for batch in provider._model.batches for piece in batch)
+    assert encoded == [1, 4, 4, 4]
+    # Window mean word lengths 1, 1, 2 with equal weights
+    assert batch.array[0].tolist() == pytest.approx([4.0, 4 / 3])
+    assert batch.array[1].tolist() == [1.0, 5.0]
+
+
+def test_normalized_output():
+    batch = _provider(normalize=True).embed_batch(["a b", "ccc"])
+
+    assert np.allclose(np.linalg.norm(batch.array, axis=1), 1.0)
+    assert len(_provider().embed_batch([])) == 0
+
+
+def test_invalid_options_and_cache_namespace():
+    with pytest.raises(ValueError):
+        SentenceTransformerEmbeddingProvider("fake", batch_size=0)
+    with pytest.raises(ValueError, match="overflow"):
+        SentenceTransformerEmbeddingProvider("fake", overflow="drop")
+
+    settings = RAGSettings(embedding_overflow="split", embedding_normalize=True)
+    assert embedding_cache_namespace(settings) == f"{settings.embedding_model_name}:split:normalized"
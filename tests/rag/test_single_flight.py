@@ -0,0 +1,236 @@
+"""Tests for single-flight deduplication."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from app.rag.cache.generation import IndexGeneration
+from app.rag.concurrency.single_flight import AsyncSingleFlight, SingleFlight
+from app.rag.interfaces.embeddings import EmbeddingInterface
+from app.rag.llm.interfaces.async_llm_interface import AsyncLLMInterface
+from app.rag.models.embeddings import EmbeddingBatch, EmbeddingVector
+from app.rag.services.async_rag_llm_service import AsyncRAGLLMService
+from app.rag.services.async_retrieval_service import AsyncRetrievalService
+from app.rag.services.retrieval_service import RetrievalService
+from app.rag.vectorstores.numpy_store import NumpyVectorStore
+
+
+def _run_threads(count: int, target) -> list:
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_calls_share_one_execution():
+    group = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.05)
+        return "value"
+
+    results = _run_threads(8, lambda: group.do("key", slow))
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+    assert group.stats.followers == 7
+    assert group.stats.in_flight == 0
+
+
+def test_followers_receive_leader_error():
+    group = SingleFlight()
+
+    def failing():
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def call():
+        try:
+            group.do("key", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    _run_threads(4, call)
+
+    assert len(errors) == 4
+
+
+def test_stuck_leader_times_out_followers():
+    """Followers stop waiting after the per-key timeout and compute themselves."""
+    group = SingleFlight(timeout=5.0)
+    release = threading.Event()
+    leader_started = threading.Event()
+
+    def stuck():
+        leader_started.set()
+        release.wait(5)
+        return "leader"
+
+    leader = threading.Thread(target=group.do, args=("key", stuck))
+    leader.start()
+    leader_started.wait()
+
+    result = group.do("key", lambda: "own", timeout=0.05)
+    release.set()
+    leader.join()
+
+    assert result == "own"
+    assert group.stats.timeouts == 1
+
+
+def test_distinct_keys_do_not_share():
+    group = SingleFlight()
+    assert [group.do(i, lambda i=i: i) for i in range(3)] == [0, 1, 2]
+    assert group.stats.leaders == 3
+
+
+class _SlowEmbedder(EmbeddingInterface):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def embed_text(self, text: str) -> EmbeddingVector:
+        return self.embed_batch([text]).to_vectors()[0]
+
+    def embed_texts(self, texts):
+        return self.embed_batch(texts).to_vectors()
+
+    def embed_batch(self, texts):
+        self.calls += 1
+        time.sleep(0.05)
+        return EmbeddingBatch(np.ones((len(texts), 2), dtype=np.float32))
+
+
+def test_retrieval_dedupes_identical_queries():
+    embedder = _SlowEmbedder()
+    service = RetrievalService(embedder, NumpyVectorStore(), single_flight=SingleFlight())
+
+    results = _run_threads(6, lambda: service.retrieve("Same question", top_k=2))
+
+    assert embedder.calls == 1
+    assert results == [[]] * 6
+
+
+def test_retrieval_does_not_join_flights_of_older_generations():
+    """A query issued after an index write runs its own search."""
+    embedder, generation = _SlowEmbedder(), IndexGeneration()
+    service = RetrievalService(
+        embedder, NumpyVectorStore(), generation=generation, single_flight=SingleFlight()
+    )
+
+    before = threading.Thread(target=service.retrieve, args=("Same question",))
+    before.start()
+    time.sleep(0.01)
+    generation.bump()
+    service.retrieve("Same question")
+    before.join()
+
+    assert embedder.calls == 2
+
+
+class _SlowAsyncLLM(AsyncLLMInterface):
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate(self, prompt: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return "answer"
+
+
+class _FakeRetrievalService:
+    def retrieve_with_context(self, query_text, *, top_k=5, max_chars=8000, filters=None):
+        return ([], "context")
+
+
+def test_async_answers_are_deduplicated():
+    llm = _SlowAsyncLLM()
+    group = AsyncSingleFlight()
+    service = AsyncRAGLLMService(
+        AsyncRetrievalService(_FakeRetrievalService()), llm, single_flight=group
+    )
+
+    async def run():
+        return await asyncio.gather(*(service.answer("Incident?") for _ in range(20)))
+
+    assert asyncio.run(run()) == ["answer"] * 20
+    assert llm.calls == 1
+    assert group.stats.followers == 19
+
+
+def test_async_answers_do_not_join_flights_of_older_generations():
+    """A question asked after an index write gets a fresh answer."""
+    llm = _SlowAsyncLLM()
+    generation = IndexGeneration()
+    service = AsyncRAGLLMService(
+        AsyncRetrievalService(_FakeRetrievalService()),
+        llm,
+        generation=generation,
+        single_flight=AsyncSingleFlight(),
+    )
+
+    async def run():
+        before = asyncio.create_task(service.answer("Incident?"))
+        await asyncio.sleep(0.01)
+        generation.bump()
+        return await asyncio.gather(before, service.answer("Incident?"))
+
+    assert asyncio.run(run()) == ["answer"] * 2
+    assert llm.calls == 2
+
+
+def test_async_follower_times_out():
+    group = AsyncSingleFlight(timeout=0.02)
+
+    async def slow():
+        await asyncio.sleep(0.2)
+        return "leader"
+
+    async def own():
+        return "own"
+
+    async def run():
+        leader = asyncio.create_task(group.do("key", slow))
+        await asyncio.sleep(0)
+        follower = await group.do("key", own)
+        return follower, await leader
+
+    assert asyncio.run(run()) == ("own", "leader")
+    assert group.stats.timeouts == 1
+
+
+def test_async_cancelled_leader_does_not_fail_followers():
+    group = AsyncSingleFlight()
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "leader"
+
+    async def run():
+        leader = asyncio.create_task(group.do("key", slow))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(group.do("key", lambda: asyncio.sleep(0, result="own")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(run()) == "own"
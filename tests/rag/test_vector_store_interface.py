@@ -6,4 +6,5 @@ def test_vector_store_interface_methods_exist() -> None:
 
     assert "add_chunks" in method_names
     assert "query" in method_names
-    assert "delete_by_document_ids" in method_names
\ No newline at end of file
+    assert "delete_by_document_ids" in method_names
+    assert "delete_chunks" in VectorStoreInterface.__abstractmethods__
\ No newline at end of file
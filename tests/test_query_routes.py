@@ -0,0 +1,85 @@
+from fastapi.testclient import TestClient
+
+from app.api.v1.routes_query import get_rag_service
+from app.main import app
+
+
+class FakeRAGService:
+    """Async stand-in for AsyncRAGLLMService."""
+
+    async def answer(self, query: str) -> str:
+        if query == "fail":
+            raise RuntimeError("Ollama connection error: refused")
+        return f"answer to {query}"
+
+    async def answer_many(self, queries):
+        return [f"answer to {query}" for query in queries]
+
+    async def answer_stream(self, query: str):
+        if query == "fail":
+            raise RuntimeError("Ollama connection error: refused")
+        for fragment in ["Hel", "lo"]:
+            yield fragment
+
+
+def _client() -> TestClient:
+    app.dependency_overrides[get_rag_service] = FakeRAGService
+    return TestClient(app)
+
+
+def test_query_returns_answer():
+    """POST /query answers a single question."""
+    response = _client().post("/api/v1/query", json={"query": "what?"})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json() == {"query": "what?", "answer": "answer to what?"}
+
+
+def test_query_batch_keeps_order():
+    """POST /query/batch returns one answer per question, in order."""
+    response = _client().post("/api/v1/query/batch", json={"queries": ["a", "b"]})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert [item["answer"] for item in response.json()["answers"]] == [
+        "answer to a",
+        "answer to b",
+    ]
+
+
+def test_query_llm_failure_is_bad_gateway():
+    """LLM errors map to HTTP 502."""
+    response = _client().post("/api/v1/query", json={"query": "fail"})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 502
+
+
+def test_query_rejects_empty_query():
+    response = _client().post("/api/v1/query", json={"query": ""})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 422
+
+
+def test_query_stream_sends_sse_events():
+    """GET /query/stream emits token events followed by done."""
+    response = _client().get("/api/v1/query/stream", params={"query": "hi"})
+    app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text == (
+        'event: token\ndata: {"token": "Hel"}\n\n'
+        'event: token\ndata: {"token": "lo"}\n\n'
+        "event: done\ndata: {}\n\n"
+    )
+
+
+def test_query_stream_reports_errors_as_events():
+    response = _client().get("/api/v1/query/stream", params={"query": "fail"})
+    app.dependency_overrides.clear()
+
+    assert "event: error" in response.text
+    assert "event: done" not in response.text